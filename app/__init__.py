@@ -3,28 +3,45 @@ Soccer Practice Planner - A web app for creating customized soccer practice sess
 """
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-import os
+from app.config import get_config, install_sqlite_pragmas
 
 db = SQLAlchemy()
 
-def create_app():
-    """Create and configure the Flask application"""
+def create_app(test_config=None, profile=None):
+    """Create and configure the Flask application
+
+    profile: config profile name ('development', 'testing', 'production');
+    defaults to the APP_ENV environment variable
+    test_config: optional dict of config values that override the profile
+    (used by scripts and benchmarks to point at a scratch database)
+    """
     app = Flask(__name__)
 
     # Configuration
-    app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///soccer_planner.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.from_object(get_config(profile))
+
+    if test_config:
+        app.config.update(test_config)
 
     # Initialize database
     db.init_app(app)
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
 
     # Register routes
     from app import routes
     app.register_blueprint(routes.bp)
 
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # In-memory drill suggestion index (built on first use)
+    from app.utils.suggestion_index import init_suggestion_index
+    init_suggestion_index(app)
+
+    # Content-addressed diagram renders (diagram_src in templates)
+    from app.utils.diagram_cache import init_diagram_cache
+    init_diagram_cache(app)
+
+    # Schema version check and the "flask migrate" command (tables are not created on boot)
+    from app.migrations import init_migrations
+    init_migrations(app)
 
     return app
@@ -0,0 +1,122 @@
+"""
+Configuration profiles for Soccer Practice Planner
+
+The profile is picked from the APP_ENV environment variable:
+- development (default): local SQLite file, WAL mode
+- testing: in-memory SQLite database
+- production: WAL mode, tuned pragmas and a sized connection pool
+
+SQLite pragmas in SQLITE_PRAGMAS are applied to every new connection.
+"""
+import os
+
+from sqlalchemy import event
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Pragmas that let readers and writers run concurrently (WAL) and wait for a
+# lock instead of failing immediately with "database is locked".
+CONCURRENT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,        # milliseconds
+    'cache_size': -20000,        # negative = KiB, i.e. ~20 MB page cache
+    'mmap_size': 268435456,      # 256 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
+}
+
+
+class Config:
+    """Settings shared by every profile"""
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///soccer_planner.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLITE_PRAGMAS = {}
+
+    # Background work (CSV imports, similar-drill refreshes): 'thread', 'process' or 'inline'
+    IMPORT_EXECUTOR = os.environ.get('IMPORT_EXECUTOR', 'thread')
+    IMPORT_WORKERS = _env_int('IMPORT_WORKERS', 1)
+    IMPORT_UPLOAD_FOLDER = os.environ.get('IMPORT_UPLOAD_FOLDER')  # default: <instance>/imports
+
+    # Rebuild the in-memory suggestion index after this many seconds, to pick
+    # up drills written by other worker processes (0 = never)
+    SUGGESTION_INDEX_MAX_AGE = _env_int('SUGGESTION_INDEX_MAX_AGE', 300)
+
+    # Rendered drill diagrams, stored by content hash
+    DIAGRAM_CACHE_DIR = os.environ.get('DIAGRAM_CACHE_DIR')  # default: <instance>/diagrams
+    # 'svg' (native renderer) or 'png' (matplotlib)
+    DIAGRAM_FORMAT = os.environ.get('DIAGRAM_FORMAT', 'svg')
+
+    # Create tables and apply migrations at startup instead of with "flask migrate"
+    AUTO_MIGRATE = bool(_env_int('AUTO_MIGRATE', 0))
+
+
+class DevelopmentConfig(Config):
+    """Local development"""
+    SQLITE_PRAGMAS = dict(CONCURRENT_PRAGMAS)
+
+
+class TestingConfig(Config):
+    """Tests and scripts that need a throwaway database"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+    SQLITE_PRAGMAS = {'synchronous': 'OFF'}
+    IMPORT_EXECUTOR = 'inline'
+    AUTO_MIGRATE = True
+
+
+class ProductionConfig(Config):
+    """Multi-worker deployments (e.g. gunicorn)"""
+    SQLITE_PRAGMAS = dict(
+        CONCURRENT_PRAGMAS,
+        busy_timeout=_env_int('SQLITE_BUSY_TIMEOUT', 15000),
+        cache_size=-_env_int('SQLITE_CACHE_KB', 64000),
+        mmap_size=_env_int('SQLITE_MMAP_SIZE', 268435456),
+    )
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': _env_int('DB_POOL_SIZE', 5),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 3600),
+        'pool_pre_ping': True,
+    }
+
+
+PROFILES = {
+    'development': DevelopmentConfig,
+    'dev': DevelopmentConfig,
+    'testing': TestingConfig,
+    'test': TestingConfig,
+    'production': ProductionConfig,
+    'prod': ProductionConfig,
+}
+
+
+def get_config(profile=None):
+    """Return the config class for a profile name (defaults to $APP_ENV, then development)"""
+    name = (profile or os.environ.get('APP_ENV') or 'development').lower()
+    if name not in PROFILES:
+        raise ValueError(f'Unknown APP_ENV profile "{name}" (expected one of {", ".join(sorted(PROFILES))})')
+    return PROFILES[name]
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Run the given PRAGMA statements on every new connection of a SQLite engine"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    statements = [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
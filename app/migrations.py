@@ -0,0 +1,238 @@
+"""
+Lightweight schema migrations for Soccer Practice Planner
+
+The schema version is stored in SQLite's ``PRAGMA user_version``. A brand new
+database is created with ``db.create_all()`` and stamped with the latest
+version; an existing database runs every migration newer than its stamp.
+
+Upgrading is an explicit step, ``flask --app run migrate``; app startup only
+reads the stamp (check_schema) and warns when the database is behind,
+unless AUTO_MIGRATE is set (the testing profile, scratch databases).
+"""
+import click
+from app import db
+from sqlalchemy import inspect, text
+
+MIGRATIONS = []
+
+
+def migration(version):
+    """Register a migration function for the given schema version"""
+    def decorator(func):
+        MIGRATIONS.append((version, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return decorator
+
+
+def latest_version():
+    """Return the schema version the code expects"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def get_schema_version():
+    """Read the schema version stamped on the database"""
+    return db.session.execute(text('PRAGMA user_version')).scalar() or 0
+
+
+def set_schema_version(version):
+    """Stamp the database with a schema version"""
+    db.session.execute(text(f'PRAGMA user_version = {int(version)}'))
+
+
+def upgrade_database():
+    """Create missing tables and apply pending migrations (call inside an app context)"""
+    is_new = not inspect(db.engine).has_table('drills')
+    db.create_all()
+
+    if is_new:
+        set_schema_version(latest_version())
+        db.session.commit()
+        return
+
+    current = get_schema_version()
+    for version, func in MIGRATIONS:
+        if version > current:
+            func()
+            set_schema_version(version)
+            db.session.commit()
+
+
+def check_schema(app):
+    """Startup check: compare the database's schema version with the code's (a single PRAGMA read)"""
+    with app.app_context():
+        current = get_schema_version()
+        if current == latest_version():
+            return
+        if app.config.get('AUTO_MIGRATE'):
+            upgrade_database()
+            return
+    app.logger.warning('Database schema is at version %s, the code expects %s: run "flask --app run migrate"',
+                       current, latest_version())
+
+
+def init_migrations(app):
+    """Register the migrate command and check the database's schema version"""
+
+    @app.cli.command('migrate')
+    def migrate_command():
+        """Create missing tables and apply pending schema migrations"""
+        current = get_schema_version()
+        upgrade_database()
+        click.echo(f'Database schema upgraded from version {current} to {latest_version()}'
+                   if current != latest_version() else f'Database schema is up to date (version {current})')
+
+    check_schema(app)
+
+
+def _backfill_tags(source_table, owner_column, source_column, tag_table, tag_column, normalize):
+    """Insert normalized tag rows for every row of a comma-separated source column"""
+    from app.models.tags import split_tags
+
+    db.session.execute(text(f'DELETE FROM {tag_table}'))
+    rows = db.session.execute(text(f'SELECT id, {source_column} FROM {source_table}')).all()
+    params = [
+        {'owner_id': row_id, 'tag': tag}
+        for row_id, value in rows
+        for tag in split_tags(value, normalize)
+    ]
+    if params:
+        db.session.execute(
+            text(f'INSERT INTO {tag_table} ({owner_column}, {tag_column}) VALUES (:owner_id, :tag)'),
+            params
+        )
+
+
+def _create_indexes(connection, model):
+    """Create a model's missing indexes; indexes on columns a later migration adds are left to it"""
+    columns = {column['name'] for column in inspect(connection).get_columns(model.__tablename__)}
+    for index in model.__table__.indexes:
+        if all(column.name in columns for column in index.columns):
+            index.create(connection, checkfirst=True)
+
+
+# ============================================================================
+# MIGRATIONS
+# ============================================================================
+
+@migration(1)
+def backfill_tag_tables():
+    """Populate the age group / focus area tag tables from the legacy strings"""
+    from app.models.tags import normalize_age_group, normalize_focus_area
+
+    _backfill_tags('drills', 'drill_id', 'recommended_age_groups',
+                   'drill_age_groups', 'age_group', normalize_age_group)
+    _backfill_tags('drills', 'drill_id', 'focus_areas',
+                   'drill_focus_areas', 'focus_area', normalize_focus_area)
+    _backfill_tags('session_templates', 'template_id', 'recommended_age_groups',
+                   'template_age_groups', 'age_group', normalize_age_group)
+    _backfill_tags('teams', 'team_id', 'focus_areas',
+                   'team_focus_areas', 'focus_area', normalize_focus_area)
+
+
+@migration(2)
+def create_drill_fts_index():
+    """Create the FTS5 drill search index and its sync triggers"""
+    from app.utils.drill_search import install_fts
+
+    install_fts(db.session.connection())
+
+
+@migration(3)
+def create_keyset_pagination_indexes():
+    """Add the (sort key, id) indexes used by keyset pagination"""
+    from app.models import Drill, Team, PracticePlan
+
+    connection = db.session.connection()
+    for model in (Drill, Team, PracticePlan):
+        _create_indexes(connection, model)
+
+
+@migration(4)
+def build_drill_similarities():
+    """Precompute the similar drills shown on each drill's page"""
+    from app.utils.drill_similarity import rebuild_similarities
+
+    rebuild_similarities()
+
+
+@migration(5)
+def add_practice_plan_season_columns():
+    """Add the season, week and date columns of season-generated plans"""
+    from app.models import PracticePlan
+
+    connection = db.session.connection()
+    existing = {column['name'] for column in inspect(connection).get_columns('practice_plans')}
+    for name, ddl in (('season_id', 'INTEGER REFERENCES seasons (id)'),
+                      ('season_week', 'INTEGER'),
+                      ('scheduled_date', 'DATE')):
+        if name not in existing:
+            connection.execute(text(f'ALTER TABLE practice_plans ADD COLUMN {name} {ddl}'))
+    _create_indexes(connection, PracticePlan)
+
+
+@migration(6)
+def build_team_drill_usage():
+    """Index plan drills by plan and roll up each team's drill usage history"""
+    from app.models import PlanDrill
+    from app.utils.drill_history import rebuild_usage
+
+    _create_indexes(db.session.connection(), PlanDrill)
+    rebuild_usage()
+
+
+@migration(7)
+def add_tag_mask_columns():
+    """Add the skill level / age group / focus area bitmask columns and compute them"""
+    from app.models import Drill, Team, SessionTemplate
+    from app.models.tag_masks import age_group_bits, focus_area_bits, skill_level_bits
+
+    connection = db.session.connection()
+    for model, age_source in ((Drill, 'recommended_age_groups'), (Team, 'age_group'),
+                              (SessionTemplate, 'recommended_age_groups')):
+        table = model.__tablename__
+        existing = {column['name'] for column in inspect(connection).get_columns(table)}
+        for name in ('skill_level_mask', 'age_group_mask', 'focus_area_mask'):
+            if name not in existing:
+                connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0'))
+
+        rows = connection.execute(text(f'SELECT id, skill_level, {age_source}, focus_areas FROM {table}')).all()
+        params = [
+            {'row_id': row_id, 'skill': skill_level_bits(skill), 'age': age_group_bits(ages),
+             'focus': focus_area_bits(focus)}
+            for row_id, skill, ages, focus in rows
+        ]
+        if params:
+            connection.execute(
+                text(f'UPDATE {table} SET skill_level_mask = :skill, age_group_mask = :age, '
+                     f'focus_area_mask = :focus WHERE id = :row_id'),
+                params
+            )
+
+
+@migration(8)
+def add_drill_diagram_spec_column():
+    """Add the declarative diagram spec column to drills, filled in for the built-in drills"""
+    from app.utils.diagram_specs import LIBRARY_SPECS, dump_spec
+
+    connection = db.session.connection()
+    existing = {column['name'] for column in inspect(connection).get_columns('drills')}
+    if 'diagram_spec' not in existing:
+        connection.execute(text('ALTER TABLE drills ADD COLUMN diagram_spec TEXT'))
+    connection.execute(
+        text('UPDATE drills SET diagram_spec = :spec WHERE name = :name AND diagram_spec IS NULL'),
+        [{'name': name, 'spec': dump_spec(spec)} for name, spec in LIBRARY_SPECS.items()]
+    )
+
+
+@migration(9)
+def add_drill_updated_at_column():
+    """Track when drills change, for regenerating only changed diagrams"""
+    from app.models import Drill
+
+    connection = db.session.connection()
+    existing = {column['name'] for column in inspect(connection).get_columns('drills')}
+    if 'updated_at' not in existing:
+        connection.execute(text('ALTER TABLE drills ADD COLUMN updated_at DATETIME'))
+        connection.execute(text('UPDATE drills SET updated_at = created_at'))
+    _create_indexes(connection, Drill)
@@ -1,8 +1,15 @@
 """Database models for Soccer Practice Planner"""
+from app.models.tags import DrillAgeGroup, DrillFocusArea, TemplateAgeGroup, TeamFocusArea
 from app.models.team import Team
 from app.models.player import Player
 from app.models.drill import Drill
 from app.models.practice_plan import PracticePlan, PlanDrill
+from app.models.season import Season
 from app.models.session_template import SessionTemplate, TemplateDrill
+from app.models.import_job import ImportJob
+from app.models.drill_similarity import DrillSimilarity
+from app.models.team_drill_usage import TeamDrillUsage
 
-__all__ = ['Team', 'Player', 'Drill', 'PracticePlan', 'PlanDrill', 'SessionTemplate', 'TemplateDrill']
+__all__ = ['Team', 'Player', 'Drill', 'PracticePlan', 'PlanDrill', 'Season', 'SessionTemplate', 'TemplateDrill',
+           'DrillAgeGroup', 'DrillFocusArea', 'TemplateAgeGroup', 'TeamFocusArea', 'ImportJob',
+           'DrillSimilarity', 'TeamDrillUsage']
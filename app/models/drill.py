@@ -1,10 +1,18 @@
 """Drill model for storing soccer drill information"""
 from app import db
+from app.utils.drill_search import register_fts_ddl
+from app.models.tags import DrillAgeGroup, DrillFocusArea, normalize_age_group, normalize_focus_area, sync_tags_on_set
+from app.models.tag_masks import (ALL_LEVELS, age_group_bits, display_tags, focus_area_bits, mask_column,
+                                  skill_level_bits, sync_mask_on_set)
 from datetime import datetime
 
 class Drill(db.Model):
     """Model representing a soccer drill"""
     __tablename__ = 'drills'
+    __table_args__ = (
+        db.Index('ix_drills_name_id', 'name', 'id'),  # catalog keyset pagination
+        db.Index('ix_drills_updated_at', 'updated_at'),  # generate_diagrams --changed-since
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -22,19 +30,59 @@ class Drill(db.Model):
     coaching_points = db.Column(db.Text)  # Key coaching points
     variations = db.Column(db.Text)  # Drill variations to increase/decrease difficulty
     diagram_url = db.Column(db.String(200))  # Path to diagram image
+    diagram_spec = db.Column(db.Text)  # JSON diagram spec (app/utils/diagram_specs.py)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Bitmasks of skill_level / recommended_age_groups / focus_areas (app/models/tag_masks.py)
+    skill_level_mask = mask_column('skill_level', skill_level_bits)
+    age_group_mask = mask_column('recommended_age_groups', age_group_bits)
+    focus_area_mask = mask_column('focus_areas', focus_area_bits)
+
+    # Normalized tag rows mirroring recommended_age_groups / focus_areas
+    age_group_tags = db.relationship('DrillAgeGroup', lazy=True, cascade='all, delete-orphan')
+    focus_area_tags = db.relationship('DrillFocusArea', lazy=True, cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<Drill {self.name} - {self.category}>'
 
+    def to_dict(self):
+        """Serialize the drill for JSON endpoints"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'category': self.category,
+            'sub_category': self.sub_category,
+            'description': self.description,
+            'equipment_needed': self.equipment_needed,
+            'min_players': self.min_players,
+            'max_players': self.max_players,
+            'recommended_age_groups': self.recommended_age_groups,
+            'skill_level': self.skill_level,
+            'duration_minutes': self.duration_minutes,
+            'focus_areas': self.focus_areas,
+            'diagram_url': self.diagram_url,
+        }
+
     @property
     def age_groups_list(self):
         """Convert age groups string to list"""
-        if self.recommended_age_groups:
-            return [age.strip() for age in self.recommended_age_groups.split(',')]
-        return []
+        return list(display_tags(self.recommended_age_groups))
 
-    @property
     def is_suitable_for_age(self, age_group):
         """Check if drill is suitable for a specific age group"""
-        return age_group in self.age_groups_list or self.skill_level == 'All'
+        return bool(self.age_group_mask & age_group_bits(age_group)) or self.skill_level == ALL_LEVELS
+
+    def is_suitable_for_team(self, team):
+        """Check if the drill suits a team's skill level and age group"""
+        return bool(self.skill_level_mask & team.skill_level_mask and self.age_group_mask & team.age_group_mask)
+
+
+sync_tags_on_set(Drill.recommended_age_groups, 'age_group_tags', DrillAgeGroup, 'age_group', normalize_age_group)
+sync_tags_on_set(Drill.focus_areas, 'focus_area_tags', DrillFocusArea, 'focus_area', normalize_focus_area)
+sync_mask_on_set(Drill.skill_level, 'skill_level_mask', skill_level_bits)
+sync_mask_on_set(Drill.recommended_age_groups, 'age_group_mask', age_group_bits)
+sync_mask_on_set(Drill.focus_areas, 'focus_area_mask', focus_area_bits)
+
+# Keep the drills_fts full-text index in sync (see app/utils/drill_search.py)
+register_fts_ddl(Drill.__table__)
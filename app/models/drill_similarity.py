@@ -0,0 +1,20 @@
+"""Precomputed "similar drills" neighbours"""
+from app import db
+
+class DrillSimilarity(db.Model):
+    """One of a drill's nearest neighbours by TF-IDF cosine similarity (see app/utils/drill_similarity.py)"""
+    __tablename__ = 'drill_similarities'
+
+    drill_id = db.Column(db.Integer, db.ForeignKey('drills.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)  # 0 = most similar
+    similar_drill_id = db.Column(db.Integer, db.ForeignKey('drills.id', ondelete='CASCADE'), nullable=False)
+    score = db.Column(db.Float, nullable=False)  # cosine similarity, 0-1
+
+    __table_args__ = (
+        db.Index('ix_drill_similarities_similar_drill_id', 'similar_drill_id'),
+    )
+
+    similar_drill = db.relationship('Drill', foreign_keys=[similar_drill_id])
+
+    def __repr__(self):
+        return f'<DrillSimilarity {self.drill_id} #{self.rank} -> {self.similar_drill_id} ({self.score:.2f})>'
@@ -0,0 +1,65 @@
+"""Import job model for tracking background CSV drill imports"""
+from app import db
+from datetime import datetime
+import json
+
+class ImportJob(db.Model):
+    """Model for a background drill import and its progress"""
+    __tablename__ = 'import_jobs'
+
+    STATUSES = ('queued', 'running', 'done', 'failed')
+
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(255), nullable=False)  # Original upload name
+    file_path = db.Column(db.String(500))  # Stored upload, removed when the job finishes
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    total_bytes = db.Column(db.Integer, default=0)
+    processed_bytes = db.Column(db.Integer, default=0)
+    rows_processed = db.Column(db.Integer, default=0)
+    imported = db.Column(db.Integer, default=0)
+    skipped = db.Column(db.Integer, default=0)
+    error_count = db.Column(db.Integer, default=0)
+    errors_json = db.Column(db.Text)  # JSON list of row error messages
+    message = db.Column(db.Text)  # Fatal error for failed jobs
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<ImportJob {self.id} {self.status}>'
+
+    @property
+    def errors(self):
+        """Row error messages as a list"""
+        return json.loads(self.errors_json) if self.errors_json else []
+
+    @property
+    def percent_complete(self):
+        """Progress through the uploaded file, 0-100"""
+        if self.status == 'done':
+            return 100
+        if not self.total_bytes:
+            return 0
+        return min(100, int(100 * (self.processed_bytes or 0) / self.total_bytes))
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed')
+
+    def to_dict(self):
+        """Serialize the job for the status endpoint"""
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'percent_complete': self.percent_complete,
+            'rows_processed': self.rows_processed,
+            'imported': self.imported,
+            'skipped': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'message': self.message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
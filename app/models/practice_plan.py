@@ -5,6 +5,10 @@ from datetime import datetime
 class PracticePlan(db.Model):
     """Model for practice plans/training sessions"""
     __tablename__ = 'practice_plans'
+    __table_args__ = (
+        db.Index('ix_practice_plans_team_created_at_id', 'team_id', 'created_at', 'id'),  # team plans keyset pagination
+        db.Index('ix_practice_plans_season_week', 'season_id', 'season_week'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -14,16 +18,43 @@ class PracticePlan(db.Model):
     notes = db.Column(db.Text)
     is_completed = db.Column(db.Boolean, default=False)
     completed_at = db.Column(db.DateTime)
+    season_id = db.Column(db.Integer, db.ForeignKey('seasons.id'))  # Set for plans generated as part of a season
+    season_week = db.Column(db.Integer)  # Week number within the season, from 1
+    scheduled_date = db.Column(db.Date)
 
     # Relationship to team
     team = db.relationship('Team', backref=db.backref('practice_plans', lazy=True))
 
     # Relationship to drills (many-to-many through PlanDrill)
-    plan_drills = db.relationship('PlanDrill', backref='practice_plan', lazy=True, cascade='all, delete-orphan')
+    plan_drills = db.relationship('PlanDrill', backref='practice_plan', lazy=True, cascade='all, delete-orphan',
+                                  order_by='PlanDrill.order')
 
     def __repr__(self):
         return f'<PracticePlan {self.name}>'
 
+    def to_dict(self):
+        """Serialize the plan (without its drills) for JSON endpoints"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'team_id': self.team_id,
+            'duration_minutes': self.duration_minutes,
+            'drills_count': self.drills_count,
+            'total_drill_time': self.total_drill_time,
+            'notes': self.notes,
+            'is_completed': self.is_completed,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'season_id': self.season_id,
+            'season_week': self.season_week,
+            'scheduled_date': self.scheduled_date.isoformat() if self.scheduled_date else None,
+        }
+
+    def mark_completed(self, completed=True):
+        """Mark the plan as run (or not), stamping completed_at"""
+        self.is_completed = completed
+        self.completed_at = datetime.utcnow() if completed else None
+
     @property
     def total_drill_time(self):
         """Calculate total time allocated to drills"""
@@ -38,6 +69,9 @@ class PracticePlan(db.Model):
 class PlanDrill(db.Model):
     """Association model for practice plans and drills with ordering and duration"""
     __tablename__ = 'plan_drills'
+    __table_args__ = (
+        db.Index('ix_plan_drills_plan_id', 'plan_id'),  # a plan's drills, team drill usage rollup
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     plan_id = db.Column(db.Integer, db.ForeignKey('practice_plans.id'), nullable=False)
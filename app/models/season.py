@@ -0,0 +1,46 @@
+"""Season model for multi-week series of generated practice plans"""
+from app import db
+from datetime import datetime, timedelta
+
+class Season(db.Model):
+    """A team's season: one dated practice plan per week, generated together"""
+    __tablename__ = 'seasons'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False, index=True)
+    start_date = db.Column(db.Date, nullable=False)  # Date of the week 1 session
+    weeks = db.Column(db.Integer, nullable=False)
+    duration_minutes = db.Column(db.Integer, nullable=False)  # Length of every session
+    start_skill_level = db.Column(db.String(20), nullable=False)  # Skill level of the first weeks...
+    end_skill_level = db.Column(db.String(20), nullable=False)  # ...progressing to this one
+    repeat_window = db.Column(db.Integer, nullable=False)  # Rolling window in weeks...
+    max_repeats = db.Column(db.Integer, nullable=False)  # ...in which a drill is used at most this often
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    team = db.relationship('Team', backref=db.backref('seasons', lazy=True))
+    plans = db.relationship('PracticePlan', backref='season', lazy=True, cascade='all, delete-orphan',
+                            order_by='PracticePlan.season_week')
+
+    def __repr__(self):
+        return f'<Season {self.name}>'
+
+    def week_date(self, week):
+        """Session date of a week (weeks are numbered from 1)"""
+        return self.start_date + timedelta(weeks=week - 1)
+
+    def to_dict(self):
+        """Serialize the season (without its plans) for JSON endpoints"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'team_id': self.team_id,
+            'start_date': self.start_date.isoformat(),
+            'weeks': self.weeks,
+            'duration_minutes': self.duration_minutes,
+            'start_skill_level': self.start_skill_level,
+            'end_skill_level': self.end_skill_level,
+            'repeat_window': self.repeat_window,
+            'max_repeats': self.max_repeats,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
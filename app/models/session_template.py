@@ -1,5 +1,7 @@
 """Session Template model for pre-built practice sessions"""
 from app import db
+from app.models.tags import TemplateAgeGroup, normalize_age_group, sync_tags_on_set
+from app.models.tag_masks import age_group_bits, focus_area_bits, mask_column, skill_level_bits, sync_mask_on_set
 
 class SessionTemplate(db.Model):
     """Model for pre-built practice session templates"""
@@ -14,8 +16,17 @@ class SessionTemplate(db.Model):
     total_duration = db.Column(db.Integer, nullable=False)  # Total minutes
     focus_areas = db.Column(db.Text)  # Comma-separated
 
+    # Bitmasks of skill_level / recommended_age_groups / focus_areas (app/models/tag_masks.py)
+    skill_level_mask = mask_column('skill_level', skill_level_bits)
+    age_group_mask = mask_column('recommended_age_groups', age_group_bits)
+    focus_area_mask = mask_column('focus_areas', focus_area_bits)
+
     # Relationship to template drills
-    template_drills = db.relationship('TemplateDrill', backref='session_template', lazy=True, cascade='all, delete-orphan')
+    template_drills = db.relationship('TemplateDrill', backref='session_template', lazy=True, cascade='all, delete-orphan',
+                                      order_by='TemplateDrill.order')
+
+    # Normalized tag rows mirroring recommended_age_groups
+    age_group_tags = db.relationship('TemplateAgeGroup', lazy=True, cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<SessionTemplate {self.name}>'
@@ -42,3 +53,9 @@ class TemplateDrill(db.Model):
 
     def __repr__(self):
         return f'<TemplateDrill template={self.template_id} drill={self.drill_id}>'
+
+
+sync_tags_on_set(SessionTemplate.recommended_age_groups, 'age_group_tags', TemplateAgeGroup, 'age_group', normalize_age_group)
+sync_mask_on_set(SessionTemplate.skill_level, 'skill_level_mask', skill_level_bits)
+sync_mask_on_set(SessionTemplate.recommended_age_groups, 'age_group_mask', age_group_bits)
+sync_mask_on_set(SessionTemplate.focus_areas, 'focus_area_mask', focus_area_bits)
@@ -0,0 +1,114 @@
+"""Integer bitmasks over a canonical skill level / age group / focus area vocabulary
+
+Drills, teams and session templates keep a bitmask column next to each of
+their skill level, age group and focus area strings. Each vocabulary value
+owns one bit (its position in the tuple, so values may only be appended),
+and suitability checks become integer ANDs, in Python and in SQL alike:
+
+    drill.age_group_mask & team.age_group_mask
+    Drill.age_group_mask.op('&')(team.age_group_mask) != 0   (see masks_overlap)
+
+Masks are maintained on write: ORM assignments of the string column update
+the mask (sync_mask_on_set), and INSERTs that leave the mask out, including
+bulk Core inserts, compute it from the string (mask_column's default).
+
+Free-text focus areas map to every canonical area they contain as whole
+words ("Passing accuracy" -> passing); tags outside the vocabulary have no
+bit and are only found through the tag tables (app/models/tags.py).
+"""
+import re
+from functools import lru_cache
+
+from app import db
+from app.models.tags import normalize_age_group, normalize_focus_area, split_tags
+
+ALL_LEVELS = 'All'
+SKILL_LEVELS = ('Beginner', 'Intermediate', 'Advanced')
+
+AGE_GROUPS = tuple(f'U{age}' for age in range(5, 20)) + ('U21', 'ADULT')
+
+FOCUS_AREAS = (
+    'passing', 'dribbling', 'shooting', 'defending', 'possession', 'transitions', 'fitness', 'set pieces',
+    'ball control', 'first touch', 'receiving', 'finishing', 'crossing', 'heading', 'goalkeeping', '1v1',
+    'attacking', 'pressing', 'team shape', 'support', 'movement', 'tactical awareness', 'awareness',
+    'decision making', 'vision', 'communication', 'teamwork', 'speed', 'agility', 'endurance', 'coordination',
+    'balance', 'footwork', 'shielding', 'recovery', 'combination play', 'counter attack', 'building out',
+    'competition', 'fun',
+)
+
+# Other spellings of canonical focus areas
+FOCUS_AREA_ALIASES = {
+    'transition': 'transitions',
+    'conditioning': 'fitness',
+    'set piece': 'set pieces',
+    'goalkeeper': 'goalkeeping',
+    'counter attacking': 'counter attack',
+    'build up': 'building out',
+}
+
+ALL_SKILL_LEVELS_MASK = (1 << len(SKILL_LEVELS)) - 1
+
+_SKILL_BITS = {level: 1 << i for i, level in enumerate(SKILL_LEVELS)}
+_AGE_GROUP_BITS = {group: 1 << i for i, group in enumerate(AGE_GROUPS)}
+_FOCUS_AREA_BITS = {area: 1 << i for i, area in enumerate(FOCUS_AREAS)}
+_FOCUS_AREA_BITS.update({alias: _FOCUS_AREA_BITS[area] for alias, area in FOCUS_AREA_ALIASES.items()})
+_FOCUS_AREA_RE = re.compile(r'\b(?:' + '|'.join(
+    re.escape(area) for area in sorted(_FOCUS_AREA_BITS, key=len, reverse=True)) + r')\b')
+
+
+def skill_level_bits(value):
+    """Bit of a skill level; 'All' and missing levels suit every level"""
+    if not value or value == ALL_LEVELS:
+        return ALL_SKILL_LEVELS_MASK
+    return _SKILL_BITS.get(value, 0)
+
+
+@lru_cache(maxsize=4096)
+def age_group_bits(value):
+    """Bits of a comma-separated age group string"""
+    mask = 0
+    for tag in split_tags(value, normalize_age_group):
+        mask |= _AGE_GROUP_BITS.get(tag, 0)
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def focus_area_bits(value):
+    """Bits of the canonical focus areas named in a comma-separated focus area string"""
+    mask = 0
+    for tag in split_tags(value, normalize_focus_area):
+        for match in _FOCUS_AREA_RE.findall(tag):
+            mask |= _FOCUS_AREA_BITS[match]
+    return mask
+
+
+def mask_values(mask, vocabulary):
+    """The vocabulary values whose bits are set"""
+    return [value for i, value in enumerate(vocabulary) if mask & (1 << i)]
+
+
+def masks_overlap(column, mask):
+    """SQL condition: the mask column shares a bit with ``mask``"""
+    return column.op('&')(mask) != 0
+
+
+@lru_cache(maxsize=4096)
+def display_tags(value):
+    """Comma-separated string -> tuple of stripped, non-empty parts (cached per string)"""
+    if not value:
+        return ()
+    return tuple(part.strip() for part in value.split(',') if part.strip())
+
+
+def mask_column(source, to_mask):
+    """An integer mask column whose INSERT default is computed from the ``source`` column"""
+    def default(context):
+        return to_mask(context.get_current_parameters().get(source))
+    return db.Column(db.Integer, nullable=False, default=default)
+
+
+def sync_mask_on_set(column, mask_attr, to_mask):
+    """Recompute a mask attribute whenever its source string column is assigned"""
+    @db.event.listens_for(column, 'set')
+    def _sync(target, value, oldvalue, initiator):
+        setattr(target, mask_attr, to_mask(value))
@@ -0,0 +1,117 @@
+"""Normalized tag tables for age groups and focus areas
+
+Drills, teams and session templates store their age groups and focus areas as
+comma-separated strings for display. The tables in this module hold the same
+values one row per tag so filters can use an indexed join instead of a
+LIKE scan. Rows are kept in sync automatically whenever the string column is
+assigned.
+"""
+from app import db
+
+
+def normalize_age_group(value):
+    """Normalize an age group tag, e.g. ' u12 ' -> 'U12'"""
+    return value.strip().upper()
+
+
+def normalize_focus_area(value):
+    """Normalize a focus area tag, e.g. ' Passing  Accuracy' -> 'passing accuracy'"""
+    return ' '.join(value.lower().split())
+
+
+def split_tags(value, normalize):
+    """Split a comma-separated string into unique, normalized tags (order preserved)"""
+    if not value:
+        return []
+    tags = []
+    for part in value.split(','):
+        tag = normalize(part)
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+class DrillAgeGroup(db.Model):
+    """Age group tag attached to a drill"""
+    __tablename__ = 'drill_age_groups'
+
+    drill_id = db.Column(db.Integer, db.ForeignKey('drills.id', ondelete='CASCADE'), primary_key=True)
+    age_group = db.Column(db.String(10), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_drill_age_groups_age_group', 'age_group', 'drill_id'),
+    )
+
+    def __repr__(self):
+        return f'<DrillAgeGroup drill={self.drill_id} {self.age_group}>'
+
+
+class DrillFocusArea(db.Model):
+    """Focus area tag attached to a drill"""
+    __tablename__ = 'drill_focus_areas'
+
+    drill_id = db.Column(db.Integer, db.ForeignKey('drills.id', ondelete='CASCADE'), primary_key=True)
+    focus_area = db.Column(db.String(100), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_drill_focus_areas_focus_area', 'focus_area', 'drill_id'),
+    )
+
+    def __repr__(self):
+        return f'<DrillFocusArea drill={self.drill_id} {self.focus_area}>'
+
+
+class TemplateAgeGroup(db.Model):
+    """Age group tag attached to a session template"""
+    __tablename__ = 'template_age_groups'
+
+    template_id = db.Column(db.Integer, db.ForeignKey('session_templates.id', ondelete='CASCADE'), primary_key=True)
+    age_group = db.Column(db.String(10), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_template_age_groups_age_group', 'age_group', 'template_id'),
+    )
+
+    def __repr__(self):
+        return f'<TemplateAgeGroup template={self.template_id} {self.age_group}>'
+
+
+class TeamFocusArea(db.Model):
+    """Focus area tag attached to a team"""
+    __tablename__ = 'team_focus_areas'
+
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id', ondelete='CASCADE'), primary_key=True)
+    focus_area = db.Column(db.String(100), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_team_focus_areas_focus_area', 'focus_area', 'team_id'),
+    )
+
+    def __repr__(self):
+        return f'<TeamFocusArea team={self.team_id} {self.focus_area}>'
+
+
+def sync_tags_on_set(column, collection, tag_model, tag_attr, normalize):
+    """Rebuild a tag collection whenever its source string column is assigned"""
+    @db.event.listens_for(column, 'set')
+    def _sync(target, value, oldvalue, initiator):
+        setattr(target, collection,
+                [tag_model(**{tag_attr: tag}) for tag in split_tags(value, normalize)])
+
+
+def insert_drill_tags(drills):
+    """
+    Bulk-insert tag rows for drills written without the ORM (e.g. bulk import)
+
+    drills: iterable of (drill_id, recommended_age_groups, focus_areas)
+    """
+    age_rows, focus_rows = [], []
+    for drill_id, age_groups, focus_areas in drills:
+        age_rows.extend({'drill_id': drill_id, 'age_group': tag}
+                        for tag in split_tags(age_groups, normalize_age_group))
+        focus_rows.extend({'drill_id': drill_id, 'focus_area': tag}
+                          for tag in split_tags(focus_areas, normalize_focus_area))
+    if age_rows:
+        db.session.execute(db.insert(DrillAgeGroup), age_rows)
+    if focus_rows:
+        db.session.execute(db.insert(DrillFocusArea), focus_rows)
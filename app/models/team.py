@@ -1,10 +1,16 @@
 """Team model for storing team information"""
 from app import db
+from app.models.tags import TeamFocusArea, normalize_focus_area, sync_tags_on_set
+from app.models.tag_masks import (age_group_bits, display_tags, focus_area_bits, mask_column, skill_level_bits,
+                                  sync_mask_on_set)
 from datetime import datetime
 
 class Team(db.Model):
     """Model representing a soccer team"""
     __tablename__ = 'teams'
+    __table_args__ = (
+        db.Index('ix_teams_created_at_id', 'created_at', 'id'),  # teams list keyset pagination
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -16,12 +22,32 @@ class Team(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Bitmasks of skill_level / age_group / focus_areas (app/models/tag_masks.py)
+    skill_level_mask = mask_column('skill_level', skill_level_bits)
+    age_group_mask = mask_column('age_group', age_group_bits)
+    focus_area_mask = mask_column('focus_areas', focus_area_bits)
+
     # Relationship with players
     players = db.relationship('Player', backref='team', lazy=True, cascade='all, delete-orphan')
 
+    # Normalized tag rows mirroring focus_areas
+    focus_area_tags = db.relationship('TeamFocusArea', lazy=True, cascade='all, delete-orphan')
+
     def __repr__(self):
         return f'<Team {self.name} - {self.age_group}>'
 
+    def to_dict(self):
+        """Serialize the team for JSON endpoints"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'age_group': self.age_group,
+            'skill_level': self.skill_level,
+            'num_players': self.num_players,
+            'focus_areas': self.focus_areas_list,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+
     @property
     def recommended_session_duration(self):
         """Return recommended practice duration in minutes based on age"""
@@ -37,6 +63,10 @@ class Team(db.Model):
     @property
     def focus_areas_list(self):
         """Convert focus areas string to list"""
-        if self.focus_areas:
-            return [area.strip() for area in self.focus_areas.split(',')]
-        return []
+        return list(display_tags(self.focus_areas))
+
+
+sync_tags_on_set(Team.focus_areas, 'focus_area_tags', TeamFocusArea, 'focus_area', normalize_focus_area)
+sync_mask_on_set(Team.skill_level, 'skill_level_mask', skill_level_bits)
+sync_mask_on_set(Team.age_group, 'age_group_mask', age_group_bits)
+sync_mask_on_set(Team.focus_areas, 'focus_area_mask', focus_area_bits)
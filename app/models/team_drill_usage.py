@@ -0,0 +1,17 @@
+"""Per-team drill usage rollup for recency-aware suggestions"""
+from app import db
+
+class TeamDrillUsage(db.Model):
+    """How often and how recently a team's practice plans used a drill (maintained by app/utils/drill_history.py)"""
+    __tablename__ = 'team_drill_usage'
+    __table_args__ = (
+        db.Index('ix_team_drill_usage_team_last_used', 'team_id', 'last_used_at'),
+    )
+
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id', ondelete='CASCADE'), primary_key=True)
+    drill_id = db.Column(db.Integer, db.ForeignKey('drills.id', ondelete='CASCADE'), primary_key=True)
+    times_used = db.Column(db.Integer, nullable=False)  # Plans that include the drill
+    last_used_at = db.Column(db.DateTime, nullable=False)  # Latest of those plans (completed_at, else created_at)
+
+    def __repr__(self):
+        return f'<TeamDrillUsage team={self.team_id} drill={self.drill_id} x{self.times_used}>'
@@ -10,11 +10,33 @@ This module contains all Flask routes for the application, organized into sectio
 - Utility/API Routes
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, send_file
+from flask import Response, abort, stream_with_context
 from app import db
-from app.models import Team, Player, Drill, PracticePlan, PlanDrill, SessionTemplate, TemplateDrill
-from datetime import datetime
+from app.models import Team, Player, Drill, PracticePlan, PlanDrill, SessionTemplate, TemplateDrill, Season
+from app.models import DrillAgeGroup, TemplateAgeGroup, ImportJob
+from app.models.tags import normalize_age_group
+from app.models.tag_masks import age_group_bits, masks_overlap
+from app.utils.drill_search import search_subquery, search_snippets, has_matches, fuzzy_subquery
+from app.utils.pagination import paginate_keyset, parse_per_page
+from app.utils.drill_import import import_drills_file, ACCEPTED_EXTENSIONS
+from app.utils.import_jobs import enqueue_import
+from app.utils.data_export import EXPORT_FORMATS, export_drills, export_practice_plans
+from app.utils.plan_editing import (apply_plan_drill_entries, entries_from_form, parse_drill_entry, parse_duration,
+                                    parse_notes)
+from app.utils.suggestion_index import get_suggestion_index, SUMMARY_COLUMNS
+from app.utils.plan_generator import generate_practice_plan, MAX_SESSION_MINUTES
+from app.utils.drill_similarity import get_similar_drills
+from app.utils.season_planner import create_season, regenerate_week, week_focus_areas, week_skill_level
+from app.utils.season_planner import DEFAULT_REPEAT_WINDOW, DEFAULT_WEEKS, MAX_WEEKS, SKILL_LEVELS
+from app.utils.drill_history import recency_adjustments
+from app.utils.diagram_cache import cached_diagram_path, default_format, diagram_key, diagram_src, ensure_diagram
+from app.utils.diagram_cache import DIAGRAM_FORMATS, DIAGRAM_KEY_RE, DIAGRAM_MAX_AGE
+from app.utils.diagram_variants import DIAGRAM_VARIANTS, VARIANT_FORMATS
+from sqlalchemy.orm import joinedload, selectinload
+from datetime import date, datetime
 import csv
 import io
+import json
 
 bp = Blueprint('main', __name__)
 
@@ -70,47 +92,41 @@ def team_dashboard(team_id):
 
 @bp.route('/teams')
 def teams_list():
-    """List all teams"""
-    teams = Team.query.order_by(Team.created_at.desc()).all()
-    return render_template('teams_list.html', teams=teams)
+    """List all teams (newest first, keyset paginated)"""
+    per_page = request.args.get('per_page')
+    page = paginate_teams(request.args.get('cursor'), parse_per_page(per_page))
+    next_url = url_for('main.teams_list', cursor=page.next_cursor, per_page=per_page) if page.has_next else None
+    first_url = url_for('main.teams_list', per_page=per_page) if request.args.get('cursor') else None
+    return render_template('teams_list.html', teams=page.items, next_url=next_url, first_url=first_url)
 
 
 # ============================================================================
 # DRILL CATALOG
 # ============================================================================
 
+CATALOG_FILTERS = ('category', 'skill_level', 'search', 'age_group')
+
 @bp.route('/drills')
 def drills_catalog():
     """Drill catalog - browse all drills"""
     category = request.args.get('category', 'All')
     skill_level = request.args.get('skill_level', 'All')
-    search_query = request.args.get('search', '')
-    age_group = request.args.get('age_group', 'All')
-
-    query = Drill.query
-
-    if category != 'All':
-        query = query.filter_by(category=category)
-
-    if skill_level != 'All':
-        query = query.filter_by(skill_level=skill_level)
-
-    # Apply search filter
-    if search_query:
-        query = query.filter(
-            db.or_(
-                Drill.name.ilike(f'%{search_query}%'),
-                Drill.description.ilike(f'%{search_query}%')
-            )
-        )
-
-    # Apply age group filter
-    if age_group != 'All':
-        query = query.filter(Drill.recommended_age_groups.ilike(f'%{age_group}%'))
-
-    drills = query.order_by(Drill.name).all()
 
-    return render_template('drills_catalog.html', drills=drills,
+    page, snippets, fuzzy = paginate_drill_catalog(request.args)
+
+    # Pager and export links keep the current filters
+    filters = {name: request.args[name] for name in CATALOG_FILTERS if request.args.get(name)}
+    per_page = request.args.get('per_page')
+    next_url = (url_for('main.drills_catalog', cursor=page.next_cursor, per_page=per_page, **filters)
+                if page.has_next else None)
+    first_url = url_for('main.drills_catalog', per_page=per_page, **filters) if request.args.get('cursor') else None
+
+    return render_template('drills_catalog.html', drills=page.items,
+                         snippets=snippets,
+                         fuzzy=fuzzy,
+                         next_url=next_url,
+                         first_url=first_url,
+                         filters=filters,
                          selected_category=category,
                          selected_skill=skill_level)
 
@@ -118,7 +134,67 @@ def drills_catalog():
 def drill_detail(drill_id):
     """View detailed information about a specific drill"""
     drill = Drill.query.get_or_404(drill_id)
-    return render_template('drill_detail.html', drill=drill)
+    return render_template('drill_detail.html', drill=drill, similar_drills=get_similar_drills(drill))
+
+@bp.route('/drill/<int:drill_id>/diagram')
+def drill_diagram_latest(drill_id):
+    """Redirect to the drill's current content-addressed diagram"""
+    drill = Drill.query.get_or_404(drill_id)
+    fmt = request.args.get('format') or default_format()
+    if fmt not in DIAGRAM_FORMATS:
+        abort(404)
+    key = diagram_key(drill, fmt)
+    if key is None:
+        abort(404)
+    response = redirect(url_for('main.drill_diagram', drill_id=drill.id, key=key, fmt=fmt))
+    response.cache_control.no_cache = True
+    return response
+
+@bp.route('/drill/<int:drill_id>/diagram/<key>.<fmt>')
+def drill_diagram(drill_id, key, fmt):
+    """Serve a rendered drill diagram by content hash, rendering it on first request"""
+    if fmt not in DIAGRAM_FORMATS or not DIAGRAM_KEY_RE.fullmatch(key):
+        abort(404)
+
+    # A cached render is served without touching the database
+    path = cached_diagram_path(key, fmt)
+    if path is None:
+        drill = Drill.query.get_or_404(drill_id)
+        rendered = ensure_diagram(drill, fmt)
+        if rendered is None:
+            abort(404)
+        if rendered[0] != key:
+            # The diagram's inputs changed since this URL was handed out
+            return redirect(url_for('main.drill_diagram', drill_id=drill.id, key=rendered[0], fmt=fmt))
+        path = rendered[1]
+
+    return send_diagram(path, key, DIAGRAM_FORMATS[fmt])
+
+@bp.route('/drill/<int:drill_id>/diagram/<variant>/<key>.<fmt>')
+def drill_diagram_variant(drill_id, variant, key, fmt):
+    """Serve one responsive raster variant of a drill diagram, rendering all of them on first request"""
+    if variant not in DIAGRAM_VARIANTS or fmt not in VARIANT_FORMATS or not DIAGRAM_KEY_RE.fullmatch(key):
+        abort(404)
+
+    path = cached_diagram_path(key, fmt)
+    if path is None:
+        drill = Drill.query.get_or_404(drill_id)
+        rendered = ensure_diagram(drill, fmt, variant)
+        if rendered is None:
+            abort(404)
+        if rendered[0] != key:
+            return redirect(url_for('main.drill_diagram_variant', drill_id=drill.id, variant=variant,
+                                    key=rendered[0], fmt=fmt))
+        path = rendered[1]
+
+    return send_diagram(path, key, VARIANT_FORMATS[fmt])
+
+def send_diagram(path, key, mimetype):
+    """Send a rendered diagram; its URL is content-addressed, so it is cached as immutable"""
+    response = send_file(path, mimetype=mimetype, etag=key, conditional=True, max_age=DIAGRAM_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 
 # ============================================================================
@@ -139,17 +215,19 @@ def view_session_templates(team_id):
     # Get templates matching team's attributes
     query = SessionTemplate.query
 
+    # Integer ANDs on the tag bitmasks (templates without a skill level suit every level)
     if team.skill_level:
-        query = query.filter(
-            (SessionTemplate.skill_level == team.skill_level) |
-            (SessionTemplate.skill_level == None)
-        )
+        query = query.filter(masks_overlap(SessionTemplate.skill_level_mask, team.skill_level_mask))
 
     if team.age_group:
-        query = query.filter(
-            (SessionTemplate.recommended_age_groups.contains(team.age_group)) |
-            (SessionTemplate.recommended_age_groups == None)
-        )
+        if team.age_group_mask:
+            matches_age = masks_overlap(SessionTemplate.age_group_mask, team.age_group_mask)
+        else:
+            # Age groups outside the mask vocabulary: fall back to the tag table
+            matches_age = SessionTemplate.id.in_(db.select(TemplateAgeGroup.template_id).where(
+                TemplateAgeGroup.age_group == normalize_age_group(team.age_group)
+            ))
+        query = query.filter(matches_age | (SessionTemplate.recommended_age_groups == None))
 
     templates = query.all()
 
@@ -159,20 +237,22 @@ def view_session_templates(team_id):
 def create_from_template(team_id, template_id):
     """Create a practice plan from a template (pre-populated for editing)"""
     team = Team.query.get_or_404(team_id)
-    template = SessionTemplate.query.get_or_404(template_id)
+    template = SessionTemplate.query.options(
+        selectinload(SessionTemplate.template_drills).joinedload(TemplateDrill.drill)
+    ).get_or_404(template_id)
 
     # Get all drills for the custom builder
     all_drills = Drill.query.order_by(Drill.category, Drill.name).all()
 
     # Pre-populate with template drills
     selected_drills = []
-    for td in sorted(template.template_drills, key=lambda x: x.order):
+    for td in template.template_drills:
         selected_drills.append({
             'id': td.drill.id,
             'name': td.drill.name,
             'duration': td.duration_minutes,
             'category': td.drill.category,
-            'diagram': td.drill.diagram_url if td.drill.diagram_url else ''
+            'diagram': diagram_src(td.drill) or ''
         })
 
     return render_template('practice_plan_form.html',
@@ -242,82 +322,513 @@ def new_practice_plan(team_id):
 
     return render_template('practice_plan_form.html', team=team, suggested_drills=suggested_drills)
 
+@bp.route('/team/<int:team_id>/plan/generate', methods=['POST'])
+def generate_practice_plan_route(team_id):
+    """Auto-generate a practice plan for a team, save it and open it for editing"""
+    team = Team.query.get_or_404(team_id)
+    try:
+        duration = parse_session_duration(request.form.get('duration_minutes'), team)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('main.new_practice_plan', team_id=team.id))
+
+    generated = generate_practice_plan(team, duration)
+    if not generated.items:
+        flash('No drills in the library suit this team yet, so a plan could not be generated.', 'warning')
+        return redirect(url_for('main.new_practice_plan', team_id=team.id))
+
+    plan = PracticePlan(
+        name=request.form.get('name') or f'Auto plan - {datetime.now():%b %d}',
+        team_id=team.id,
+        duration_minutes=generated.target_minutes,
+        notes=request.form.get('notes')
+    )
+    plan.plan_drills = [
+        PlanDrill(drill_id=item.drill.id, order=order, duration_minutes=item.duration_minutes,
+                  notes=item.phase.label)
+        for order, item in enumerate(generated.items)
+    ]
+    db.session.add(plan)
+    db.session.commit()
+
+    message = f'Generated "{plan.name}" with {len(generated.items)} drills.'
+    if generated.missing_focus_areas:
+        message += f' Not covered: {", ".join(generated.missing_focus_areas)}.'
+    flash(message, 'success')
+    return redirect(url_for('main.edit_practice_plan', plan_id=plan.id))
+
 @bp.route('/plan/<int:plan_id>')
 def practice_plan_detail(plan_id):
     """View a practice plan"""
-    plan = PracticePlan.query.get_or_404(plan_id)
+    plan = get_plan_with_drills(plan_id)
     return render_template('practice_plan_detail.html', plan=plan)
 
 @bp.route('/team/<int:team_id>/plans')
 def team_practice_plans(team_id):
     """List all practice plans for a team"""
     team = Team.query.get_or_404(team_id)
-    plans = PracticePlan.query.filter_by(team_id=team_id).order_by(PracticePlan.created_at.desc()).all()
-    return render_template('team_practice_plans.html', team=team, plans=plans)
+    per_page = request.args.get('per_page')
+    page = paginate_team_plans(team_id, request.args.get('cursor'), parse_per_page(per_page))
+    next_url = (url_for('main.team_practice_plans', team_id=team_id, cursor=page.next_cursor, per_page=per_page)
+                if page.has_next else None)
+    first_url = url_for('main.team_practice_plans', team_id=team_id, per_page=per_page) if request.args.get('cursor') else None
+    seasons = Season.query.filter_by(team_id=team_id).order_by(Season.start_date.desc()).all()
+    return render_template('team_practice_plans.html', team=team, plans=page.items,
+                         next_url=next_url, first_url=first_url, seasons=seasons,
+                         default_season_weeks=DEFAULT_WEEKS, max_season_weeks=MAX_WEEKS)
+
+
+# ============================================================================
+# SEASON PLANNING
+# ============================================================================
+
+@bp.route('/team/<int:team_id>/season', methods=['POST'])
+def create_season_route(team_id):
+    """Generate a season of weekly practice plans for a team"""
+    team = Team.query.get_or_404(team_id)
+    try:
+        options = parse_season_options(request.form, team)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('main.team_practice_plans', team_id=team.id))
+
+    season = create_season(team, **options)
+    db.session.commit()
+    flash(f'Generated {season.weeks} weekly plans for "{season.name}".', 'success')
+    return redirect(url_for('main.season_detail', season_id=season.id))
+
+@bp.route('/season/<int:season_id>')
+def season_detail(season_id):
+    """View a season week by week"""
+    season = get_season_with_plans(season_id)
+    plans = {plan.season_week: plan for plan in season.plans}
+    weeks = [{
+        'number': week,
+        'date': season.week_date(week),
+        'skill_level': week_skill_level(season, week),
+        'focus_areas': week_focus_areas(season.team.focus_areas_list, week),
+        'plan': plans.get(week),
+    } for week in range(1, season.weeks + 1)]
+    return render_template('season_detail.html', season=season, weeks=weeks)
+
+@bp.route('/season/<int:season_id>/week/<int:week>/regenerate', methods=['POST'])
+def regenerate_season_week(season_id, week):
+    """Regenerate one week of a season, keeping the other weeks"""
+    season = Season.query.get_or_404(season_id)
+    try:
+        regenerate_week(season, week)
+    except ValueError as e:
+        flash(str(e), 'danger')
+    else:
+        db.session.commit()
+        flash(f'Week {week} regenerated.', 'success')
+    return redirect(url_for('main.season_detail', season_id=season.id, _anchor=f'week-{week}'))
+
+@bp.route('/season/<int:season_id>/delete', methods=['POST'])
+def delete_season(season_id):
+    """Delete a season and its plans"""
+    season = Season.query.get_or_404(season_id)
+    team_id = season.team_id
+    db.session.delete(season)
+    db.session.commit()
+    flash('Season deleted.', 'success')
+    return redirect(url_for('main.team_practice_plans', team_id=team_id))
 
 
 # ============================================================================
 # UTILITY & API ROUTES
 # ============================================================================
 
+SUGGESTION_FIELDS = ('id', 'name', 'category', 'skill_level', 'duration_minutes', 'description')
+MAX_BATCH_TEAMS = 500
+MAX_BATCH_K = 100
+
 @bp.route('/api/drills/suggest/<int:team_id>')
 def api_suggest_drills(team_id):
     """API endpoint to get suggested drills for a team"""
     team = Team.query.get_or_404(team_id)
     drills = get_suggested_drills(team)
 
-    return jsonify([{
-        'id': d.id,
-        'name': d.name,
-        'category': d.category,
-        'skill_level': d.skill_level,
-        'duration_minutes': d.duration_minutes,
-        'description': d.description
-    } for d in drills])
+    return jsonify([{field: getattr(d, field) for field in SUGGESTION_FIELDS} for d in drills])
+
+@bp.route('/api/drills/suggest', methods=['GET', 'POST'])
+def api_suggest_drills_batch():
+    """
+    API endpoint returning the top suggestions for many teams in one call
+
+    Parameters (query string, or a JSON body for POST):
+    - team_ids: list of team ids (or a comma-separated string)
+    - k: suggestions per team (default 10, max 100)
+    - fields: drill fields to include (default: those of /api/drills/suggest/<id>;
+      'score' adds the number of shared focus areas, adjusted for the team's recent drill usage)
+    """
+    params = request.get_json(silent=True) if request.method == 'POST' else None
+    params = params if isinstance(params, dict) else request.args
+    try:
+        team_ids = parse_id_list(params.get('team_ids'))
+        k = parse_duration(params.get('k') or 10, 'k')
+        fields = parse_field_list(params.get('fields'), SUMMARY_COLUMNS + ('score',), SUGGESTION_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not team_ids:
+        return jsonify({'error': 'team_ids is required'}), 400
+    if len(team_ids) > MAX_BATCH_TEAMS:
+        return jsonify({'error': f'At most {MAX_BATCH_TEAMS} teams per request'}), 400
+
+    teams = Team.query.filter(Team.id.in_(team_ids)).all()
+    engine = get_suggestion_index().scoring_engine()
+    adjustments = recency_adjustments([team.id for team in teams])
+    ranked = engine.score_teams(teams, min(k, MAX_BATCH_K), adjustments=adjustments)
+
+    results = []
+    for team_id in team_ids:
+        if team_id not in ranked:
+            continue
+        drill_ids, scores = ranked[team_id]
+        drills = engine.drills_for(drill_ids)
+        results.append({
+            'team_id': team_id,
+            'drills': [{field: float(score) if field == 'score' else getattr(drill, field) for field in fields}
+                       for drill, score in zip(drills, scores)]
+        })
+    return jsonify({
+        'results': results,
+        'missing_team_ids': [team_id for team_id in team_ids if team_id not in ranked]
+    })
+
+
+@bp.route('/api/drills')
+def api_drills():
+    """API endpoint for the drill catalog (same filters as /drills, keyset paginated)"""
+    page, _, fuzzy = paginate_drill_catalog(request.args, snippets=False)
+    return jsonify({
+        'items': [d.to_dict() for d in page.items],
+        'next_cursor': page.next_cursor,
+        'fuzzy': fuzzy
+    })
+
+@bp.route('/api/drill/<int:drill_id>/similar')
+def api_similar_drills(drill_id):
+    """API endpoint for the drills most similar to a drill"""
+    drill = Drill.query.get_or_404(drill_id)
+    return jsonify([
+        dict(similar.to_dict(), similarity=round(score, 4))
+        for similar, score in get_similar_drills(drill)
+    ])
+
+@bp.route('/api/team/<int:team_id>/season', methods=['POST'])
+def api_create_season(team_id):
+    """API endpoint generating a season of weekly plans (JSON body with the season form fields)"""
+    team = Team.query.get_or_404(team_id)
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'expected a JSON object'}), 400
+    try:
+        options = parse_season_options(data, team)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    season = create_season(team, **options)
+    db.session.commit()
+    return jsonify(season_to_dict(get_season_with_plans(season.id))), 201
+
+@bp.route('/api/season/<int:season_id>')
+def api_season(season_id):
+    """API endpoint for a season and its weekly plans"""
+    return jsonify(season_to_dict(get_season_with_plans(season_id)))
+
+@bp.route('/api/season/<int:season_id>/week/<int:week>/regenerate', methods=['POST'])
+def api_regenerate_season_week(season_id, week):
+    """API endpoint regenerating one week of a season"""
+    season = Season.query.get_or_404(season_id)
+    try:
+        plan = regenerate_week(season, week)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    db.session.commit()
+    return jsonify(plan_with_drills_to_dict(plan))
+
+@bp.route('/api/teams')
+def api_teams():
+    """API endpoint listing teams, newest first (keyset paginated)"""
+    page = paginate_teams(request.args.get('cursor'), parse_per_page(request.args.get('per_page')))
+    return jsonify({
+        'items': [t.to_dict() for t in page.items],
+        'next_cursor': page.next_cursor
+    })
+
+@bp.route('/api/team/<int:team_id>/plans')
+def api_team_practice_plans(team_id):
+    """API endpoint listing a team's practice plans, newest first (keyset paginated)"""
+    Team.query.get_or_404(team_id)
+    page = paginate_team_plans(team_id, request.args.get('cursor'), parse_per_page(request.args.get('per_page')))
+    return jsonify({
+        'items': [p.to_dict() for p in page.items],
+        'next_cursor': page.next_cursor
+    })
+
+@bp.route('/api/plan/<int:plan_id>', methods=['PATCH'])
+def api_update_practice_plan(plan_id):
+    """
+    Partially update a practice plan (for autosaving editors)
+
+    The JSON body may contain name, duration_minutes, notes, is_completed and
+    drills, the full ordered drill list as objects with drill_id,
+    duration_minutes and optionally id (existing plan drill) and notes. Only
+    changed rows are written.
+    """
+    plan = PracticePlan.query.options(selectinload(PracticePlan.plan_drills)).get_or_404(plan_id)
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'expected a JSON object'}), 400
+
+    try:
+        if 'name' in data:
+            if not str(data['name'] or '').strip():
+                raise ValueError('name must not be empty')
+            plan.name = str(data['name']).strip()
+        if 'duration_minutes' in data:
+            plan.duration_minutes = parse_duration(data['duration_minutes'])
+        if 'notes' in data:
+            plan.notes = parse_notes(data['notes'])
+        if 'is_completed' in data:
+            if not isinstance(data['is_completed'], bool):
+                raise ValueError('is_completed must be true or false')
+            if data['is_completed'] != bool(plan.is_completed):
+                plan.mark_completed(data['is_completed'])
+        changes = None
+        if 'drills' in data:
+            if not isinstance(data['drills'], list):
+                raise ValueError('drills must be a list')
+            changes = apply_plan_drill_entries(plan, [parse_drill_entry(d) for d in data['drills']])
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+    db.session.commit()
+    return jsonify({
+        'plan': plan.to_dict(),
+        'drills': [{
+            'id': pd.id,
+            'drill_id': pd.drill_id,
+            'order': pd.order,
+            'duration_minutes': pd.duration_minutes,
+            'notes': pd.notes
+        } for pd in plan.plan_drills],
+        'changes': changes.to_dict() if changes else None
+    })
+
+
+@bp.route('/api/team/<int:team_id>/plan/generate')
+def api_generate_practice_plan(team_id):
+    """API endpoint previewing an auto-generated plan (?duration=minutes); nothing is saved"""
+    team = Team.query.get_or_404(team_id)
+    try:
+        duration = parse_session_duration(request.args.get('duration'), team)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(generate_practice_plan(team, duration).to_dict())
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def get_suggested_drills(team):
-    """Get drills suggested for a team based on their attributes"""
-    query = Drill.query
+def filter_drills(args):
+    """
+    Build the drill catalog query from request args
 
-    # Filter by skill level
-    if team.skill_level:
-        query = query.filter(Drill.skill_level == team.skill_level)
+    Returns (query, search, fuzzy): search is the (drill_id, rank) subquery to
+    rank by, or None when no search term was given; fuzzy is True when it holds
+    typo-tolerant matches because the full-text index found nothing.
+    """
+    category = args.get('category', 'All')
+    skill_level = args.get('skill_level', 'All')
+    search_query = args.get('search', '')
+    age_group = args.get('age_group', 'All')
 
-    # Filter by age group (check if team's age group is in recommended_age_groups)
-    if team.age_group:
-        query = query.filter(Drill.recommended_age_groups.contains(team.age_group))
+    query = Drill.query
 
-    # Get all matching drills
-    drills = query.all()
+    if category != 'All':
+        query = query.filter_by(category=category)
 
-    # If we have focus areas, prioritize drills that match
-    if team.focus_areas:
-        focus_list = team.focus_areas_list
-        scored_drills = []
+    if skill_level != 'All':
+        query = query.filter_by(skill_level=skill_level)
 
-        for drill in drills:
-            score = 0
-            if drill.focus_areas:
-                drill_focus = [f.strip() for f in drill.focus_areas.split(',')]
-                # Count matching focus areas
-                matches = len(set(focus_list) & set(drill_focus))
-                score = matches
-            scored_drills.append((drill, score))
+    # Apply age group filter (bitmask AND; the tag table for groups outside the mask vocabulary)
+    if age_group != 'All':
+        age_mask = age_group_bits(age_group)
+        if age_mask:
+            query = query.filter(masks_overlap(Drill.age_group_mask, age_mask))
+        else:
+            query = query.join(DrillAgeGroup).filter(
+                DrillAgeGroup.age_group == normalize_age_group(age_group)
+            )
 
-        # Sort by score (descending) and return
-        scored_drills.sort(key=lambda x: x[1], reverse=True)
-        return [d[0] for d in scored_drills]
+    # Apply search filter (FTS5 index, or trigram matches when nothing matches exactly)
+    search, fuzzy = None, False
+    if search_query:
+        search = search_subquery(search_query)
+        if search is not None and not has_matches(search_query):
+            search, fuzzy = fuzzy_subquery(search_query), True
+            if search is None:
+                return query.filter(db.false()), None, False
+    if search is not None:
+        query = query.join(search, search.c.drill_id == Drill.id)
+
+    return query, search, fuzzy
+
+def paginate_drill_catalog(args, snippets=True):
+    """
+    Fetch one catalog page: by name, or by best bm25 match when searching
+
+    Returns (page, snippets, fuzzy) where snippets maps drill id -> highlighted
+    text and fuzzy is True for typo-tolerant results.
+    """
+    query, search, fuzzy = filter_drills(args)
+    cursor = args.get('cursor')
+    per_page = parse_per_page(args.get('per_page'))
+
+    if search is None:
+        page = paginate_keyset(query, (Drill.name, Drill.id), lambda d: (d.name, d.id),
+                               cursor=cursor, per_page=per_page)
+        return page, {}, False
+
+    page = paginate_keyset(query.add_columns(search.c.rank), (search.c.rank, Drill.id),
+                           lambda row: (row[1], row[0].id), cursor=cursor, per_page=per_page)
+    page.items = [drill for drill, _ in page.items]
+    if not snippets or fuzzy:
+        return page, {}, fuzzy
+    return page, search_snippets(args.get('search'), [drill.id for drill in page.items]), fuzzy
+
+def paginate_teams(cursor, per_page):
+    """Fetch one page of teams, newest first"""
+    return paginate_keyset(Team.query, (Team.created_at, Team.id), lambda t: (t.created_at, t.id),
+                           cursor=cursor, per_page=per_page, descending=True)
+
+def paginate_team_plans(team_id, cursor, per_page):
+    """Fetch one page of a team's practice plans, newest first"""
+    query = PracticePlan.query.filter_by(team_id=team_id).options(selectinload(PracticePlan.plan_drills))
+    return paginate_keyset(query, (PracticePlan.created_at, PracticePlan.id), lambda p: (p.created_at, p.id),
+                           cursor=cursor, per_page=per_page, descending=True)
+
+def parse_id_list(value):
+    """Parse ids given as a list or a comma-separated string (duplicates dropped, order kept)"""
+    if value is None:
+        return []
+    items = value.split(',') if isinstance(value, str) else value
+    if not isinstance(items, list):
+        raise ValueError('expected a list of ids')
+    ids = []
+    for item in items:
+        if isinstance(item, str) and not item.strip():
+            continue
+        try:
+            item_id = int(item)
+        except (TypeError, ValueError):
+            raise ValueError(f'invalid id {item!r}')
+        if item_id not in ids:
+            ids.append(item_id)
+    return ids
+
+def parse_field_list(value, allowed, default):
+    """Parse a field selection given as a list or a comma-separated string"""
+    if not value:
+        return default
+    if isinstance(value, str):
+        fields = [f.strip() for f in value.split(',')]
+    elif isinstance(value, list):
+        fields = value
+    else:
+        raise ValueError('fields must be a list or a comma-separated string')
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f'unknown field(s): {", ".join(map(str, unknown))}')
+    return fields
+
+def parse_session_duration(value, team):
+    """Session length for plan generation; defaults to the team's recommended duration"""
+    if not value:
+        return team.recommended_session_duration
+    minutes = parse_duration(value)
+    if minutes > MAX_SESSION_MINUTES:
+        raise ValueError(f'Sessions can be at most {MAX_SESSION_MINUTES} minutes')
+    return minutes
+
+def parse_season_options(values, team):
+    """Season settings from form or JSON values; raises ValueError for invalid ones"""
+    start = values.get('start_date')
+    try:
+        start_date = date.fromisoformat(start) if start else date.today()
+    except (TypeError, ValueError):
+        raise ValueError('start_date must be a date (YYYY-MM-DD)')
+    weeks = parse_duration(values.get('weeks') or DEFAULT_WEEKS, 'weeks')
+    if weeks > MAX_WEEKS:
+        raise ValueError(f'A season can have at most {MAX_WEEKS} weeks')
+
+    name = values.get('name') or None
+    if name is not None and not isinstance(name, str):
+        raise ValueError('name must be a string')
+
+    options = {'start_date': start_date, 'weeks': weeks, 'name': name,
+               'duration_minutes': parse_session_duration(values.get('duration_minutes'), team)}
+    for field in ('repeat_window', 'max_repeats'):
+        if values.get(field):
+            options[field] = parse_duration(values[field], field)
+    if options.get('repeat_window', 0) > MAX_WEEKS:
+        raise ValueError(f'repeat_window can be at most {MAX_WEEKS} weeks')
+    # A drill is used at most once a week, so more repeats than weeks is no cap
+    repeat_window = options.get('repeat_window', DEFAULT_REPEAT_WINDOW)
+    if options.get('max_repeats', 0) > repeat_window:
+        raise ValueError(f'max_repeats can be at most repeat_window ({repeat_window})')
+    for field in ('start_skill_level', 'end_skill_level'):
+        if values.get(field):
+            if values[field] not in SKILL_LEVELS:
+                raise ValueError(f'{field} must be one of {", ".join(SKILL_LEVELS)}')
+            options[field] = values[field]
+    if (options.get('start_skill_level') and options.get('end_skill_level')
+            and SKILL_LEVELS.index(options['start_skill_level']) > SKILL_LEVELS.index(options['end_skill_level'])):
+        raise ValueError('end_skill_level cannot be below start_skill_level')
+    return options
+
+def get_season_with_plans(season_id):
+    """Load a season with its team, plans and plan drills in a fixed number of queries"""
+    return Season.query.options(
+        joinedload(Season.team),
+        selectinload(Season.plans).selectinload(PracticePlan.plan_drills).joinedload(PlanDrill.drill),
+    ).get_or_404(season_id)
+
+def plan_with_drills_to_dict(plan):
+    """Serialize a plan with its ordered drills"""
+    return dict(plan.to_dict(), drills=[{
+        'order': pd.order,
+        'drill_id': pd.drill_id,
+        'name': pd.drill.name,
+        'duration_minutes': pd.duration_minutes,
+        'notes': pd.notes,
+    } for pd in plan.plan_drills])
+
+def season_to_dict(season):
+    """Serialize a season with its weekly plans"""
+    return dict(season.to_dict(), plans=[plan_with_drills_to_dict(plan) for plan in season.plans])
+
+def get_plan_with_drills(plan_id):
+    """Load a plan with its team and ordered drills in a fixed number of queries"""
+    return PracticePlan.query.options(
+        joinedload(PracticePlan.team),
+        selectinload(PracticePlan.plan_drills).joinedload(PlanDrill.drill),
+    ).get_or_404(plan_id)
 
-    return drills
+def get_suggested_drills(team):
+    """
+    Get drills suggested for a team based on their attributes (served from the in-memory index),
+    moving drills the team used recently down and ones it has not done in a while up
+    """
+    adjustment = recency_adjustments([team.id]).get(team.id)
+    return get_suggestion_index().rank_for_team(team, adjustment=adjustment)
 
 @bp.route('/drills/import', methods=['GET', 'POST'])
 def import_drills():
-    """Import drills from CSV file"""
+    """Import drills from a CSV or JSON Lines file"""
     if request.method == 'POST':
         if 'file' not in request.files:
             flash('No file selected', 'danger')
@@ -329,68 +840,45 @@ def import_drills():
             flash('No file selected', 'danger')
             return redirect(request.url)
 
-        if not file.filename.endswith('.csv'):
-            flash('Please upload a CSV file', 'danger')
+        if not file.filename.lower().endswith(ACCEPTED_EXTENSIONS):
+            flash('Please upload a CSV or JSON Lines (.jsonl) file', 'danger')
             return redirect(request.url)
 
+        # Large files: hand off to the background queue and show progress
+        if request.form.get('background'):
+            job = enqueue_import(file)
+            return redirect(url_for('main.import_drills', job_id=job.id))
+
         try:
-            # Read CSV file
-            stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-            csv_reader = csv.DictReader(stream)
-
-            imported_count = 0
-            skipped_count = 0
-            errors = []
-
-            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
-                try:
-                    # Check if drill with same name already exists
-                    existing = Drill.query.filter_by(name=row['name'].strip()).first()
-                    if existing:
-                        skipped_count += 1
-                        continue
-
-                    # Create new drill
-                    drill = Drill(
-                        name=row['name'].strip(),
-                        category=row['category'].strip(),
-                        sub_category=row.get('sub_category', '').strip() if row.get('sub_category') else None,
-                        description=row['description'].strip(),
-                        equipment_needed=row.get('equipment_needed', '').strip() if row.get('equipment_needed') else None,
-                        min_players=int(row['min_players']) if row.get('min_players') and row['min_players'].strip() else 4,
-                        max_players=int(row['max_players']) if row.get('max_players') and row['max_players'].strip() else 20,
-                        recommended_age_groups=row.get('recommended_age_groups', '').strip() if row.get('recommended_age_groups') else None,
-                        skill_level=row.get('skill_level', '').strip() if row.get('skill_level') else 'All',
-                        duration_minutes=int(row['duration_minutes']) if row.get('duration_minutes') and row['duration_minutes'].strip() else None,
-                        focus_areas=row.get('focus_areas', '').strip() if row.get('focus_areas') else None,
-                        diagram_url=row.get('diagram_url', '').strip() if row.get('diagram_url') else None
-                    )
-
-                    db.session.add(drill)
-                    imported_count += 1
-
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
-                    continue
-
-            # Commit all drills
-            db.session.commit()
+            result = import_drills_file(file.stream, file.filename)
 
             # Show results
-            if imported_count > 0:
-                flash(f'Successfully imported {imported_count} drill(s)!', 'success')
-            if skipped_count > 0:
-                flash(f'Skipped {skipped_count} duplicate drill(s)', 'info')
-            if errors:
-                flash(f'Errors: {"; ".join(errors[:5])}', 'warning')  # Show first 5 errors
+            flash(f'Processed {result.total_rows} row(s).', 'info')
+            if result.imported > 0:
+                flash(f'Successfully imported {result.imported} drill(s)!', 'success')
+            if result.skipped > 0:
+                flash(f'Skipped {result.skipped} duplicate drill(s)', 'info')
+            if result.errors:
+                flash(f'{result.error_count} error(s): {"; ".join(result.errors[:5])}', 'warning')  # Show first 5 errors
 
-            return redirect(url_for('main.drills'))
+            return redirect(url_for('main.drills_catalog'))
 
         except Exception as e:
+            db.session.rollback()
             flash(f'Error processing CSV file: {str(e)}', 'danger')
             return redirect(request.url)
 
-    return render_template('import_drills.html')
+    job = None
+    job_id = request.args.get('job_id', type=int)
+    if job_id:
+        job = ImportJob.query.get_or_404(job_id)
+    return render_template('import_drills.html', job=job)
+
+@bp.route('/api/import-jobs/<int:job_id>')
+def api_import_job_status(job_id):
+    """API endpoint reporting the progress of a background drill import"""
+    job = ImportJob.query.get_or_404(job_id)
+    return jsonify(job.to_dict())
 
 @bp.route('/drills/import/template')
 def download_import_template():
@@ -403,7 +891,7 @@ def download_import_template():
     writer.writerow([
         'name', 'category', 'sub_category', 'description', 'equipment_needed',
         'min_players', 'max_players', 'recommended_age_groups', 'skill_level',
-        'duration_minutes', 'focus_areas', 'diagram_url'
+        'duration_minutes', 'focus_areas', 'diagram_url', 'diagram_spec'
     ])
 
     # Write example rows
@@ -419,7 +907,14 @@ def download_import_template():
         'Beginner',
         '15',
         'Passing accuracy, First touch, Communication',
-        ''
+        '',
+        json.dumps({
+            'field': 'small', 'title': 'Passing Triangle',
+            'cones': [[5, 5], [25, 5], [15, 25]],
+            'players': [{'x': 5, 'y': 5, 'label': '1'}, {'x': 25, 'y': 5, 'label': '2'}, {'x': 15, 'y': 25, 'label': '3'}],
+            'balls': [[6, 5]],
+            'arrows': [{'from': [5, 5], 'to': [25, 5], 'label': 'Pass'}, {'from': [25, 5], 'to': [15, 25]}],
+        })
     ])
 
     writer.writerow([
@@ -434,6 +929,7 @@ def download_import_template():
         'Intermediate',
         '20',
         'Possession, Passing, Awareness',
+        '',
         ''
     ])
 
@@ -446,6 +942,34 @@ def download_import_template():
         download_name='drill_import_template.csv'
     )
 
+@bp.route('/drills/export')
+def export_drills_catalog():
+    """Stream the drill catalog as CSV or JSON Lines (accepts the /drills filters)"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        abort(400)
+    query, _, _ = filter_drills(request.args)
+    return streaming_download(export_drills(query, fmt), 'drills', fmt)
+
+@bp.route('/plans/export')
+def export_practice_plans_route():
+    """Stream every team's practice plans (or one team's, with ?team_id=) as CSV or JSON Lines"""
+    fmt = request.args.get('format', 'jsonl')
+    if fmt not in EXPORT_FORMATS:
+        abort(400)
+    team_id = request.args.get('team_id', type=int)
+    name = f'team_{team_id}_practice_plans' if team_id else 'practice_plans'
+    return streaming_download(export_practice_plans(fmt, team_id), name, fmt)
+
+def streaming_download(chunks, name, fmt):
+    """Wrap a generator of text chunks in a streamed attachment response"""
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    return Response(
+        stream_with_context(chunk.encode('utf-8') for chunk in chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={name}.{extension}'}
+    )
+
 @bp.route('/plan/<int:plan_id>/delete', methods=['POST'])
 def delete_practice_plan(plan_id):
     """Delete a practice plan"""
@@ -462,6 +986,15 @@ def delete_practice_plan(plan_id):
     flash(f'Practice plan "{plan.name}" deleted successfully!', 'success')
     return redirect(url_for('main.team_practice_plans', team_id=team_id))
 
+@bp.route('/plan/<int:plan_id>/complete', methods=['POST'])
+def complete_practice_plan(plan_id):
+    """Mark a practice plan as completed (or, with completed=0, not completed)"""
+    plan = PracticePlan.query.get_or_404(plan_id)
+    plan.mark_completed(request.form.get('completed', '1') != '0')
+    db.session.commit()
+    flash(f'Practice plan "{plan.name}" marked {"completed" if plan.is_completed else "not completed"}.', 'success')
+    return redirect(url_for('main.practice_plan_detail', plan_id=plan.id))
+
 @bp.route('/plan/<int:plan_id>/duplicate', methods=['POST'])
 def duplicate_practice_plan(plan_id):
     """Duplicate a practice plan"""
@@ -498,13 +1031,13 @@ def duplicate_practice_plan(plan_id):
 @bp.route('/plan/<int:plan_id>/print')
 def print_practice_plan(plan_id):
     """Print-friendly view of practice plan"""
-    plan = PracticePlan.query.get_or_404(plan_id)
+    plan = get_plan_with_drills(plan_id)
     return render_template('practice_plan_print.html', plan=plan)
 
 @bp.route('/plan/<int:plan_id>/edit', methods=['GET', 'POST'])
 def edit_practice_plan(plan_id):
     """Edit an existing practice plan"""
-    plan = PracticePlan.query.get_or_404(plan_id)
+    plan = get_plan_with_drills(plan_id)
     team = plan.team
 
     if request.method == 'POST':
@@ -513,21 +1046,13 @@ def edit_practice_plan(plan_id):
         plan.duration_minutes = int(request.form.get('duration_minutes'))
         plan.notes = request.form.get('notes')
 
-        # Delete existing plan drills
-        PlanDrill.query.filter_by(plan_id=plan.id).delete()
-
-        # Add updated drills
-        drill_ids = request.form.getlist('drill_ids[]')
-        drill_durations = request.form.getlist('drill_durations[]')
-
-        for order, (drill_id, drill_duration) in enumerate(zip(drill_ids, drill_durations)):
-            plan_drill = PlanDrill(
-                plan_id=plan.id,
-                drill_id=int(drill_id),
-                order=order,
-                duration_minutes=int(drill_duration)
-            )
-            db.session.add(plan_drill)
+        # Apply only the drill changes (keeps row ids and per-drill notes)
+        try:
+            apply_plan_drill_entries(plan, entries_from_form(request.form))
+        except ValueError as e:
+            db.session.rollback()
+            flash(f'Could not save practice plan: {e}', 'danger')
+            return redirect(url_for('main.edit_practice_plan', plan_id=plan.id))
 
         db.session.commit()
 
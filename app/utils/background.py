@@ -0,0 +1,74 @@
+"""In-process background work: drill imports and the jobs they queue
+
+Tasks are handed to a local executor chosen by the IMPORT_EXECUTOR setting:
+- 'thread': a ThreadPoolExecutor inside the web process (default)
+- 'process': a ProcessPoolExecutor; each worker builds its own app
+- 'inline': run immediately in the caller (testing)
+
+A task is a module-level function, called as task(*args) inside an app
+context. The queue lives in memory, so tasks still waiting when the server
+stops are lost; anything a task records must be recomputable (a similarity
+refresh is redone by rebuild_similarities).
+"""
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from flask import current_app
+
+from app import db
+
+# Config forwarded to worker processes so they open the same database
+_WORKER_CONFIG_KEYS = ('SQLALCHEMY_DATABASE_URI', 'SQLALCHEMY_ENGINE_OPTIONS', 'SQLITE_PRAGMAS')
+
+_executors = {}
+_worker_apps = {}  # per worker process: config -> app, so process-local caches outlive one task
+
+
+def _get_executor(kind, max_workers):
+    if kind not in _executors:
+        if kind == 'process':
+            _executors[kind] = ProcessPoolExecutor(max_workers=max_workers,
+                                                   mp_context=multiprocessing.get_context('spawn'))
+        else:
+            _executors[kind] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='background')
+    return _executors[kind]
+
+
+def submit(task, *args):
+    """Run task(*args) in the background; returns its Future, or None when it ran inline"""
+    kind = current_app.config.get('IMPORT_EXECUTOR', 'thread')
+    max_workers = current_app.config.get('IMPORT_WORKERS', 1)
+    if kind == 'inline':
+        task(*args)
+        return None
+    if kind == 'process':
+        config = {key: current_app.config[key] for key in _WORKER_CONFIG_KEYS if key in current_app.config}
+        return _get_executor(kind, max_workers).submit(_run_in_process, config, task, *args)
+    app = current_app._get_current_object()
+    return _get_executor(kind, max_workers).submit(_run_in_thread, app, task, *args)
+
+
+def _run(task, args):
+    try:
+        task(*args)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('Background task %s failed', task.__name__)
+    finally:
+        db.session.remove()
+
+
+def _run_in_thread(app, task, *args):
+    with app.app_context():
+        _run(task, args)
+
+
+def _run_in_process(config, task, *args):
+    from app import create_app
+
+    key = json.dumps(config, sort_keys=True, default=str)
+    if key not in _worker_apps:
+        _worker_apps[key] = create_app(config)
+    with _worker_apps[key].app_context():
+        _run(task, args)
@@ -0,0 +1,115 @@
+"""Streaming exports of drills and practice plans (CSV / JSON Lines)
+
+Each exporter is a generator over a query executed with ``yield_per``, so
+rows are fetched and serialized in fixed-size batches and memory stays flat
+whatever the table size. Drill exports use the importer's columns, so an
+exported file can be imported again unchanged.
+"""
+import csv
+import io
+import json
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Drill, PracticePlan, PlanDrill
+from app.utils.drill_import import CSV_COLUMNS
+
+BATCH_SIZE = 500
+
+PLAN_CSV_COLUMNS = ['team_id', 'team_name', 'plan_id', 'plan_name', 'plan_duration_minutes',
+                    'created_at', 'is_completed', 'completed_at', 'plan_notes',
+                    'order', 'drill_id', 'drill_name', 'duration_minutes', 'notes']
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+def _batched(query):
+    """Iterate a query in batches of BATCH_SIZE rows"""
+    return query.yield_per(BATCH_SIZE)
+
+
+def _csv_stream(header, rows):
+    """Serialize rows to CSV, yielding one chunk of text per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _jsonl_stream(objects):
+    """Serialize dicts to JSON Lines, yielding one chunk of text per batch"""
+    lines = []
+    for obj in objects:
+        lines.append(json.dumps(obj, ensure_ascii=False))
+        if len(lines) >= BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _drill_record(drill):
+    return {column: getattr(drill, column) for column in CSV_COLUMNS}
+
+
+def export_drills(query, fmt):
+    """Yield the drills of a (filtered) catalog query as CSV or JSON Lines text"""
+    drills = _batched(query.order_by(Drill.id))
+    if fmt == 'jsonl':
+        return _jsonl_stream(_drill_record(d) for d in drills)
+    return _csv_stream(CSV_COLUMNS, ([getattr(d, c) for c in CSV_COLUMNS] for d in drills))
+
+
+def _plans_query(team_id=None):
+    query = PracticePlan.query.options(
+        joinedload(PracticePlan.team),
+        selectinload(PracticePlan.plan_drills).joinedload(PlanDrill.drill),
+    )
+    if team_id is not None:
+        query = query.filter_by(team_id=team_id)
+    return _batched(query.order_by(PracticePlan.team_id, PracticePlan.id))
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _plan_record(plan):
+    record = plan.to_dict()
+    record['team_name'] = plan.team.name
+    record['drills'] = [{
+        'order': pd.order,
+        'drill_id': pd.drill_id,
+        'drill_name': pd.drill.name,
+        'duration_minutes': pd.duration_minutes,
+        'notes': pd.notes,
+    } for pd in plan.plan_drills]
+    return record
+
+
+def _plan_rows(plans):
+    """One CSV row per plan drill (plans without drills get one row with empty drill columns)"""
+    for plan in plans:
+        plan_columns = [plan.team_id, plan.team.name, plan.id, plan.name, plan.duration_minutes,
+                        _isoformat(plan.created_at), plan.is_completed, _isoformat(plan.completed_at), plan.notes]
+        if not plan.plan_drills:
+            yield plan_columns + [None] * 5
+        for pd in plan.plan_drills:
+            yield plan_columns + [pd.order, pd.drill_id, pd.drill.name, pd.duration_minutes, pd.notes]
+
+
+def export_practice_plans(fmt, team_id=None):
+    """Yield every practice plan (optionally one team's) with its drills as CSV or JSON Lines text"""
+    plans = _plans_query(team_id)
+    if fmt == 'jsonl':
+        return _jsonl_stream(_plan_record(p) for p in plans)
+    return _csv_stream(PLAN_CSV_COLUMNS, _plan_rows(plans))
@@ -0,0 +1,118 @@
+"""Bulk diagram generation across a process pool
+
+Renders the diagrams of many drills at once (scripts/generate_diagrams.py):
+drills are read in one query, drills sharing a spec are rendered once, and
+renders are fanned out over a ProcessPoolExecutor with one worker per core.
+Workers only render and write files (temp file, then rename, so the web
+app never serves a partial file); they never touch the database. Every
+drill's diagram_url is then updated in one executemany and one commit.
+
+- with PNG diagrams, each job also renders the drill's responsive variants
+  (app/utils/diagram_variants.py) from the same spec
+- only_missing skips diagrams already in the cache
+- changed_since limits the run to drills updated since then
+"""
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app import db
+from app.models import Drill
+from app.utils.diagram_cache import cache_dir, cache_path, default_format, diagram_key, diagram_path, render_to_file
+from app.utils.diagram_cache import render_variants_to_files, variant_keys
+from app.utils.diagram_specs import drill_spec_text
+
+# Diagram URLs that bulk generation may overwrite (its own, or the old static files)
+_GENERATED_PREFIXES = ('/drill/', 'diagrams/drill_')
+
+
+class GenerateResult:
+    """Counters for one bulk generation run"""
+
+    def __init__(self):
+        self.drills = 0  # drills considered
+        self.without_spec = 0
+        self.rendered = 0  # distinct diagrams rendered
+        self.cached = 0  # distinct diagrams skipped as already rendered
+        self.urls_updated = 0
+
+
+def _init_png_worker():
+    # Non-interactive backend: workers have no display and share no pyplot state
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render_job(job):
+    spec_text, fmt, path, variant_paths = job
+    spec = json.loads(spec_text)
+    if path is not None:
+        render_to_file(spec, fmt, path)
+    if variant_paths:
+        render_variants_to_files(spec, variant_paths)
+
+
+def _run_jobs(jobs, fmt, workers):
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            _render_job(job)
+        return
+    initializer = _init_png_worker if fmt == 'png' else None
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=initializer,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        for _ in executor.map(_render_job, jobs, chunksize=chunksize):
+            pass
+
+
+def generate_diagrams(fmt=None, only_missing=False, changed_since=None, workers=None):
+    """Render the diagrams of all (or recently changed) drills and record their URLs; returns a GenerateResult"""
+    fmt = fmt or default_format()
+    workers = workers or os.cpu_count() or 1
+    result = GenerateResult()
+    cache_dir()
+
+    query = db.select(Drill.id, Drill.diagram_spec, Drill.diagram_url, Drill.updated_at)
+    if changed_since is not None:
+        query = query.where(Drill.updated_at >= changed_since)
+
+    jobs = {}
+    url_updates = []
+    for drill in db.session.execute(query.order_by(Drill.id)):
+        result.drills += 1
+        key = diagram_key(drill, fmt)
+        if key is None:
+            result.without_spec += 1
+            continue
+
+        if key not in jobs:
+            path = cache_path(key, fmt)
+            variant_paths = {}
+            if fmt == 'png':
+                variant_paths = {(variant, variant_fmt): cache_path(variant_key, variant_fmt)
+                                 for (variant, variant_fmt), variant_key in variant_keys(drill).items()}
+            if only_missing:
+                if os.path.exists(path):
+                    path = None
+                variant_paths = {name: p for name, p in variant_paths.items() if not os.path.exists(p)}
+            if path is None and not variant_paths:
+                result.cached += 1
+                jobs[key] = None
+            else:
+                jobs[key] = (drill_spec_text(drill), fmt, path, variant_paths)
+
+        url = diagram_path(drill.id, key, fmt)
+        if drill.diagram_url != url and (not drill.diagram_url or drill.diagram_url.startswith(_GENERATED_PREFIXES)):
+            # Keep updated_at, so recording the URL does not count as a change
+            url_updates.append({'id': drill.id, 'diagram_url': url, 'updated_at': drill.updated_at})
+
+    pending = [job for job in jobs.values() if job is not None]
+    _run_jobs(pending, fmt, workers)
+    result.rendered = len(pending)
+
+    if url_updates:
+        db.session.execute(db.update(Drill), url_updates)
+        result.urls_updated = len(url_updates)
+    db.session.commit()
+    return result
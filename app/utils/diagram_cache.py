@@ -0,0 +1,217 @@
+"""Content-addressed cache of rendered drill diagrams
+
+A diagram is identified by a hash of everything its rendering depends on
+(diagram_inputs): its spec (app/utils/diagram_specs.py), the output format
+and the renderer's version. Diagrams are rendered as SVG by
+app/utils/diagram_svg.py, or as PNG through matplotlib when DIAGRAM_FORMAT
+is 'png'. Renders are stored as <key>.<format> in DIAGRAM_CACHE_DIR and
+served from /drill/<id>/diagram/<key>.<format>; since the URL changes whenever the inputs
+do, responses are cached by browsers as immutable and a cache hit is a
+file read. Diagrams are rendered on their first request (or warmed ahead
+by scripts/generate_diagrams.py), and only re-rendered when the key changes.
+
+With PNG diagrams, pages use responsive raster variants instead
+(app/utils/diagram_variants.py): each width and format has its own key
+(the variant is one of its inputs) and is served from
+/drill/<id>/diagram/<variant>/<key>.<format>. A miss on any variant renders
+all of them at once, from a single matplotlib render.
+
+Drills without a diagram spec fall back to their diagram_url.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from functools import lru_cache
+
+from flask import current_app, url_for
+
+from app.utils.diagram_specs import drill_spec, drill_spec_text
+from app.utils.diagram_variants import DIAGRAM_VARIANTS, VARIANT_FORMATS, render_variants, variant_version
+
+DIAGRAM_KEY_RE = re.compile(r'[0-9a-f]{32}')
+
+# Formats a diagram can be rendered in, with their mimetypes
+DIAGRAM_FORMATS = {'svg': 'image/svg+xml', 'png': 'image/png'}
+
+# Content-addressed URLs never change meaning, so browsers may keep them for a year
+DIAGRAM_MAX_AGE = 365 * 24 * 60 * 60
+
+# Cache misses are rendered one at a time per process, so concurrent requests
+# for the same diagram render it once (the second finds the file written);
+# diagram_generator locks its shared field figures separately
+_render_lock = threading.Lock()
+
+
+def _renderer(fmt):
+    """(version, render(spec) -> bytes) of a format; matplotlib is only imported for PNG"""
+    if fmt == 'svg':
+        from app.utils.diagram_svg import SVG_VERSION, render_svg
+        return SVG_VERSION, lambda spec: render_svg(spec).encode('utf-8')
+    from app.utils.diagram_versions import DIAGRAM_VERSION
+    return DIAGRAM_VERSION, _render_png
+
+
+def _render_png(spec):
+    from app.utils.diagram_generator import render_diagram_png
+    return render_diagram_png(spec)
+
+
+def default_format():
+    """The format templates link to (DIAGRAM_FORMAT setting)"""
+    return current_app.config.get('DIAGRAM_FORMAT') or 'svg'
+
+
+def uses_variants():
+    """Whether pages link responsive raster variants (PNG diagrams) rather than one SVG"""
+    return default_format() == 'png'
+
+
+def diagram_inputs(drill, fmt, variant=None):
+    """Canonical text of everything a drill's diagram (or one variant) depends on, or None when it has none"""
+    spec_text = drill_spec_text(drill)
+    if spec_text is None:
+        return None
+    if variant is not None:
+        return f'{fmt}:{variant_version()}:{variant}@{DIAGRAM_VARIANTS[variant]}:{spec_text}'
+    version, _ = _renderer(fmt)
+    return f'{fmt}:{version}:{spec_text}'
+
+
+@lru_cache(maxsize=4096)
+def _hash_inputs(inputs):
+    return hashlib.sha256(inputs.encode('utf-8')).hexdigest()[:32]
+
+
+def diagram_key(drill, fmt=None, variant=None):
+    """Content hash of a drill's diagram inputs, or None when it has no diagram"""
+    inputs = diagram_inputs(drill, fmt or default_format(), variant)
+    if inputs is None:
+        return None
+    return _hash_inputs(inputs)
+
+
+def cache_dir():
+    folder = current_app.config.get('DIAGRAM_CACHE_DIR') or os.path.join(current_app.instance_path, 'diagrams')
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def cache_path(key, fmt):
+    """Where the render of a key is stored"""
+    return os.path.join(cache_dir(), f'{key}.{fmt}')
+
+
+def cached_diagram_path(key, fmt):
+    """Path of a cached render, or None when it has not been rendered yet"""
+    path = cache_path(key, fmt)
+    return path if os.path.exists(path) else None
+
+
+def write_atomic(path, data):
+    """Write a file via a temp file and rename, so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_to_file(spec, fmt, path):
+    """Render a decoded spec in a format and write it atomically to path (no app context needed)"""
+    _, render = _renderer(fmt)
+    write_atomic(path, render(spec))
+
+
+def render_variants_to_files(spec, paths):
+    """Render the variants in paths ({(variant, format): path}) of a decoded spec and write them atomically"""
+    names = {variant for variant, _ in paths}
+    formats = {fmt for _, fmt in paths}
+    rendered = render_variants(spec, {name: width for name, width in DIAGRAM_VARIANTS.items() if name in names},
+                               [fmt for fmt in VARIANT_FORMATS if fmt in formats])
+    for variant_fmt, path in paths.items():
+        write_atomic(path, rendered[variant_fmt])
+
+
+def variant_keys(drill):
+    """{(variant, format): key} of all of a drill's raster variants, or None when it has no diagram"""
+    keys = {}
+    for variant in DIAGRAM_VARIANTS:
+        for fmt in VARIANT_FORMATS:
+            key = diagram_key(drill, fmt, variant)
+            if key is None:
+                return None
+            keys[variant, fmt] = key
+    return keys
+
+
+def ensure_diagram(drill, fmt=None, variant=None):
+    """(key, path) of the drill's rendered diagram, rendering it on a cache miss; None without one"""
+    fmt = fmt or default_format()
+    key = diagram_key(drill, fmt, variant)
+    if key is None:
+        return None
+    path = cached_diagram_path(key, fmt)
+    if path is None:
+        with _render_lock:
+            path = cached_diagram_path(key, fmt)
+            if path is None:
+                path = cache_path(key, fmt)
+                if variant is None:
+                    render_to_file(drill_spec(drill), fmt, path)
+                else:
+                    # Render every missing variant now: they all come from the same render
+                    missing = {variant_fmt: cache_path(variant_key, variant_fmt[1])
+                               for variant_fmt, variant_key in variant_keys(drill).items()
+                               if cached_diagram_path(variant_key, variant_fmt[1]) is None}
+                    render_variants_to_files(drill_spec(drill), missing)
+    return key, path
+
+
+def diagram_path(drill_id, key, fmt):
+    """URL path of a rendered diagram, as stored in Drill.diagram_url by bulk generation"""
+    return f'/drill/{drill_id}/diagram/{key}.{fmt}'
+
+
+def diagram_src(drill):
+    """URL of the drill's diagram image for templates, or None"""
+    fmt = default_format()
+    key = diagram_key(drill, fmt)
+    if key is not None:
+        return url_for('main.drill_diagram', drill_id=drill.id, key=key, fmt=fmt)
+    if drill.diagram_url:
+        if drill.diagram_url.startswith(('/', 'http://', 'https://')):
+            return drill.diagram_url
+        return url_for('static', filename=drill.diagram_url)
+    return None
+
+
+def diagram_sources(drill):
+    """Responsive image sources of the drill's diagram for templates, or None when pages use a single image
+
+    Returns {'srcsets': [(mimetype, srcset), ...] in preference order, 'src': fallback URL}.
+    """
+    if not uses_variants():
+        return None
+    keys = variant_keys(drill)
+    if keys is None:
+        return None
+
+    def url(variant, fmt):
+        return url_for('main.drill_diagram_variant', drill_id=drill.id, variant=variant,
+                       key=keys[variant, fmt], fmt=fmt)
+
+    srcsets = [(mimetype, ', '.join(f'{url(variant, fmt)} {width}w'
+                                    for variant, width in DIAGRAM_VARIANTS.items()))
+               for fmt, mimetype in VARIANT_FORMATS.items()]
+    return {'srcsets': srcsets, 'src': url('medium', 'png')}
+
+
+def init_diagram_cache(app):
+    """Make diagram_src and diagram_sources available to templates"""
+    app.jinja_env.globals['diagram_src'] = diagram_src
+    app.jinja_env.globals['diagram_sources'] = diagram_sources
@@ -1,8 +1,19 @@
-"""Generate soccer field diagrams for drills using matplotlib"""
-import matplotlib.pyplot as plt
+"""Render soccer field diagrams for drills using matplotlib
+
+The add_* primitives draw onto a field; render_spec draws a whole
+declarative diagram spec (app/utils/diagram_specs.py) with them, batching
+players, cones, balls and markers into one artist per kind and style.
+render_diagram_png reuses one pre-built field figure per field type
+instead of building the pitch for every diagram. Bump DIAGRAM_VERSION
+(app/utils/diagram_versions.py) when the drawing changes.
+"""
 import matplotlib.patches as patches
+from matplotlib.collections import PatchCollection
+from matplotlib.figure import Figure
 from matplotlib.patches import Circle, Rectangle, Arc, FancyArrowPatch
-import os
+from collections import OrderedDict
+import io
+import threading
 
 def create_field(ax, field_type='half'):
     """
@@ -98,295 +109,148 @@ def add_goal(ax, x, y, width=8, color='white'):
                     edgecolor=color, facecolor='none', zorder=4)
     ax.add_patch(goal)
 
-def generate_passing_square_diagram():
-    """Generate diagram for Passing Square drill"""
-    fig, ax = plt.subplots(figsize=(8, 8), facecolor='#2C3E50')
-    create_field(ax, 'small')
-
-    # Four cones at corners
-    positions = [(5, 5), (25, 5), (25, 25), (5, 25)]
-    for i, (x, y) in enumerate(positions):
-        add_cone(ax, x, y)
-
-    # Players at each corner
-    add_player(ax, 5, 5, label='1')
-    add_player(ax, 25, 5, label='2')
-    add_player(ax, 25, 25, label='3')
-    add_player(ax, 5, 25, label='4')
-
-    # Ball at player 1
-    add_ball(ax, 6, 5)
-
-    # Passing pattern arrows
-    add_arrow(ax, 5, 5, 25, 5, color='#FFD23F', label='Pass')
-    add_arrow(ax, 25, 5, 25, 25, color='#4682B4')
-    add_arrow(ax, 25, 25, 5, 25, color='#FFD23F')
-    add_arrow(ax, 5, 25, 5, 5, color='#4682B4')
-
-    plt.title('Passing Square Drill', fontsize=16, fontweight='bold', color='white', pad=20)
-
-    return fig
-
-def generate_dribbling_race_diagram():
-    """Generate diagram for 1v1 Dribbling Race"""
-    fig, ax = plt.subplots(figsize=(10, 6), facecolor='#2C3E50')
-    create_field(ax, 'small')
-
-    # Create lanes
-    for i in range(5):
-        x = 5 + i * 5
-        # Start line
-        add_cone(ax, x, 5)
-        # Finish line
-        add_cone(ax, x, 25)
-
-        # Lane lines
-        ax.plot([x, x], [5, 25], 'white', linewidth=1, linestyle='--', alpha=0.5)
-
-    # Players at start
-    add_player(ax, 7, 5, label='1')
-    add_player(ax, 12, 5, label='2')
-    add_player(ax, 17, 5, label='3')
-
-    # Balls
-    add_ball(ax, 7, 6)
-    add_ball(ax, 12, 6)
-    add_ball(ax, 17, 6)
-
-    # Dribbling arrows
-    add_arrow(ax, 7, 7, 7, 23, color='#FFD23F')
-    add_arrow(ax, 12, 7, 12, 23, color='#4682B4')
-    add_arrow(ax, 17, 7, 17, 23, color='#FF7F50')
-
-    plt.title('1v1 Dribbling Race', fontsize=16, fontweight='bold', color='white', pad=20)
-
-    return fig
-
-def generate_shooting_diagram():
-    """Generate diagram for Shooting from Distance"""
-    fig, ax = plt.subplots(figsize=(10, 8), facecolor='#2C3E50')
-    create_field(ax, 'half')
-
-    # Goal
-    ax.add_patch(Rectangle((-2, 24), 2, 12, linewidth=3, edgecolor='white', facecolor='none'))
-
-    # Shooting positions
-    positions = [(20, 15), (20, 30), (20, 45), (25, 22), (25, 38)]
-
-    for i, (x, y) in enumerate(positions):
-        add_cone(ax, x, y)
-        add_player(ax, x + 3, y, label=str(i+1))
-        add_ball(ax, x + 2, y)
-        # Shooting arrow to goal
-        add_arrow(ax, x + 3, y, 0, 30, color='#FFD23F')
-
-    plt.title('Shooting from Distance', fontsize=16, fontweight='bold', color='white', pad=20)
-
-    return fig
-
-def generate_possession_diagram():
-    """Generate diagram for 4v4+2 Possession"""
-    fig, ax = plt.subplots(figsize=(8, 8), facecolor='#2C3E50')
-    create_field(ax, 'small')
-
-    # Team 1 (Yellow)
-    team1_positions = [(8, 8), (22, 8), (8, 22), (22, 22)]
-    for i, (x, y) in enumerate(team1_positions):
-        add_player(ax, x, y, color='#FFD23F', label=str(i+1))
-
-    # Team 2 (Blue)
-    team2_positions = [(10, 15), (20, 15), (15, 10), (15, 20)]
-    for i, (x, y) in enumerate(team2_positions):
-        add_player(ax, x, y, color='#4682B4', label=str(i+1))
-
-    # Neutral players (Orange)
-    add_player(ax, 15, 5, color='#FF7F50', label='N1')
-    add_player(ax, 15, 25, color='#FF7F50', label='N2')
-
-    # Ball
-    add_ball(ax, 8, 8)
-
-    # Passing options
-    add_arrow(ax, 8, 8, 22, 22, color='#FFD23F', style='dashed')
-    add_arrow(ax, 8, 8, 15, 5, color='#FF7F50', style='dashed')
-
-    plt.title('4v4+2 Possession', fontsize=16, fontweight='bold', color='white', pad=20)
-
-    return fig
-
-def generate_defending_shape_diagram():
-    """Generate diagram for 3v2 Defending Shape"""
-    fig, ax = plt.subplots(figsize=(10, 8), facecolor='#2C3E50')
-    create_field(ax, 'half')
-
-    # Small goals
-    add_goal(ax, 0, 30)
-
-    # Attackers (Yellow)
-    add_player(ax, 35, 20, color='#FFD23F', label='A1')
-    add_player(ax, 35, 30, color='#FFD23F', label='A2')
-    add_player(ax, 35, 40, color='#FFD23F', label='A3')
-
-    # Defenders (Blue)
-    add_player(ax, 20, 25, color='#4682B4', label='D1')
-    add_player(ax, 15, 35, color='#4682B4', label='D2')
-
-    # Ball with attacker
-    add_ball(ax, 36, 30)
-
-    # Defending arrows showing pressure and cover
-    add_arrow(ax, 20, 25, 35, 30, color='#DC143C', label='Pressure')
-    add_arrow(ax, 15, 35, 20, 30, color='#4682B4', style='dashed', label='Cover')
-
-    plt.title('3v2 Defending Shape', fontsize=16, fontweight='bold', color='white', pad=20)
-
-    return fig
-
-def generate_agility_ladder_diagram():
-    """Generate diagram for Agility Ladder"""
-    fig, ax = plt.subplots(figsize=(10, 6), facecolor='#2C3E50')
-
+def create_plain_field(ax, width, height):
+    """Create a bare grass area without pitch markings"""
     ax.set_aspect('equal')
     ax.axis('off')
-    ax.set_xlim(0, 30)
-    ax.set_ylim(0, 15)
-
-    # Background
-    field = Rectangle((0, 0), 30, 15, facecolor='#2d7a3e', zorder=0)
-    ax.add_patch(field)
-
-    # Agility ladder
-    ladder_start_x = 5
-    ladder_y = 7.5
-    num_rungs = 10
-    rung_spacing = 1.5
-
-    # Ladder sides
-    ax.plot([ladder_start_x, ladder_start_x + num_rungs * rung_spacing],
-           [ladder_y - 1, ladder_y - 1], 'white', linewidth=3)
-    ax.plot([ladder_start_x, ladder_start_x + num_rungs * rung_spacing],
-           [ladder_y + 1, ladder_y + 1], 'white', linewidth=3)
-
-    # Rungs
-    for i in range(num_rungs + 1):
-        x = ladder_start_x + i * rung_spacing
-        ax.plot([x, x], [ladder_y - 1, ladder_y + 1], 'white', linewidth=2)
-
-    # Player at start
-    add_player(ax, ladder_start_x - 2, ladder_y, label='P')
-
-    # Movement arrow
-    add_arrow(ax, ladder_start_x - 1, ladder_y, ladder_start_x + num_rungs * rung_spacing + 1, ladder_y, color='#FFD23F')
-
-    # Footprint indicators (simplified)
-    for i in range(1, num_rungs):
-        x = ladder_start_x + i * rung_spacing + 0.5
-        ax.scatter([x, x], [ladder_y - 0.4, ladder_y + 0.4], s=50, c='#FFD23F', marker='o', alpha=0.7)
-
-    plt.title('Agility Ladder Drills', fontsize=16, fontweight='bold', color='white', pad=20)
-
-    return fig
-
-def generate_world_cup_diagram():
-    """Generate diagram for World Cup Tournament"""
-    fig, ax = plt.subplots(figsize=(10, 8), facecolor='#2C3E50')
-
-    ax.set_aspect('equal')
-    ax.axis('off')
-    ax.set_xlim(0, 50)
-    ax.set_ylim(0, 50)
-
-    # Background
-    field = Rectangle((0, 0), 50, 50, facecolor='#2d7a3e', zorder=0)
-    ax.add_patch(field)
-
-    # Field 1 (top left)
-    ax.add_patch(Rectangle((2, 27), 21, 21, linewidth=2, edgecolor='white', facecolor='none'))
-    add_goal(ax, 2, 37.5, width=6)
-    add_goal(ax, 23, 37.5, width=6)
-    # Teams
-    add_player(ax, 8, 35, color='#FFD23F', label='Y')
-    add_player(ax, 17, 35, color='#4682B4', label='B')
-    add_ball(ax, 12.5, 37.5)
-
-    # Field 2 (top right)
-    ax.add_patch(Rectangle((27, 27), 21, 21, linewidth=2, edgecolor='white', facecolor='none'))
-    add_goal(ax, 27, 37.5, width=6)
-    add_goal(ax, 48, 37.5, width=6)
-    # Teams
-    add_player(ax, 33, 35, color='#FF7F50', label='O')
-    add_player(ax, 42, 35, color='#556B2F', label='G')
-    add_ball(ax, 37.5, 37.5)
-
-    # Field 3 (bottom left)
-    ax.add_patch(Rectangle((2, 2), 21, 21, linewidth=2, edgecolor='white', facecolor='none'))
-    add_goal(ax, 2, 12.5, width=6)
-    add_goal(ax, 23, 12.5, width=6)
-
-    # Field 4 (bottom right)
-    ax.add_patch(Rectangle((27, 2), 21, 21, linewidth=2, edgecolor='white', facecolor='none'))
-    add_goal(ax, 27, 12.5, width=6)
-    add_goal(ax, 48, 12.5, width=6)
-
-    plt.title('World Cup Tournament (4 Fields)', fontsize=16, fontweight='bold', color='white', pad=20)
-
-    return fig
-
-def generate_sharks_minnows_diagram():
-    """Generate diagram for Sharks and Minnows"""
-    fig, ax = plt.subplots(figsize=(8, 8), facecolor='#2C3E50')
-    create_field(ax, 'small')
-
-    # Safe zones
-    ax.add_patch(Rectangle((0, 0), 30, 3, linewidth=2, edgecolor='white', facecolor='#4682B4', alpha=0.3))
-    ax.add_patch(Rectangle((0, 27), 30, 3, linewidth=2, edgecolor='white', facecolor='#4682B4', alpha=0.3))
-
-    # Minnows at start (with balls)
-    minnow_positions = [(5, 2), (10, 2), (15, 2), (20, 2), (25, 2)]
-    for x, y in minnow_positions:
-        add_player(ax, x, y, color='#FFD23F', label='M')
-        add_ball(ax, x, y + 1)
-
-    # Sharks in middle (no balls)
-    add_player(ax, 10, 15, color='#DC143C', label='S', size=1000)
-    add_player(ax, 20, 15, color='#DC143C', label='S', size=1000)
-
-    # Movement arrows
-    add_arrow(ax, 5, 3, 5, 27, color='#FFD23F', style='dashed')
-    add_arrow(ax, 15, 3, 15, 27, color='#FFD23F', style='dashed')
-    add_arrow(ax, 25, 3, 25, 27, color='#FFD23F', style='dashed')
-
-    plt.title('Sharks and Minnows', fontsize=16, fontweight='bold', color='white', pad=20)
-
+    ax.add_patch(Rectangle((0, 0), width, height, facecolor='#2d7a3e', zorder=0))
+    ax.set_xlim(0, width)
+    ax.set_ylim(0, height)
+
+def add_zone(ax, x, y, width, height, fill=None, edge='white', linewidth=2, alpha=1):
+    """Add a rectangular area (grid, safe zone, goal mouth)"""
+    ax.add_patch(Rectangle((x, y), width, height, linewidth=linewidth, edgecolor=edge or 'none',
+                           facecolor=fill or 'none', alpha=alpha))
+
+def add_line(ax, x1, y1, x2, y2, color='white', width=2, style='solid', alpha=1):
+    """Add a straight line (lane, ladder, boundary)"""
+    ax.plot([x1, x2], [y1, y2], color=color, linewidth=width, linestyle=style, alpha=alpha)
+
+def add_marker(ax, x, y, color='#FFD23F', size=50, alpha=1):
+    """Add a small marker (footprint, spot)"""
+    ax.scatter([x], [y], s=size, c=color, marker='o', alpha=alpha)
+
+# ============================================================================
+# SPEC RENDERING
+# ============================================================================
+
+# Figure size (inches) of each field type when the spec gives none
+DEFAULT_FIGSIZES = {'full': (12, 8), 'half': (10, 8), 'small': (8, 8), 'plain': (10, 8)}
+
+def _point(element):
+    """Element as a dict: [x, y] pairs are shorthand for {'x': x, 'y': y}"""
+    if isinstance(element, list):
+        return {'x': element[0], 'y': element[1]}
+    return element
+
+def add_players(ax, players):
+    """Add many players at once: one scatter per color and size instead of one per player"""
+    groups = {}
+    for player in players:
+        groups.setdefault((player.get('color', '#FFD23F'), player.get('size', 800)), []).append(player)
+    for (color, size), group in groups.items():
+        ax.scatter([p['x'] for p in group], [p['y'] for p in group], s=size, c=color,
+                   edgecolors='white', linewidths=2, zorder=5)
+    for player in players:
+        if player.get('label'):
+            ax.text(player['x'], player['y'], player['label'], ha='center', va='center', fontsize=10,
+                    fontweight='bold', color='black', zorder=6)
+
+def add_cones(ax, cones):
+    """Add many cones as one patch collection"""
+    colors = [cone.get('color', '#FF7F50') for cone in cones]
+    ax.add_collection(PatchCollection([Circle((cone['x'], cone['y']), 0.5) for cone in cones],
+                                      facecolors=colors, edgecolors=colors, linewidths=1, zorder=4),
+                      autolim=False)
+
+def add_balls(ax, balls):
+    """Add many balls as one patch collection (add_ball's seam lines sit below the ball and never show)"""
+    ax.add_collection(PatchCollection([Circle((ball['x'], ball['y']), 0.8) for ball in balls],
+                                      facecolors='white', edgecolors='white', linewidths=2, zorder=5),
+                      autolim=False)
+
+def add_markers(ax, markers):
+    """Add many markers at once: one scatter per color, size and alpha"""
+    groups = {}
+    for marker in markers:
+        key = (marker.get('color', '#FFD23F'), marker.get('size', 50), marker.get('alpha', 1))
+        groups.setdefault(key, []).append(marker)
+    for (color, size, alpha), group in groups.items():
+        ax.scatter([m['x'] for m in group], [m['y'] for m in group], s=size, c=color, marker='o', alpha=alpha)
+
+def _draw_field(ax, spec):
+    if spec.get('field', 'small') == 'plain':
+        create_plain_field(ax, *spec.get('size', (30, 30)))
+    else:
+        create_field(ax, spec.get('field', 'small'))
+
+def _draw_elements(ax, spec):
+    """Draw everything but the field; markers of one kind are batched into a single artist"""
+    for zone in spec.get('zones', []):
+        add_zone(ax, **zone)
+    for line in spec.get('lines', []):
+        add_line(ax, *line['from'], *line['to'], **{k: v for k, v in line.items() if k not in ('from', 'to')})
+    for goal in spec.get('goals', []):
+        add_goal(ax, **goal)
+    if spec.get('cones'):
+        add_cones(ax, [_point(cone) for cone in spec['cones']])
+    if spec.get('players'):
+        add_players(ax, [_point(player) for player in spec['players']])
+    if spec.get('balls'):
+        add_balls(ax, [_point(ball) for ball in spec['balls']])
+    for arrow in spec.get('arrows', []):
+        add_arrow(ax, *arrow['from'], *arrow['to'], **{k: v for k, v in arrow.items() if k not in ('from', 'to')})
+    if spec.get('markers'):
+        add_markers(ax, [_point(marker) for marker in spec['markers']])
+
+    if spec.get('title'):
+        ax.set_title(spec['title'], fontsize=16, fontweight='bold', color='white', pad=20)
+
+def _figsize(spec):
+    return tuple(spec.get('figsize') or DEFAULT_FIGSIZES[spec.get('field', 'small')])
+
+def render_spec(spec):
+    """Draw a diagram spec (see app/utils/diagram_specs.py) on a new figure and return it"""
+    fig = Figure(figsize=_figsize(spec), facecolor='#2C3E50')
+    ax = fig.subplots()
+    _draw_field(ax, spec)
+    _draw_elements(ax, spec)
     return fig
 
-def save_drill_diagram(drill_name, drill_id):
-    """Generate and save diagram for a specific drill"""
-    # Create diagrams directory if it doesn't exist
-    static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'diagrams')
-    os.makedirs(static_dir, exist_ok=True)
-
-    # Generate appropriate diagram based on drill name
-    drill_generators = {
-        'Passing Square': generate_passing_square_diagram,
-        '1v1 Dribbling Race': generate_dribbling_race_diagram,
-        'Shooting from Distance': generate_shooting_diagram,
-        '4v4+2 Possession': generate_possession_diagram,
-        '3v2 Defending Shape': generate_defending_shape_diagram,
-        'Agility Ladder Drills': generate_agility_ladder_diagram,
-        'World Cup Tournament': generate_world_cup_diagram,
-        'Sharks and Minnows': generate_sharks_minnows_diagram,
-    }
-
-    if drill_name in drill_generators:
-        fig = drill_generators[drill_name]()
-
-        # Save figure
-        filename = f'drill_{drill_id}.png'
-        filepath = os.path.join(static_dir, filename)
-        fig.savefig(filepath, dpi=150, bbox_inches='tight', facecolor='#2C3E50')
-        plt.close(fig)
-
-        return f'diagrams/{filename}'
-
-    return None
+# Pre-built field figures, keyed by field type, plain field size and figsize.
+# Each holds the axes with only the field drawn plus the set of artists that
+# make up that background; a render draws the drill on top, saves, and then
+# removes everything that is not background, so the figure, axes and field
+# markings are built once per process instead of once per diagram.
+_FIELD_FIGURES = OrderedDict()
+_FIELD_FIGURES_MAX = 8
+_field_lock = threading.Lock()
+
+def _field_figure(spec):
+    field = spec.get('field', 'small')
+    key = (field, tuple(spec.get('size', (30, 30))) if field == 'plain' else None, _figsize(spec))
+    entry = _FIELD_FIGURES.pop(key, None)
+    if entry is None:
+        fig = Figure(figsize=key[2], facecolor='#2C3E50')
+        ax = fig.subplots()
+        _draw_field(ax, spec)
+        entry = (fig, ax, frozenset(ax.get_children()))
+    _FIELD_FIGURES[key] = entry
+    while len(_FIELD_FIGURES) > _FIELD_FIGURES_MAX:
+        _FIELD_FIGURES.popitem(last=False)
+    return entry
+
+def render_diagram_png(spec, dpi=150):
+    """Render a diagram spec to PNG bytes, on the cached background of its field"""
+    buffer = io.BytesIO()
+    with _field_lock:
+        fig, ax, background = _field_figure(spec)
+        try:
+            _draw_elements(ax, spec)
+            fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight', facecolor='#2C3E50')
+        finally:
+            for artist in ax.get_children():
+                if artist not in background:
+                    artist.remove()
+            ax.set_title('')
+    return buffer.getvalue()
@@ -0,0 +1,328 @@
+"""Declarative JSON diagram specs
+
+A drill's diagram is described by a JSON object stored in
+Drill.diagram_spec (and accepted as the diagram_spec import column), which
+app/utils/diagram_generator.py renders. Coordinates are in field units; the
+field types are 'full' (100 x 60), 'half' (50 x 60), 'small' (30 x 30)
+and 'plain' (a bare grass area of ``size`` [width, height]).
+
+    {
+      "field": "small",
+      "title": "Passing Square Drill",
+      "figsize": [8, 8],
+      "zones":   [{"x": 0, "y": 0, "width": 30, "height": 3, "fill": "#4682B4", "alpha": 0.3}],
+      "lines":   [{"from": [5, 5], "to": [5, 25], "style": "dashed"}],
+      "goals":   [{"x": 0, "y": 30, "width": 8}],
+      "cones":   [[5, 5], [25, 5]],
+      "players": [{"x": 5, "y": 5, "label": "1", "color": "#FFD23F"}],
+      "balls":   [[6, 5]],
+      "arrows":  [{"from": [5, 5], "to": [25, 5], "label": "Pass"}],
+      "markers": [{"x": 6, "y": 7, "size": 50}]
+    }
+
+Cones, players, balls and markers may be given as [x, y] pairs when they
+use the default style. Colors are #rgb / #rrggbb or CSS color names;
+sizes, widths and line widths are non-negative and alpha is 0-1, so a spec
+that validates renders in both the SVG and the matplotlib renderer.
+The diagrams of the drills shipped with the app (LIBRARY_SPECS) are stored
+on those drills by migration 8 and the seed scripts.
+"""
+import json
+import math
+import re
+
+FIELD_TYPES = ('full', 'half', 'small', 'plain')
+LINE_STYLES = ('solid', 'dashed', 'dotted')
+
+MAX_ELEMENTS = 200  # per element list
+MAX_FIELD_SIZE = 200
+MAX_FIGSIZE = 20
+
+# Allowed keys of each element list, besides the required position keys
+_ELEMENT_KEYS = {
+    'zones': ({'x', 'y', 'width', 'height'}, {'fill', 'edge', 'linewidth', 'alpha'}),
+    'lines': ({'from', 'to'}, {'color', 'width', 'style', 'alpha'}),
+    'goals': ({'x', 'y'}, {'width', 'color'}),
+    'cones': ({'x', 'y'}, {'color'}),
+    'players': ({'x', 'y'}, {'color', 'label', 'size'}),
+    'balls': ({'x', 'y'}, set()),
+    'arrows': ({'from', 'to'}, {'color', 'style', 'label'}),
+    'markers': ({'x', 'y'}, {'color', 'size', 'alpha'}),
+}
+_POINT_LISTS = ('cones', 'players', 'balls', 'markers')
+_NUMBER_KEYS = {'x', 'y', 'width', 'height', 'linewidth', 'alpha', 'size'}
+_NON_NEGATIVE_KEYS = {'size', 'width', 'linewidth'}
+_COLOR_KEYS = {'fill', 'edge', 'color'}
+
+# Colors both renderers understand: #rgb / #rrggbb, or a CSS color name (any case)
+_HEX_COLOR_RE = re.compile(r'#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})')
+COLOR_NAMES = frozenset('''
+    none
+    aliceblue antiquewhite aqua aquamarine azure beige bisque black blanchedalmond blue
+    blueviolet brown burlywood cadetblue chartreuse chocolate coral cornflowerblue cornsilk
+    crimson cyan darkblue darkcyan darkgoldenrod darkgray darkgreen darkgrey darkkhaki
+    darkmagenta darkolivegreen darkorange darkorchid darkred darksalmon darkseagreen
+    darkslateblue darkslategray darkslategrey darkturquoise darkviolet deeppink deepskyblue
+    dimgray dimgrey dodgerblue firebrick floralwhite forestgreen fuchsia gainsboro ghostwhite
+    gold goldenrod gray green greenyellow grey honeydew hotpink indianred indigo ivory khaki
+    lavender lavenderblush lawngreen lemonchiffon lightblue lightcoral lightcyan
+    lightgoldenrodyellow lightgray lightgreen lightgrey lightpink lightsalmon lightseagreen
+    lightskyblue lightslategray lightslategrey lightsteelblue lightyellow lime limegreen linen
+    magenta maroon mediumaquamarine mediumblue mediumorchid mediumpurple mediumseagreen
+    mediumslateblue mediumspringgreen mediumturquoise mediumvioletred midnightblue mintcream
+    mistyrose moccasin navajowhite navy oldlace olive olivedrab orange orangered orchid
+    palegoldenrod palegreen paleturquoise palevioletred papayawhip peachpuff peru pink plum
+    powderblue purple rebeccapurple red rosybrown royalblue saddlebrown salmon sandybrown
+    seagreen seashell sienna silver skyblue slateblue slategray slategrey snow springgreen
+    steelblue tan teal thistle tomato turquoise violet wheat white whitesmoke yellow yellowgreen
+'''.split())
+_TOP_LEVEL_KEYS = {'field', 'size', 'figsize', 'title'} | set(_ELEMENT_KEYS)
+
+
+def _check_number(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f'{where} must be a number')
+
+
+def is_color(value):
+    """Whether a string is a color the diagram renderers accept"""
+    return isinstance(value, str) and (_HEX_COLOR_RE.fullmatch(value) is not None or value.lower() in COLOR_NAMES)
+
+
+def _check_pair(value, where, limit=None):
+    if not isinstance(value, list) or len(value) != 2:
+        raise ValueError(f'{where} must be an [x, y] pair')
+    for number in value:
+        _check_number(number, where)
+        if limit is not None and not 0 < number <= limit:
+            raise ValueError(f'{where} values must be between 0 and {limit}')
+
+
+def _check_element(kind, element, where):
+    required, optional = _ELEMENT_KEYS[kind]
+    if kind in _POINT_LISTS and isinstance(element, list):
+        _check_pair(element, where)
+        return
+    if not isinstance(element, dict):
+        raise ValueError(f'{where} must be an object')
+    missing = required - element.keys()
+    if missing:
+        raise ValueError(f"{where} is missing {', '.join(sorted(missing))}")
+    unknown = element.keys() - required - optional
+    if unknown:
+        raise ValueError(f"{where} has unknown keys: {', '.join(sorted(unknown))}")
+    for key, value in element.items():
+        if key in ('from', 'to'):
+            _check_pair(value, f'{where}.{key}')
+        elif key in _NUMBER_KEYS:
+            _check_number(value, f'{where}.{key}')
+            if key in _NON_NEGATIVE_KEYS and value < 0:
+                raise ValueError(f'{where}.{key} must not be negative')
+            if key == 'alpha' and not 0 <= value <= 1:
+                raise ValueError(f'{where}.alpha must be between 0 and 1')
+        elif key in _COLOR_KEYS:
+            if value is not None and not is_color(value):
+                raise ValueError(f'{where}.{key} must be a color (#rrggbb or a CSS color name)')
+        elif key == 'style':
+            if value not in LINE_STYLES:
+                raise ValueError(f"{where}.style must be one of {', '.join(LINE_STYLES)}")
+        elif key == 'label':
+            if not isinstance(value, str):
+                raise ValueError(f'{where}.label must be a string')
+
+
+def validate_spec(spec):
+    """Raise ValueError when a decoded spec is not a valid diagram spec"""
+    if not isinstance(spec, dict):
+        raise ValueError('diagram spec must be a JSON object')
+    unknown = spec.keys() - _TOP_LEVEL_KEYS
+    if unknown:
+        raise ValueError(f"diagram spec has unknown keys: {', '.join(sorted(unknown))}")
+    if spec.get('field', 'small') not in FIELD_TYPES:
+        raise ValueError(f"diagram field must be one of {', '.join(FIELD_TYPES)}")
+    if 'size' in spec:
+        _check_pair(spec['size'], 'diagram size', MAX_FIELD_SIZE)
+    if 'figsize' in spec:
+        _check_pair(spec['figsize'], 'diagram figsize', MAX_FIGSIZE)
+    if not isinstance(spec.get('title', ''), str):
+        raise ValueError('diagram title must be a string')
+
+    for kind in _ELEMENT_KEYS:
+        elements = spec.get(kind, [])
+        if not isinstance(elements, list):
+            raise ValueError(f'diagram {kind} must be a list')
+        if len(elements) > MAX_ELEMENTS:
+            raise ValueError(f'diagram {kind} may have at most {MAX_ELEMENTS} entries')
+        for i, element in enumerate(elements):
+            _check_element(kind, element, f'{kind}[{i}]')
+
+
+def parse_spec(value):
+    """Decode and validate a spec given as JSON text or an already decoded object
+
+    Returns the canonical JSON text stored in Drill.diagram_spec, or None for
+    an empty value; raises ValueError for invalid specs.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError as e:
+            raise ValueError(f'not valid JSON ({e})')
+    validate_spec(value)
+    return dump_spec(value)
+
+
+def dump_spec(spec):
+    """Canonical JSON text of a spec (stable key order, so equal specs hash equally)"""
+    return json.dumps(spec, sort_keys=True, separators=(',', ':'))
+
+
+def drill_spec_text(drill):
+    """Canonical JSON text of a drill's diagram spec, or None when it has none"""
+    return drill.diagram_spec or None
+
+
+def drill_spec(drill):
+    """The decoded spec of a drill's diagram, or None when it has none"""
+    text = drill_spec_text(drill)
+    return json.loads(text) if text else None
+
+
+# ============================================================================
+# BUILT-IN DIAGRAMS
+# ============================================================================
+
+def _dribbling_race_spec():
+    lanes = [5 + i * 5 for i in range(5)]
+    return {
+        'field': 'small',
+        'figsize': [10, 6],
+        'title': '1v1 Dribbling Race',
+        'lines': [{'from': [x, 5], 'to': [x, 25], 'width': 1, 'style': 'dashed', 'alpha': 0.5} for x in lanes],
+        'cones': [[x, y] for x in lanes for y in (5, 25)],
+        'players': [{'x': 7, 'y': 5, 'label': '1'}, {'x': 12, 'y': 5, 'label': '2'},
+                    {'x': 17, 'y': 5, 'label': '3'}],
+        'balls': [[7, 6], [12, 6], [17, 6]],
+        'arrows': [{'from': [7, 7], 'to': [7, 23], 'color': '#FFD23F'},
+                   {'from': [12, 7], 'to': [12, 23], 'color': '#4682B4'},
+                   {'from': [17, 7], 'to': [17, 23], 'color': '#FF7F50'}],
+    }
+
+
+def _shooting_spec():
+    positions = [(20, 15), (20, 30), (20, 45), (25, 22), (25, 38)]
+    return {
+        'field': 'half',
+        'figsize': [10, 8],
+        'title': 'Shooting from Distance',
+        'zones': [{'x': -2, 'y': 24, 'width': 2, 'height': 12, 'edge': 'white', 'linewidth': 3}],
+        'cones': [[x, y] for x, y in positions],
+        'players': [{'x': x + 3, 'y': y, 'label': str(i + 1)} for i, (x, y) in enumerate(positions)],
+        'balls': [[x + 2, y] for x, y in positions],
+        'arrows': [{'from': [x + 3, y], 'to': [0, 30], 'color': '#FFD23F'} for x, y in positions],
+    }
+
+
+def _agility_ladder_spec():
+    start, y, rungs, spacing = 5, 7.5, 10, 1.5
+    end = start + rungs * spacing
+    return {
+        'field': 'plain',
+        'size': [30, 15],
+        'figsize': [10, 6],
+        'title': 'Agility Ladder Drills',
+        'lines': ([{'from': [start, y - 1], 'to': [end, y - 1], 'width': 3},
+                   {'from': [start, y + 1], 'to': [end, y + 1], 'width': 3}] +
+                  [{'from': [start + i * spacing, y - 1], 'to': [start + i * spacing, y + 1]}
+                   for i in range(rungs + 1)]),
+        'players': [{'x': start - 2, 'y': y, 'label': 'P'}],
+        'arrows': [{'from': [start - 1, y], 'to': [end + 1, y], 'color': '#FFD23F'}],
+        'markers': [{'x': start + i * spacing + 0.5, 'y': y + offset, 'alpha': 0.7}
+                    for i in range(1, rungs) for offset in (-0.4, 0.4)],
+    }
+
+
+def _world_cup_spec():
+    fields = [(2, 27), (27, 27), (2, 2), (27, 2)]
+    return {
+        'field': 'plain',
+        'size': [50, 50],
+        'figsize': [10, 8],
+        'title': 'World Cup Tournament (4 Fields)',
+        'zones': [{'x': x, 'y': y, 'width': 21, 'height': 21, 'edge': 'white'} for x, y in fields],
+        'goals': [{'x': gx, 'y': y + 10.5, 'width': 6} for x, y in fields for gx in (x, x + 21)],
+        'players': [{'x': 8, 'y': 35, 'color': '#FFD23F', 'label': 'Y'},
+                    {'x': 17, 'y': 35, 'color': '#4682B4', 'label': 'B'},
+                    {'x': 33, 'y': 35, 'color': '#FF7F50', 'label': 'O'},
+                    {'x': 42, 'y': 35, 'color': '#556B2F', 'label': 'G'}],
+        'balls': [[12.5, 37.5], [37.5, 37.5]],
+    }
+
+
+def _sharks_minnows_spec():
+    minnows = [5, 10, 15, 20, 25]
+    return {
+        'field': 'small',
+        'figsize': [8, 8],
+        'title': 'Sharks and Minnows',
+        'zones': [{'x': 0, 'y': 0, 'width': 30, 'height': 3, 'fill': '#4682B4', 'edge': 'white', 'alpha': 0.3},
+                  {'x': 0, 'y': 27, 'width': 30, 'height': 3, 'fill': '#4682B4', 'edge': 'white', 'alpha': 0.3}],
+        'players': ([{'x': x, 'y': 2, 'color': '#FFD23F', 'label': 'M'} for x in minnows] +
+                    [{'x': 10, 'y': 15, 'color': '#DC143C', 'label': 'S', 'size': 1000},
+                     {'x': 20, 'y': 15, 'color': '#DC143C', 'label': 'S', 'size': 1000}]),
+        'balls': [[x, 3] for x in minnows],
+        'arrows': [{'from': [x, 3], 'to': [x, 27], 'color': '#FFD23F', 'style': 'dashed'} for x in (5, 15, 25)],
+    }
+
+
+# Diagrams of the drills shipped with the app, by drill name (for seeding)
+LIBRARY_SPECS = {
+    'Passing Square': {
+        'field': 'small',
+        'figsize': [8, 8],
+        'title': 'Passing Square Drill',
+        'cones': [[5, 5], [25, 5], [25, 25], [5, 25]],
+        'players': [{'x': 5, 'y': 5, 'label': '1'}, {'x': 25, 'y': 5, 'label': '2'},
+                    {'x': 25, 'y': 25, 'label': '3'}, {'x': 5, 'y': 25, 'label': '4'}],
+        'balls': [[6, 5]],
+        'arrows': [{'from': [5, 5], 'to': [25, 5], 'color': '#FFD23F', 'label': 'Pass'},
+                   {'from': [25, 5], 'to': [25, 25], 'color': '#4682B4'},
+                   {'from': [25, 25], 'to': [5, 25], 'color': '#FFD23F'},
+                   {'from': [5, 25], 'to': [5, 5], 'color': '#4682B4'}],
+    },
+    '1v1 Dribbling Race': _dribbling_race_spec(),
+    'Shooting from Distance': _shooting_spec(),
+    '4v4+2 Possession': {
+        'field': 'small',
+        'figsize': [8, 8],
+        'title': '4v4+2 Possession',
+        'players': ([{'x': x, 'y': y, 'color': '#FFD23F', 'label': str(i + 1)}
+                     for i, (x, y) in enumerate([(8, 8), (22, 8), (8, 22), (22, 22)])] +
+                    [{'x': x, 'y': y, 'color': '#4682B4', 'label': str(i + 1)}
+                     for i, (x, y) in enumerate([(10, 15), (20, 15), (15, 10), (15, 20)])] +
+                    [{'x': 15, 'y': 5, 'color': '#FF7F50', 'label': 'N1'},
+                     {'x': 15, 'y': 25, 'color': '#FF7F50', 'label': 'N2'}]),
+        'balls': [[8, 8]],
+        'arrows': [{'from': [8, 8], 'to': [22, 22], 'color': '#FFD23F', 'style': 'dashed'},
+                   {'from': [8, 8], 'to': [15, 5], 'color': '#FF7F50', 'style': 'dashed'}],
+    },
+    '3v2 Defending Shape': {
+        'field': 'half',
+        'figsize': [10, 8],
+        'title': '3v2 Defending Shape',
+        'goals': [{'x': 0, 'y': 30}],
+        'players': [{'x': 35, 'y': 20, 'color': '#FFD23F', 'label': 'A1'},
+                    {'x': 35, 'y': 30, 'color': '#FFD23F', 'label': 'A2'},
+                    {'x': 35, 'y': 40, 'color': '#FFD23F', 'label': 'A3'},
+                    {'x': 20, 'y': 25, 'color': '#4682B4', 'label': 'D1'},
+                    {'x': 15, 'y': 35, 'color': '#4682B4', 'label': 'D2'}],
+        'balls': [[36, 30]],
+        'arrows': [{'from': [20, 25], 'to': [35, 30], 'color': '#DC143C', 'label': 'Pressure'},
+                   {'from': [15, 35], 'to': [20, 30], 'color': '#4682B4', 'style': 'dashed', 'label': 'Cover'}],
+    },
+    'Agility Ladder Drills': _agility_ladder_spec(),
+    'World Cup Tournament': _world_cup_spec(),
+    'Sharks and Minnows': _sharks_minnows_spec(),
+}
@@ -0,0 +1,211 @@
+"""Render diagram specs straight to SVG, without matplotlib
+
+Draws the same primitives as app/utils/diagram_generator.py (field, players,
+cones, balls, arrows, goals, zones, lines, markers) as SVG elements, sized
+and layered the way the matplotlib renderer lays them out: the field is
+drawn in field units (y flipped), and sizes matplotlib gives in points
+(line widths, marker sizes, fonts) are converted with the same points per
+field unit a figure of the spec's figsize would use. Building the SVG is a
+string join, so a diagram costs well under a millisecond and a few KB;
+the field markings are built once per field type and scale and reused.
+"""
+import math
+from functools import lru_cache
+from xml.sax.saxutils import escape, quoteattr
+
+# Bump when the SVG output changes, so cached renders are replaced
+SVG_VERSION = 2
+
+BACKGROUND = '#2C3E50'
+GRASS = '#2d7a3e'
+FONT = 'DejaVu Sans, Arial, Helvetica, sans-serif'
+
+# Matplotlib's defaults that the layout below reproduces
+DEFAULT_FIGSIZES = {'full': (12, 8), 'half': (10, 8), 'small': (8, 8), 'plain': (10, 8)}
+_AXES_WIDTH, _AXES_HEIGHT = 0.775, 0.77  # subplot fraction of the figure
+_PNG_DPI = 150  # output is sized like the matplotlib PNG
+_TITLE_SIZE, _TITLE_PAD = 16, 20  # points
+_MARGIN = 7.2  # points (savefig's pad_inches=0.1)
+_DASHES = {'solid': None, 'dashed': (3.7, 1.6), 'dotted': (1, 1.65)}  # x line width
+
+# Axis limits per field type, as create_field sets them
+_FIELD_LIMITS = {'full': (-5, 105, -5, 65), 'half': (-5, 55, -5, 65), 'small': (-2, 32, -2, 32)}
+
+
+class _Canvas:
+    """SVG elements in field units, with matplotlib-style draw order"""
+
+    def __init__(self, ppu):
+        self.ppu = ppu  # points per field unit
+        self.items = []
+
+    def pt(self, points):
+        """A length in points, in field units"""
+        return points / self.ppu
+
+    def add(self, zorder, element):
+        self.items.append((zorder, len(self.items), element))
+
+    def stroke(self, color, width_pt, style='solid', alpha=1):
+        attrs = f'stroke={quoteattr(color)} stroke-width="{self.pt(width_pt):.3g}"'
+        dashes = _DASHES.get(style)
+        if dashes:
+            attrs += ' stroke-dasharray="{}"'.format(','.join(f'{self.pt(d * width_pt):.3g}' for d in dashes))
+        if alpha != 1:
+            attrs += f' stroke-opacity="{alpha:g}"'
+        return attrs
+
+    def rect(self, x, y, width, height, fill='none', edge=None, linewidth=2, alpha=1, zorder=1):
+        if width < 0:
+            x, width = x + width, -width
+        if height < 0:
+            y, height = y + height, -height
+        attrs = f'fill={quoteattr(fill)}'
+        if fill != 'none' and alpha != 1:
+            attrs += f' fill-opacity="{alpha:g}"'
+        if edge:
+            attrs += ' ' + self.stroke(edge, linewidth, alpha=alpha)
+        self.add(zorder, f'<rect x="{x:g}" y="{-(y + height):g}" width="{width:g}" height="{height:g}" {attrs}/>')
+
+    def circle(self, x, y, r, fill='none', edge=None, linewidth=1, alpha=1, zorder=1):
+        attrs = f'fill={quoteattr(fill)}'
+        if alpha != 1:
+            attrs += f' fill-opacity="{alpha:g}"'
+        if edge:
+            attrs += ' ' + self.stroke(edge, linewidth)
+        self.add(zorder, f'<circle cx="{x:g}" cy="{-y:g}" r="{r:.3g}" {attrs}/>')
+
+    def line(self, points, color='white', linewidth=2, style='solid', alpha=1, zorder=2):
+        path = ' '.join(f'{x:.3g},{-y:.3g}' for x, y in points)
+        self.add(zorder, f'<polyline points="{path}" fill="none" {self.stroke(color, linewidth, style, alpha)}/>')
+
+    def text(self, x, y, label, size_pt, color='black', bold=False, baseline='central', zorder=6):
+        weight = ' font-weight="bold"' if bold else ''
+        self.add(zorder, f'<text x="{x:g}" y="{-y:g}" font-size="{self.pt(size_pt):.3g}"{weight} fill={quoteattr(color)} '
+                         f'text-anchor="middle" dominant-baseline="{baseline}">{escape(label)}</text>')
+
+    def render(self):
+        return ''.join(element for _, _, element in sorted(self.items))
+
+
+def _draw_field(canvas, field, size):
+    """Field background and markings, as create_field / create_plain_field draw them"""
+    if field == 'plain':
+        canvas.rect(0, 0, *size, fill=GRASS, zorder=0)
+        return
+    width = {'full': 100, 'half': 50, 'small': 30}[field]
+    height = 30 if field == 'small' else 60
+    canvas.rect(0, 0, width, height, fill=GRASS, edge='white', zorder=0)
+    if field == 'full':
+        canvas.line([(50, 0), (50, 60)])
+        canvas.circle(50, 30, 9.15, edge='white', linewidth=2)
+        canvas.rect(0, 24, -2, 12, edge='white')
+        canvas.rect(100, 24, 2, 12, edge='white')
+        canvas.rect(0, 18, 16.5, 24, edge='white')
+        canvas.rect(100, 18, -16.5, 24, edge='white')
+    elif field == 'half':
+        canvas.rect(0, 24, -2, 12, edge='white')
+        canvas.rect(0, 18, 16.5, 24, edge='white')
+        canvas.line([(50, 0), (50, 60)], style='dashed')
+
+
+@lru_cache(maxsize=32)
+def _field_items(field, size, ppu):
+    """The field's canvas items, built once per field type, size and scale"""
+    canvas = _Canvas(ppu)
+    _draw_field(canvas, field, size)
+    return tuple(canvas.items)
+
+
+def _point(element):
+    if isinstance(element, list):
+        return {'x': element[0], 'y': element[1]}
+    return element
+
+
+def _draw_arrow(canvas, start, end, color='#FFD23F', style='solid', label=''):
+    """A '->' arrow as FancyArrowPatch draws it: shrunk 2 pt at both ends, open head"""
+    (x1, y1), (x2, y2) = start, end
+    length = math.hypot(x2 - x1, y2 - y1)
+    if length > 0:
+        ux, uy = (x2 - x1) / length, (y2 - y1) / length
+        shrink = min(canvas.pt(2), length / 2)
+        x1, y1, x2, y2 = x1 + ux * shrink, y1 + uy * shrink, x2 - ux * shrink, y2 - uy * shrink
+        head_length, head_width = canvas.pt(10), canvas.pt(5)  # 0.4 and 0.2 of mutation_scale=25
+        bx, by = x2 - ux * head_length, y2 - uy * head_length
+        canvas.line([(x1, y1), (x2, y2)], color, 3, style, zorder=3)
+        canvas.line([(bx - uy * head_width, by + ux * head_width), (x2, y2),
+                     (bx + uy * head_width, by - ux * head_width)], color, 3, style, zorder=3)
+    if label:
+        mid_x, mid_y = (start[0] + end[0]) / 2, (start[1] + end[1]) / 2 + 1
+        pad = canvas.pt(0.3 * 9)
+        width, height = canvas.pt(0.6 * 9 * len(label)) + 2 * pad, canvas.pt(9) + 2 * pad
+        radius = pad
+        canvas.add(3, f'<rect x="{mid_x - width / 2:.3g}" y="{-mid_y - canvas.pt(7) - pad:.3g}" '
+                      f'width="{width:.3g}" height="{height:.3g}" rx="{radius:.3g}" fill="white" '
+                      f'fill-opacity="0.8" stroke="black" stroke-opacity="0.8" stroke-width="{canvas.pt(1):.3g}"/>')
+        canvas.text(mid_x, mid_y, label, 9, baseline='alphabetic', zorder=3)
+
+
+def render_svg(spec):
+    """SVG document (text) of a diagram spec (see app/utils/diagram_specs.py)"""
+    field = spec.get('field', 'small')
+    if field == 'plain':
+        size = tuple(spec.get('size', (30, 30)))
+        xmin, xmax, ymin, ymax = 0, size[0], 0, size[1]
+    else:
+        size = None
+        xmin, xmax, ymin, ymax = _FIELD_LIMITS[field]
+    fig_width, fig_height = spec.get('figsize') or DEFAULT_FIGSIZES[field]
+    ppu = min(fig_width * 72 * _AXES_WIDTH / (xmax - xmin), fig_height * 72 * _AXES_HEIGHT / (ymax - ymin))
+    canvas = _Canvas(ppu)
+
+    canvas.items.extend(_field_items(field, size, ppu))
+    for zone in spec.get('zones', []):
+        canvas.rect(zone['x'], zone['y'], zone['width'], zone['height'], fill=zone.get('fill') or 'none',
+                    edge=zone.get('edge', 'white'), linewidth=zone.get('linewidth', 2), alpha=zone.get('alpha', 1))
+    for line in spec.get('lines', []):
+        canvas.line([line['from'], line['to']], line.get('color', 'white'), line.get('width', 2),
+                    line.get('style', 'solid'), line.get('alpha', 1))
+    for goal in spec.get('goals', []):
+        width = goal.get('width', 8)
+        canvas.rect(goal['x'] - width / 2, goal['y'] - 1, width, 2, edge=goal.get('color', 'white'), zorder=4)
+    for cone in map(_point, spec.get('cones', [])):
+        color = cone.get('color', '#FF7F50')
+        canvas.circle(cone['x'], cone['y'], 0.5, fill=color, edge=color, zorder=4)
+    for player in map(_point, spec.get('players', [])):
+        radius = canvas.pt(math.sqrt(max(player.get('size', 800), 0)) / 2)
+        canvas.circle(player['x'], player['y'], radius, fill=player.get('color', '#FFD23F'),
+                      edge='white', linewidth=2, zorder=5)
+        if player.get('label'):
+            canvas.text(player['x'], player['y'], player['label'], 10, bold=True)
+    for ball in map(_point, spec.get('balls', [])):
+        # The matplotlib renderer's seam lines sit below the ball, so only the ball shows
+        canvas.circle(ball['x'], ball['y'], 0.8, fill='white', edge='white', linewidth=2, zorder=5)
+    for arrow in spec.get('arrows', []):
+        _draw_arrow(canvas, arrow['from'], arrow['to'], arrow.get('color', '#FFD23F'),
+                    arrow.get('style', 'solid'), arrow.get('label', ''))
+    for marker in map(_point, spec.get('markers', [])):
+        canvas.circle(marker['x'], marker['y'], canvas.pt(math.sqrt(max(marker.get('size', 50), 0)) / 2),
+                      fill=marker.get('color', '#FFD23F'), alpha=marker.get('alpha', 1))
+
+    title = spec.get('title')
+    margin = canvas.pt(_MARGIN)
+    # The title's ink is about 0.72 of its font size tall, which is what a tight bbox keeps
+    top = ymax + margin + (canvas.pt(_TITLE_SIZE * 0.72 + _TITLE_PAD) if title else 0)
+    heading = _Canvas(ppu)
+    if title:
+        heading.text((xmin + xmax) / 2, ymax + canvas.pt(_TITLE_PAD), title, _TITLE_SIZE, color='white', bold=True,
+                     baseline='alphabetic')
+
+    view_x, view_y = xmin - margin, -top
+    view_width, view_height = xmax - xmin + 2 * margin, top - ymin + margin
+    scale = ppu * _PNG_DPI / 72
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{view_x:.4g} {view_y:.4g} '
+            f'{view_width:.4g} {view_height:.4g}" width="{view_width * scale:.0f}" '
+            f'height="{view_height * scale:.0f}" font-family={quoteattr(FONT)}>'
+            f'<rect x="{view_x:.4g}" y="{view_y:.4g}" width="{view_width:.4g}" height="{view_height:.4g}" '
+            f'fill="{BACKGROUND}"/>'
+            f'<defs><clipPath id="field"><rect x="{xmin:g}" y="{-ymax:g}" width="{xmax - xmin:g}" '
+            f'height="{ymax - ymin:g}"/></clipPath></defs>'
+            f'<g clip-path="url(#field)">{canvas.render()}</g>{heading.render()}</svg>')
@@ -0,0 +1,58 @@
+"""Raster variants of a diagram for responsive images
+
+When diagrams are rendered as PNG, each one is also offered in a few widths
+(DIAGRAM_VARIANTS) as both WebP and PNG, so pages can give the browser a
+srcset and let it download the smallest image that fills the slot: card
+thumbnails, plan sections on a phone, or a sharp print. All variants come
+from one print-resolution matplotlib render, downscaled and encoded with
+Pillow; PNGs are reduced to a 256 colour palette, which a flat diagram
+does not need more than. Pillow and matplotlib are imported on the first
+render, so linking variants costs no imports.
+"""
+import io
+
+from app.utils.diagram_versions import DIAGRAM_VERSION
+
+# Image width (px) of each variant, smallest first
+DIAGRAM_VARIANTS = {'thumb': 480, 'medium': 960, 'print': 1800}
+
+# Variant formats, preferred first, with their mimetypes
+VARIANT_FORMATS = {'webp': 'image/webp', 'png': 'image/png'}
+
+# Bump when the scaling or encoding below changes, so cached variants are replaced
+VARIANT_VERSION = 1
+
+# Resolution of the render the variants are scaled from (wide enough for 'print')
+MASTER_DPI = 300
+
+WEBP_QUALITY = 80
+
+
+def variant_version():
+    """Version of variant output: the matplotlib renderer's plus this module's"""
+    return f'{DIAGRAM_VERSION}.{VARIANT_VERSION}'
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        image.quantize(256).save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def render_variants(spec, variants=DIAGRAM_VARIANTS, formats=VARIANT_FORMATS):
+    """Render a diagram spec once and return {(variant, format): bytes} for every variant"""
+    from PIL import Image
+    from app.utils.diagram_generator import render_diagram_png
+
+    master = Image.open(io.BytesIO(render_diagram_png(spec, dpi=MASTER_DPI))).convert('RGB')
+    rendered = {}
+    for variant, width in variants.items():
+        image = master
+        if master.width > width:  # never upscale
+            image = master.resize((width, round(master.height * width / master.width)), Image.LANCZOS)
+        for fmt in formats:
+            rendered[variant, fmt] = _encode(image, fmt)
+    return rendered
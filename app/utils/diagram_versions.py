@@ -0,0 +1,9 @@
+"""Output version of the matplotlib diagram renderer
+
+It is part of every PNG diagram and variant cache key, so it lives apart
+from app/utils/diagram_generator.py: building keys and srcsets for a page
+must not import matplotlib.
+"""
+
+# Bump when the drawing code of diagram_generator changes, so cached renders are replaced
+DIAGRAM_VERSION = 3
@@ -0,0 +1,126 @@
+"""Per-team drill usage history and recency adjustments for suggestions
+
+``team_drill_usage`` rolls plan_drills up per (team, drill): how many of the
+team's plans include the drill and when the latest one was used (its
+completed_at, or created_at for plans not completed yet). Suggestions read
+one team's rows through an index instead of scanning its plan history.
+
+The rollup is kept current per team by session events: any flushed change
+to a PracticePlan or PlanDrill marks its team, and before the commit each
+marked team's rows are recomputed with one DELETE and one INSERT ... SELECT
+over that team's plans. Bulk statements on plans are not seen by the
+events, so bulk writers call mark_usage_changed() for the teams they touch.
+
+Recency turns into score deltas, in shared focus areas:
+- a drill used within RECENT_WEEKS loses up to RECENCY_PENALTY, fading out
+  linearly over those weeks
+- a drill the team has done before but not in REVISIT_WEEKS gains REVISIT_BOOST
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import db
+from app.models import PracticePlan, PlanDrill, TeamDrillUsage
+
+RECENT_WEEKS = 3
+RECENCY_PENALTY = 1.5
+REVISIT_WEEKS = 6
+REVISIT_BOOST = 0.5
+
+_TEAMS_KEY = 'drill_usage_teams'
+_PLANS_KEY = 'drill_usage_plans'
+
+
+def _usage_select():
+    used_at = db.func.coalesce(PracticePlan.completed_at, PracticePlan.created_at)
+    return (db.select(PracticePlan.team_id, PlanDrill.drill_id,
+                      db.func.count(db.distinct(PracticePlan.id)), db.func.max(used_at))
+            .join(PlanDrill, PlanDrill.plan_id == PracticePlan.id)
+            .group_by(PracticePlan.team_id, PlanDrill.drill_id))
+
+
+def _insert_usage(select):
+    db.session.execute(db.insert(TeamDrillUsage).from_select(
+        ['team_id', 'drill_id', 'times_used', 'last_used_at'], select))
+
+
+def refresh_team_usage(team_ids):
+    """Recompute the rollup rows of the given teams (caller commits)"""
+    team_ids = list(team_ids)
+    if not team_ids:
+        return
+    db.session.execute(db.delete(TeamDrillUsage).where(TeamDrillUsage.team_id.in_(team_ids)))
+    _insert_usage(_usage_select().where(PracticePlan.team_id.in_(team_ids)))
+
+
+def rebuild_usage():
+    """Recompute the whole rollup from plan history (caller commits)"""
+    db.session.execute(db.delete(TeamDrillUsage))
+    _insert_usage(_usage_select())
+
+
+def mark_usage_changed(team_ids, session=None):
+    """Refresh these teams' usage at the next commit (for bulk plan writes the events cannot see)"""
+    session = session or db.session
+    session.info.setdefault(_TEAMS_KEY, set()).update(team_ids)
+
+
+def recency_adjustments(team_ids, now=None):
+    """
+    {team id: (drill ids, score deltas)} for the given teams
+
+    Reads only the teams' rollup rows that get a non-zero delta (through the
+    team_id, last_used_at index); teams without such rows are absent.
+    """
+    now = now or datetime.utcnow()
+    recent_since = now - timedelta(weeks=RECENT_WEEKS)
+    revisit_before = now - timedelta(weeks=REVISIT_WEEKS)
+    rows = db.session.execute(
+        db.select(TeamDrillUsage.team_id, TeamDrillUsage.drill_id, TeamDrillUsage.last_used_at)
+        .where(TeamDrillUsage.team_id.in_(list(team_ids)),
+               db.or_(TeamDrillUsage.last_used_at > recent_since, TeamDrillUsage.last_used_at <= revisit_before))
+    ).all()
+    if not rows:
+        return {}
+
+    import numpy as np  # loaded on first use, not at app startup
+
+    team_column, drill_ids, last_used = zip(*rows)
+    team_column = np.array(team_column, dtype=np.int64)
+    drill_ids = np.array(drill_ids, dtype=np.int64)
+    ages = (np.datetime64(now, 'us') - np.array(last_used, dtype='datetime64[us]')) / np.timedelta64(1, 'W')
+    ages = np.maximum(ages, 0)
+    deltas = np.where(ages < RECENT_WEEKS, -RECENCY_PENALTY * (1 - ages / RECENT_WEEKS), REVISIT_BOOST)
+    return {int(team_id): (drill_ids[team_column == team_id], deltas[team_column == team_id])
+            for team_id in np.unique(team_column)}
+
+
+# -- session events ----------------------------------------------------------
+
+@event.listens_for(db.session, 'after_flush')
+def _record_plan_changes(session, flush_context):
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, PracticePlan):
+            session.info.setdefault(_TEAMS_KEY, set()).add(obj.team_id)
+        elif isinstance(obj, PlanDrill):
+            session.info.setdefault(_PLANS_KEY, set()).add(obj.plan_id)
+
+
+@event.listens_for(db.session, 'before_commit')
+def _refresh_usage(session):
+    session.flush()
+    team_ids = session.info.pop(_TEAMS_KEY, set())
+    plan_ids = session.info.pop(_PLANS_KEY, set())
+    if plan_ids:
+        team_ids |= set(session.scalars(
+            db.select(PracticePlan.team_id).where(PracticePlan.id.in_(plan_ids)).distinct()))
+    team_ids.discard(None)
+    if team_ids:
+        refresh_team_usage(team_ids)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_plan_changes(session):
+    session.info.pop(_TEAMS_KEY, None)
+    session.info.pop(_PLANS_KEY, None)
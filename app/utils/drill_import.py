@@ -0,0 +1,236 @@
+"""Streaming bulk import of drills from CSV or JSON Lines
+
+The upload is decoded incrementally and processed in chunks: each chunk
+costs one ``name IN (...)`` lookup for duplicates and one bulk INSERT, and
+the transaction is committed every ``commit_every`` rows. Memory use
+depends on the chunk size, not the file size.
+
+Those commits are the import's only partial states: if it fails, the drills
+of earlier commits stay imported (rerunning the file skips them by name).
+Similar-drill rankings of the committed drills are refreshed by a background
+job (enqueue_similarity_refresh), so the import does not wait for them.
+"""
+import codecs
+import csv
+import json
+
+from app import db
+from app.models import Drill
+from app.models.tags import insert_drill_tags
+from app.utils.diagram_specs import parse_spec
+from app.utils.drill_similarity import enqueue_similarity_refresh
+
+REQUIRED_COLUMNS = ('name', 'category', 'description')
+TEXT_COLUMNS = ('sub_category', 'equipment_needed', 'recommended_age_groups', 'focus_areas',
+                'setup_instructions', 'coaching_points', 'variations', 'diagram_url')
+INT_COLUMNS = {'min_players': 4, 'max_players': 20, 'duration_minutes': None}
+
+# All columns understood by the importer, in export order
+CSV_COLUMNS = ['name', 'category', 'sub_category', 'description', 'equipment_needed',
+               'min_players', 'max_players', 'recommended_age_groups', 'skill_level',
+               'duration_minutes', 'focus_areas', 'diagram_url', 'diagram_spec',
+               'setup_instructions', 'coaching_points', 'variations']
+
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportResult:
+    """Counters and error messages for one import run"""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.imported = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors = []  # first MAX_REPORTED_ERRORS messages
+        self.drill_ids = []  # ids of the imported drills
+
+    def add_error(self, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self):
+        return {
+            'total_rows': self.total_rows,
+            'imported': self.imported,
+            'skipped': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def iter_text_lines(stream, encoding='utf-8-sig', chunk_size=64 * 1024):
+    """Decode a binary stream incrementally, yielding lines with their line endings"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        pending += decoder.decode(chunk, final=not chunk)
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line + '\n'
+        if not chunk:
+            break
+    if pending:
+        yield pending
+
+
+def _cell(row, column):
+    """Read a cell as stripped text (JSON rows may hold numbers or nulls)"""
+    value = row.get(column)
+    return '' if value is None else str(value).strip()
+
+
+def parse_drill_row(row):
+    """Convert a CSV/JSON row into Drill column values; raises ValueError for invalid rows"""
+    values = {}
+    for column in REQUIRED_COLUMNS:
+        value = _cell(row, column)
+        if not value:
+            raise ValueError(f"missing required column '{column}'")
+        values[column] = value
+
+    for column in TEXT_COLUMNS:
+        values[column] = _cell(row, column) or None
+
+    for column, default in INT_COLUMNS.items():
+        value = _cell(row, column)
+        try:
+            values[column] = int(value) if value else default
+        except ValueError:
+            raise ValueError(f"{column} must be a whole number, got '{value}'")
+
+    values['skill_level'] = _cell(row, 'skill_level') or 'All'
+
+    # JSON text in CSV files; JSON Lines rows may also hold the object itself
+    spec = row.get('diagram_spec')
+    try:
+        values['diagram_spec'] = parse_spec(spec.strip() if isinstance(spec, str) else spec)
+    except ValueError as e:
+        raise ValueError(f'diagram_spec: {e}')
+    return values
+
+
+def _flush_chunk(chunk, seen_names, result):
+    """Insert the new drills of one chunk; returns their ids"""
+    names = [values['name'] for values in chunk]
+    existing = set(db.session.scalars(db.select(Drill.name).where(Drill.name.in_(names))))
+
+    new_rows = []
+    for values in chunk:
+        if values['name'] in existing or values['name'] in seen_names:
+            result.skipped += 1
+            continue
+        seen_names.add(values['name'])
+        new_rows.append(values)
+
+    if not new_rows:
+        return []
+
+    ids = db.session.scalars(
+        db.insert(Drill).returning(Drill.id, sort_by_parameter_order=True),
+        new_rows
+    ).all()
+    insert_drill_tags(
+        (drill_id, values['recommended_age_groups'], values['focus_areas'])
+        for drill_id, values in zip(ids, new_rows)
+    )
+    return ids
+
+
+def iter_jsonl_rows(stream):
+    """Yield one dict per non-blank line of a JSON Lines stream; bad lines yield the error"""
+    for line in iter_text_lines(stream):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f'invalid JSON ({e})')
+            continue
+        yield row if isinstance(row, dict) else ValueError('expected a JSON object')
+
+
+def import_drill_rows(rows, chunk_size=1000, commit_every=10000, progress=None, first_row=2):
+    """
+    Import drills from an iterable of row dicts (or ValueErrors for unreadable rows)
+
+    first_row is the number reported for the first row in error messages
+    (2 for CSV, whose row 1 is the header).
+    Drills whose name already exists (in the database or earlier in the file)
+    are skipped. ``progress`` is called as progress(result) just before each
+    commit, so whatever it records in the session is committed together with
+    the drills it reports; it must not commit itself.
+    A similar-drill refresh is queued for the imported drills at the end
+    (or, when the import fails, for the drills already committed).
+    Returns an ImportResult.
+    """
+    result = ImportResult()
+    seen_names = set()
+    chunk = []
+    uncommitted = 0
+    committed = 0  # leading drill_ids already committed
+
+    def commit():
+        nonlocal uncommitted, committed
+        if progress:
+            progress(result)
+        db.session.commit()
+        uncommitted = 0
+        committed = len(result.drill_ids)
+
+    def flush():
+        nonlocal uncommitted
+        ids = _flush_chunk(chunk, seen_names, result)
+        result.drill_ids.extend(ids)
+        result.imported += len(ids)
+        uncommitted += len(chunk)  # duplicates too, so progress is saved while they are skipped
+        chunk.clear()
+        if uncommitted >= commit_every:
+            commit()
+
+    try:
+        for row_num, row in enumerate(rows, start=first_row):
+            result.total_rows += 1
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                chunk.append(parse_drill_row(row))
+            except ValueError as e:
+                result.add_error(f'Row {row_num}: {e}')
+                continue
+            if len(chunk) >= chunk_size:
+                flush()
+
+        if chunk:
+            flush()
+        commit()
+    except Exception:
+        db.session.rollback()
+        enqueue_similarity_refresh(result.drill_ids[:committed])
+        raise
+
+    enqueue_similarity_refresh(result.drill_ids)
+    return result
+
+
+def import_drills_csv(stream, **kwargs):
+    """Import drills from a binary CSV stream (see import_drill_rows)"""
+    return import_drill_rows(csv.DictReader(iter_text_lines(stream)), **kwargs)
+
+
+def import_drills_jsonl(stream, **kwargs):
+    """Import drills from a binary JSON Lines stream, one drill object per line"""
+    return import_drill_rows(iter_jsonl_rows(stream), first_row=1, **kwargs)
+
+
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+ACCEPTED_EXTENSIONS = ('.csv',) + JSONL_EXTENSIONS
+
+
+def import_drills_file(stream, filename, **kwargs):
+    """Import drills from an upload, picking the format from its file extension"""
+    if filename.lower().endswith(JSONL_EXTENSIONS):
+        return import_drills_jsonl(stream, **kwargs)
+    return import_drills_csv(stream, **kwargs)
@@ -0,0 +1,193 @@
+"""Vectorized drill-to-team scoring with NumPy
+
+Drills are encoded once as feature arrays over a shared vocabulary:
+- a focus area matrix (drills x focus areas, 0/1)
+- an age group matrix (drills x age groups, boolean)
+- skill level codes and min/max player counts
+
+A drill is eligible for a team when the skill level and age group match.
+Eligible drills are ranked by the number of focus areas shared with the team,
+then (with fit_players) drills whose min/max players admit the team's squad
+size before those that do not, then by drill id. Without fit_players the
+order is the plain focus-overlap ranking of the previous SQL and set-based
+lookups. Scoring one team is a
+matrix-vector product; a batch of teams is a single matrix product, and the
+top k drills are picked with argpartition instead of a full sort.
+
+Callers can shift individual drills' scores per team with a sparse
+adjustment of (drill ids, score deltas), e.g. the recency adjustments of
+app/utils/drill_history.py; scores are then compared to 1/SCORE_SCALE.
+"""
+import numpy as np
+
+from app.models.tags import normalize_age_group, normalize_focus_area, split_tags
+
+# Teams scored per matrix product in score_teams (bounds the drills x teams arrays)
+TEAM_BATCH_SIZE = 64
+
+# Adjusted scores are ranked at this resolution
+SCORE_SCALE = 100
+
+_NO_LIMIT = np.iinfo(np.int32).max
+
+# Skill level of drills that suit every team (when include_all_levels is set)
+ALL_LEVELS = 'All'
+
+
+class DrillScoringEngine:
+    """Feature matrices for a fixed set of drills"""
+
+    def __init__(self, drills):
+        """drills: DrillSummary-like objects, ordered by id"""
+        drills = sorted(drills, key=lambda d: d.id)
+        self.drills = drills
+        self.ids = np.fromiter((d.id for d in drills), dtype=np.int64, count=len(drills))
+
+        self.skill_codes = {}
+        self.age_group_codes = {}
+        self.focus_area_codes = {}
+        skill, age_cells, focus_cells = [], [], []
+        for row, drill in enumerate(drills):
+            skill.append(self.skill_codes.setdefault(drill.skill_level, len(self.skill_codes)))
+            for tag in split_tags(drill.recommended_age_groups, normalize_age_group):
+                age_cells.append((row, self.age_group_codes.setdefault(tag, len(self.age_group_codes))))
+            for tag in split_tags(drill.focus_areas, normalize_focus_area):
+                focus_cells.append((row, self.focus_area_codes.setdefault(tag, len(self.focus_area_codes))))
+
+        n = len(drills)
+        self.skill = np.array(skill, dtype=np.int32)
+        # One extra, always False column stands in for age groups no drill uses
+        self.age_groups = np.zeros((n, len(self.age_group_codes) + 1), dtype=bool)
+        self.focus_areas = np.zeros((n, len(self.focus_area_codes)), dtype=np.float32)
+        if age_cells:
+            rows, cols = zip(*age_cells)
+            self.age_groups[rows, cols] = True
+        if focus_cells:
+            rows, cols = zip(*focus_cells)
+            self.focus_areas[rows, cols] = 1.0
+        self.min_players = np.array([d.min_players or 0 for d in drills], dtype=np.int32)
+        self.max_players = np.array([d.max_players or _NO_LIMIT for d in drills], dtype=np.int32)
+
+    def __len__(self):
+        return len(self.drills)
+
+    # -- encoding ------------------------------------------------------------
+
+    def _team_focus_vector(self, team):
+        vector = np.zeros(len(self.focus_area_codes), dtype=np.float32)
+        for tag in split_tags(team.focus_areas, normalize_focus_area):
+            if tag in self.focus_area_codes:
+                vector[self.focus_area_codes[tag]] = 1.0
+        return vector
+
+    def eligible(self, teams, include_all_levels=False):
+        """
+        Boolean drills x teams matrix: the drill suits the team's skill level and age group
+
+        Teams without a skill level or age group are not filtered on it;
+        values no drill uses match nothing. With include_all_levels, drills
+        whose skill level is 'All' suit every team.
+        """
+        skill = np.array([self.skill_codes.get(t.skill_level, -1) if t.skill_level else -2 for t in teams],
+                         dtype=np.int32)
+        mask = (self.skill[:, None] == skill[None, :]) | (skill == -2)[None, :]
+        if include_all_levels and ALL_LEVELS in self.skill_codes:
+            mask |= (self.skill == self.skill_codes[ALL_LEVELS])[:, None]
+
+        age = np.array([self.age_group_codes.get(normalize_age_group(t.age_group), -1) if t.age_group else -2
+                        for t in teams], dtype=np.int64)
+        mask &= self.age_groups[:, np.where(age == -2, -1, age)] | (age == -2)[None, :]
+        return mask
+
+    def player_fit(self, teams):
+        """Boolean drills x teams matrix: the team's num_players is within the drill's limits"""
+        players = np.array([t.num_players or 0 for t in teams], dtype=np.int32)
+        fits = (self.min_players[:, None] <= players[None, :]) & (players[None, :] <= self.max_players[:, None])
+        return fits | (players == 0)[None, :]
+
+    def _adjustment_vector(self, adjustment):
+        """Dense per-drill score deltas from sparse (drill ids, deltas); unknown drills are ignored"""
+        vector = np.zeros(len(self), dtype=np.float32)
+        drill_ids, deltas = adjustment
+        if len(drill_ids) and len(self):
+            rows = np.searchsorted(self.ids, drill_ids)
+            rows = np.minimum(rows, len(self) - 1)
+            known = self.ids[rows] == drill_ids
+            vector[rows[known]] = np.asarray(deltas, dtype=np.float32)[known]
+        return vector
+
+    # -- ranking -------------------------------------------------------------
+
+    def _rank_keys(self, teams, scores, fit_players, include_all_levels=False):
+        """
+        Integer drills x teams keys: higher ranks first, ineligible drills get -1
+
+        A key packs (score, player fit, -row) so a single argpartition or
+        argsort orders by all three. Scores are shifted per team so that
+        negative adjusted scores still make non-negative keys.
+        """
+        n = len(self)
+        scaled = np.rint(scores * SCORE_SCALE).astype(np.int64)
+        if n:
+            scaled -= np.minimum(scaled.min(axis=0), 0)
+        keys = scaled * 2
+        if fit_players:
+            keys += self.player_fit(teams)
+        keys = keys * (n + 1) + (n - np.arange(n, dtype=np.int64))[:, None]
+        return np.where(self.eligible(teams, include_all_levels), keys, -1)
+
+    def _top_rows(self, keys, k):
+        """Row indices of the k largest keys (eligible only), best first"""
+        eligible = int(np.count_nonzero(keys >= 0))
+        k = eligible if k is None else min(k, eligible)
+        if k == 0:
+            return np.empty(0, dtype=np.int64)
+        if k < len(keys):
+            rows = np.argpartition(-keys, k - 1)[:k]
+        else:
+            rows = np.arange(len(keys))
+        return rows[np.argsort(-keys[rows])]
+
+    def score_team(self, team, k=None, fit_players=True, include_all_levels=False, adjustment=None):
+        """
+        Rank drills for one team; returns (drill ids, scores), best first
+
+        Scores are the focus overlap (ints), plus the ``adjustment`` deltas
+        when one is given (floats). k limits the result to the top k drills
+        (None = every eligible drill).
+        """
+        scores = self.focus_areas @ self._team_focus_vector(team)
+        if adjustment is not None:
+            scores = scores + self._adjustment_vector(adjustment)
+        keys = self._rank_keys([team], scores[:, None], fit_players, include_all_levels)[:, 0]
+        rows = self._top_rows(keys, k)
+        return self.ids[rows], self._result_scores(scores[rows], adjustment is not None)
+
+    def score_teams(self, teams, k=None, fit_players=True, adjustments=None):
+        """
+        Rank drills for many teams with one matrix product per batch; returns {team.id: (ids, scores)}
+
+        adjustments optionally maps team ids to sparse (drill ids, deltas) as in score_team.
+        """
+        results = {}
+        for start in range(0, len(teams), TEAM_BATCH_SIZE):
+            batch = teams[start:start + TEAM_BATCH_SIZE]
+            team_focus = np.stack([self._team_focus_vector(team) for team in batch], axis=1)
+            scores = self.focus_areas @ team_focus  # drills x teams
+            for column, team in enumerate(batch):
+                if adjustments and team.id in adjustments:
+                    scores[:, column] += self._adjustment_vector(adjustments[team.id])
+            keys = self._rank_keys(batch, scores, fit_players)
+            for column, team in enumerate(batch):
+                rows = self._top_rows(keys[:, column], k)
+                results[team.id] = (self.ids[rows], self._result_scores(scores[rows, column], adjustments is not None))
+        return results
+
+    @staticmethod
+    def _result_scores(scores, adjusted):
+        return np.round(scores, 2) if adjusted else scores.astype(np.int32)
+
+    def drills_for(self, drill_ids):
+        """Map ranked drill ids back to the drill objects the engine was built from"""
+        rows = np.searchsorted(self.ids, drill_ids)
+        return [self.drills[row] for row in rows]
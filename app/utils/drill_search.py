@@ -0,0 +1,140 @@
+"""Full-text drill search backed by an SQLite FTS5 index
+
+``drills_fts`` is an external-content FTS5 table over the drill text columns.
+Triggers on ``drills`` keep it in sync for every insert, update and delete,
+including bulk inserts that bypass the ORM (CSV import).
+"""
+import re
+
+from markupsafe import Markup, escape
+from sqlalchemy import DDL, event, text
+
+from app import db
+
+FTS_TABLE = 'drills_fts'
+FTS_COLUMNS = ['name', 'description', 'focus_areas', 'coaching_points', 'setup_instructions']
+
+# bm25 weights, one per FTS column: a hit in the name matters most
+BM25_WEIGHTS = (10.0, 2.0, 4.0, 1.0, 1.0)
+
+# Snippets are built with control-character markers so the drill text can be
+# escaped before the markers are turned into <mark> tags.
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+_columns = ', '.join(FTS_COLUMNS)
+_new_values = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+_old_values = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+
+FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_columns}, content='drills', content_rowid='id', tokenize='porter unicode61')",
+
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON drills BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON drills BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); END",
+
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON drills BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+]
+
+
+def install_fts(connection):
+    """Create the FTS table and sync triggers, then rebuild the index from drills"""
+    for statement in FTS_DDL:
+        connection.execute(text(statement))
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def register_fts_ddl(table):
+    """Create the FTS table and triggers whenever ``table`` is created by create_all"""
+    for statement in FTS_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+
+def build_match_expression(search_query):
+    """
+    Turn free text into a safe FTS5 MATCH expression
+
+    Every word becomes a quoted prefix term, so "pass acc" matches
+    "passing accuracy" and FTS operators typed by the user are ignored.
+    Returns None if the query contains no searchable words.
+    """
+    terms = re.findall(r'\w+', search_query or '')
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_subquery(search_query):
+    """
+    Return a subquery of (drill_id, rank) for drills matching the query
+
+    ``rank`` is the bm25 score (lower is better). Returns None if the query
+    has no searchable words. Snippets are fetched separately with
+    ``search_snippets`` so they are only built for the drills actually shown.
+    """
+    match = build_match_expression(search_query)
+    if match is None:
+        return None
+
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    stmt = text(
+        f"SELECT rowid AS drill_id, bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ).bindparams(match=match)
+
+    return stmt.columns(drill_id=db.Integer, rank=db.Float).subquery('drill_search')
+
+
+def has_matches(search_query):
+    """Whether any drill matches the query in the full-text index"""
+    match = build_match_expression(search_query)
+    if match is None:
+        return False
+    return db.session.execute(
+        text(f"SELECT 1 FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match LIMIT 1"), {'match': match}
+    ).first() is not None
+
+
+def fuzzy_subquery(search_query):
+    """
+    Return a (drill_id, rank) subquery of typo-tolerant matches, or None if nothing is similar
+
+    Matches come from the in-memory trigram index (app/utils/fuzzy_search.py);
+    ``rank`` is the negated similarity score, so lower is better as with bm25.
+    """
+    # Imported here: the suggestion index imports the models, which import this module
+    from app.utils.suggestion_index import get_suggestion_index
+
+    matches = get_suggestion_index().trigram_index().search(search_query)
+    if not matches:
+        return None
+    values = ', '.join(f'({int(drill_id)}, {-float(score)!r})' for drill_id, score in matches)
+    stmt = text(f"SELECT column1 AS drill_id, column2 AS rank FROM (VALUES {values})")
+    return stmt.columns(drill_id=db.Integer, rank=db.Float).subquery('drill_search')
+
+
+def search_snippets(search_query, drill_ids, snippet_tokens=12):
+    """Return {drill_id: highlighted snippet} for the given drills"""
+    match = build_match_expression(search_query)
+    if match is None or not drill_ids:
+        return {}
+
+    ids = ', '.join(str(int(drill_id)) for drill_id in drill_ids)
+    rows = db.session.execute(text(
+        f"SELECT rowid, snippet({FTS_TABLE}, -1, :mark_start, :mark_end, '…', :tokens) "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match AND rowid IN ({ids})"
+    ), {'match': match, 'mark_start': _MARK_START, 'mark_end': _MARK_END, 'tokens': snippet_tokens})
+    return {drill_id: highlight(snippet) for drill_id, snippet in rows}
+
+
+def highlight(snippet):
+    """Escape a raw FTS snippet and wrap the matched terms in <mark> tags"""
+    if not snippet:
+        return Markup('')
+    escaped = str(escape(snippet))
+    return Markup(escaped.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
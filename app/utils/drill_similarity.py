@@ -0,0 +1,329 @@
+"""Precomputed "similar drills" from TF-IDF cosine similarity
+
+Each drill is a TF-IDF vector over the words of its description, focus areas
+and coaching points plus its category. The SIMILAR_DRILLS nearest neighbours
+of every drill are stored in ``drill_similarities`` keyed by (drill_id, rank),
+so showing them is a single index range scan of k rows.
+
+Similarities are computed without a dense drills x drills matrix: the
+corpus keeps term -> (drill, weight) postings and one drill's similarity to
+every other drill is a single ``bincount`` over the postings of its terms.
+
+- rebuild_similarities() recomputes every drill (migration, seeding scripts).
+- update_similarities(ids) recomputes only the given drills and the drills
+  whose neighbour lists they enter or leave; imports queue it as a
+  background job for the drills they add (enqueue_similarity_refresh).
+
+Each app keeps the corpus it last loaded. Later updates patch it with just
+the drills added, changed or deleted since (found through the updated_at
+index), weighted with the vocabulary and IDF of the full load; the corpus
+is reloaded once the drills patched since then pass FULL_REBUILD_RATIO.
+
+numpy is imported when a corpus is built; showing stored neighbours
+(get_similar_drills) does not load it.
+"""
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from flask import current_app
+
+from app import db
+from app.models import Drill, DrillSimilarity
+from app.utils.background import submit
+
+SIMILAR_DRILLS = 8
+
+TEXT_COLUMNS = ('description', 'focus_areas', 'coaching_points')
+MAX_QUERY_TERMS = 24     # highest weighted terms of a drill used to find its neighbours
+MAX_DOC_FREQUENCY = 0.5  # ignore words used by more than half of the drills
+
+# Above this share of changed drills a full rebuild (of the table, or of the
+# cached corpus since its last load) is cheaper than patching
+FULL_REBUILD_RATIO = 0.25
+INSERT_BATCH = 5000
+
+STOP_WORDS = frozenset('''
+    a an and are as at be by for from has in into is it its of on or the their then this to
+    with each one two three four five who will can when after before all while your you
+    '''.split())
+
+_WORD_RE = re.compile(r'[a-z][a-z0-9]+')
+
+
+def tokenize(text):
+    return [word for word in _WORD_RE.findall(text.lower()) if word not in STOP_WORDS] if text else []
+
+
+def drill_terms(category, *texts):
+    """Term counts for one drill; the category is a single extra term"""
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenize(text))
+    if category:
+        counts[f'category:{category.lower()}'] += 1
+    return counts
+
+
+class TfidfCorpus:
+    """
+    Sparse, L2-normalized TF-IDF vectors for a set of drills
+
+    Rows are only ever appended: patch() retires the rows of changed or
+    deleted drills (they score 0) and appends the changed drills' new vectors.
+    """
+
+    def __init__(self, rows):
+        """rows: (drill id, category, *TEXT_COLUMNS) tuples"""
+        import numpy as np
+
+        documents = [(row[0], drill_terms(*row[1:])) for row in rows]
+        n = len(documents)
+
+        doc_frequency = Counter()
+        for _, counts in documents:
+            doc_frequency.update(counts.keys())
+        max_df = max(2, MAX_DOC_FREQUENCY * n)
+        self.vocabulary = {term: i for i, term in enumerate(t for t, df in doc_frequency.items() if df <= max_df)}
+        self.idf = {term: math.log((1 + n) / (1 + doc_frequency[term])) + 1 for term in self.vocabulary}
+
+        self.ids = np.empty(0, dtype=np.int64)
+        self.live = np.empty(0, dtype=bool)
+        self.row_of = {}
+        self.retired = 0
+        self.doc_terms = []  # per row: (term indices, weights), highest weight first
+        self.postings = [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)) for _ in self.vocabulary]
+        self._append(documents)
+
+    def _append(self, documents):
+        """Add (drill id, term counts) documents as new rows (sublinear tf * idf, L2-normalized)"""
+        import numpy as np
+
+        first = len(self.ids)
+        postings = defaultdict(list)
+        for row, (drill_id, counts) in enumerate(documents, start=first):
+            weights = {self.vocabulary[t]: (1 + math.log(c)) * self.idf[t]
+                       for t, c in counts.items() if t in self.vocabulary}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            vector = sorted(((term, w / norm) for term, w in weights.items()), key=lambda tw: -tw[1])
+            self.doc_terms.append((np.array([t for t, _ in vector], dtype=np.int64),
+                                   np.array([w for _, w in vector], dtype=np.float32)))
+            self.row_of[drill_id] = row
+            for term, weight in vector:
+                postings[term].append((row, weight))
+
+        self.ids = np.concatenate([self.ids, np.array([drill_id for drill_id, _ in documents], dtype=np.int64)])
+        self.live = np.concatenate([self.live, np.ones(len(documents), dtype=bool)])
+        for term, entries in postings.items():
+            rows, weights = self.postings[term]
+            self.postings[term] = (np.concatenate([rows, np.array([r for r, _ in entries], dtype=np.int64)]),
+                                   np.concatenate([weights, np.array([w for _, w in entries], dtype=np.float32)]))
+
+    def patch(self, removed_ids, rows):
+        """Retire the rows of removed (deleted or changed) drills and append ``rows``, as in __init__"""
+        for drill_id in removed_ids:
+            row = self.row_of.pop(drill_id, None)
+            if row is not None:
+                self.live[row] = False
+                self.retired += 1
+        self._append([(row[0], drill_terms(*row[1:])) for row in rows])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def similarities(self, row):
+        """Cosine similarity of one drill to every row (its own and retired rows are zeroed)"""
+        import numpy as np
+
+        terms, query_weights = self.doc_terms[row]
+        terms, query_weights = terms[:MAX_QUERY_TERMS], query_weights[:MAX_QUERY_TERMS]
+        if not len(terms):
+            return np.zeros(len(self), dtype=np.float32)
+        rows = np.concatenate([self.postings[term][0] for term in terms])
+        weights = np.concatenate([self.postings[term][1] * weight for term, weight in zip(terms, query_weights)])
+        scores = np.bincount(rows, weights, minlength=len(self))
+        scores[row] = 0
+        if self.retired:
+            scores[~self.live] = 0
+        return scores
+
+    def neighbours(self, row, k=SIMILAR_DRILLS, scores=None):
+        """(rows, scores) of the k most similar drills with a positive score, best first"""
+        import numpy as np
+
+        scores = self.similarities(row) if scores is None else scores
+        k = min(k, len(self) - 1)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((self.ids[top], -scores[top]))]
+        top = top[scores[top] > 0]
+        return top, scores[top]
+
+
+def _drill_rows(*criteria):
+    columns = [Drill.id, Drill.category] + [getattr(Drill, c) for c in TEXT_COLUMNS]
+    return db.session.execute(db.select(*columns).where(*criteria).order_by(Drill.id)).all()
+
+
+def load_corpus():
+    return TfidfCorpus(_drill_rows())
+
+
+class _CorpusCache:
+    """An app's last loaded corpus, with what is needed to patch it"""
+
+    def __init__(self):
+        self.lock = threading.Lock()  # held while the corpus is used or patched
+        self.corpus = None
+        self.watermark = None  # latest drill updated_at when the corpus was loaded or patched
+        self.patched = 0  # drills patched since the full load
+
+    def reload(self):
+        self.watermark = db.session.scalar(db.select(db.func.max(Drill.updated_at)))
+        self.corpus = load_corpus()
+        self.patched = 0
+        return self.corpus
+
+    def current(self):
+        """The corpus, patched with the drills added, changed or deleted since it was loaded or last patched"""
+        if self.corpus is None or self.watermark is None:
+            return self.reload()
+        watermark = db.session.scalar(db.select(db.func.max(Drill.updated_at)))
+        ids = set(db.session.scalars(db.select(Drill.id)))
+        changed = set(db.session.scalars(db.select(Drill.id).where(Drill.updated_at >= self.watermark)))
+        changed |= ids - self.corpus.row_of.keys()
+        removed = self.corpus.row_of.keys() - ids
+        if not changed and not removed:
+            return self.corpus
+        self.patched += len(changed) + len(removed)
+        if self.patched > FULL_REBUILD_RATIO * max(len(ids), 1):
+            return self.reload()
+
+        changed = sorted(changed)
+        rows = []
+        for start in range(0, len(changed), INSERT_BATCH):
+            rows.extend(_drill_rows(Drill.id.in_(changed[start:start + INSERT_BATCH])))
+        self.corpus.patch(removed.union(changed), rows)
+        self.watermark = watermark
+        return self.corpus
+
+
+def _corpus_cache():
+    return current_app.extensions.setdefault('drill_similarity_corpus', _CorpusCache())
+
+
+def _similarity_rows(corpus, row, scores=None):
+    rows, values = corpus.neighbours(row, scores=scores)
+    drill_id = int(corpus.ids[row])
+    return [{'drill_id': drill_id, 'rank': rank, 'similar_drill_id': int(corpus.ids[r]), 'score': float(s)}
+            for rank, (r, s) in enumerate(zip(rows, values))]
+
+
+def _insert(rows):
+    for start in range(0, len(rows), INSERT_BATCH):
+        db.session.execute(db.insert(DrillSimilarity), rows[start:start + INSERT_BATCH])
+
+
+def rebuild_similarities():
+    """Recompute the neighbours of every drill (caller commits)"""
+    cache = _corpus_cache()
+    with cache.lock:
+        return _rebuild(cache.reload())
+
+
+def _rebuild(corpus):
+    db.session.execute(db.delete(DrillSimilarity))
+    batch = []
+    for row in sorted(corpus.row_of.values()):
+        batch.extend(_similarity_rows(corpus, row))
+        if len(batch) >= INSERT_BATCH:
+            _insert(batch)
+            batch = []
+    _insert(batch)
+    return len(corpus.row_of)
+
+
+def _kth_scores(corpus):
+    """Per corpus row, the score a drill must beat to enter its stored neighbour list"""
+    import numpy as np
+
+    thresholds = np.zeros(len(corpus))
+    rows = db.session.execute(
+        db.select(DrillSimilarity.drill_id, db.func.min(DrillSimilarity.score), db.func.count())
+        .group_by(DrillSimilarity.drill_id))
+    for drill_id, lowest, count in rows:
+        row = corpus.row_of.get(drill_id)
+        if row is not None and count >= SIMILAR_DRILLS:
+            thresholds[row] = lowest
+    return thresholds
+
+
+def update_similarities(drill_ids):
+    """
+    Refresh neighbours after the given drills were added, changed or deleted (caller commits)
+
+    Cosine similarity is symmetric, so one pass per changed drill finds
+    every other drill it now belongs next to: those where it scores above
+    their current k-th neighbour. They are recomputed together with the
+    changed drills and the drills that listed one of them before. Falls back
+    to a full rebuild when a large share of the library changed.
+    """
+    drill_ids = set(drill_ids)
+    if not drill_ids:
+        return
+    cache = _corpus_cache()
+    with cache.lock:
+        corpus = cache.current()
+        if len(drill_ids) > FULL_REBUILD_RATIO * max(len(corpus.row_of), 1):
+            _rebuild(corpus if not cache.patched else cache.reload())
+        else:
+            _update(corpus, drill_ids)
+
+
+def _update(corpus, drill_ids):
+    affected = set(db.session.scalars(
+        db.select(DrillSimilarity.drill_id).where(DrillSimilarity.similar_drill_id.in_(drill_ids))))
+    thresholds = _kth_scores(corpus)
+    new_rows = []
+    for drill_id in drill_ids:
+        row = corpus.row_of.get(drill_id)
+        if row is None:  # deleted
+            continue
+        scores = corpus.similarities(row)
+        new_rows.extend(_similarity_rows(corpus, row, scores))
+        affected.update(corpus.ids[scores > thresholds].tolist())
+    affected -= drill_ids
+
+    for drill_id in affected:
+        if drill_id in corpus.row_of:
+            new_rows.extend(_similarity_rows(corpus, corpus.row_of[drill_id]))
+
+    stale = list(drill_ids | affected)
+    for start in range(0, len(stale), INSERT_BATCH):
+        db.session.execute(db.delete(DrillSimilarity).where(
+            DrillSimilarity.drill_id.in_(stale[start:start + INSERT_BATCH])))
+    _insert(new_rows)
+
+
+def refresh_similarities(drill_ids):
+    """Background job: update_similarities for the given drills, then commit"""
+    update_similarities(drill_ids)
+    db.session.commit()
+
+
+def enqueue_similarity_refresh(drill_ids):
+    """Queue refresh_similarities for drills that were added or changed (IMPORT_EXECUTOR)"""
+    if drill_ids:
+        submit(refresh_similarities, list(drill_ids))
+
+
+def get_similar_drills(drill, k=SIMILAR_DRILLS):
+    """The k drills most similar to ``drill`` as (Drill, score) pairs, most similar first"""
+    return (db.session.query(Drill, DrillSimilarity.score)
+            .join(DrillSimilarity, DrillSimilarity.similar_drill_id == Drill.id)
+            .filter(DrillSimilarity.drill_id == drill.id)
+            .order_by(DrillSimilarity.rank)
+            .limit(k)
+            .all())
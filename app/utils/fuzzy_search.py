@@ -0,0 +1,100 @@
+"""Typo-tolerant drill search with an in-memory trigram index
+
+Words from drill names, sub-categories and focus areas are split into
+trigrams (padded like PostgreSQL's pg_trgm, so "rondo" -> "  r", " ro",
+"ron", "ond", "ndo", "do "). A query word is matched against the vocabulary
+by Jaccard similarity of trigram sets, found through trigram -> word postings,
+and matching words lead to drills through word -> drill postings. A drill's
+score is the sum, over query words, of its best match similarity times the
+weight of the field it matched in.
+
+The index lives inside the suggestion index (app/utils/suggestion_index.py)
+and is updated drill by drill from the same write events. The catalog uses
+it when full-text search finds nothing, e.g. for "rondoo" or "drible".
+"""
+import heapq
+import re
+from collections import Counter, defaultdict
+
+SIMILARITY_THRESHOLD = 0.3
+MAX_RESULTS = 200
+
+# Field weights: a name match counts for more than a tag match
+NAME_WEIGHT = 1.0
+TAG_WEIGHT = 0.8
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def words(text):
+    """Lowercase alphanumeric words of a text"""
+    return _WORD_RE.findall(text.lower()) if text else []
+
+
+def trigrams(word):
+    """Padded trigrams of one word"""
+    padded = f'  {word} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def drill_fields(drill):
+    """(text, weight) pairs indexed for a drill"""
+    return ((drill.name, NAME_WEIGHT), (drill.sub_category, TAG_WEIGHT), (drill.focus_areas, TAG_WEIGHT))
+
+
+class TrigramIndex:
+    """Word-level trigram index over documents made of weighted text fields"""
+
+    def __init__(self):
+        self._word_trigrams = {}               # word -> trigram set
+        self._words_by_trigram = defaultdict(set)
+        self._docs_by_word = defaultdict(dict)  # word -> {doc id: field weight}
+        self._doc_words = {}                   # doc id -> {word: field weight}
+
+    def __len__(self):
+        return len(self._doc_words)
+
+    def add(self, doc_id, fields):
+        """Index (or re-index) a document given as (text, weight) pairs"""
+        self.remove(doc_id)
+        doc_words = {}
+        for text, weight in fields:
+            for word in words(text):
+                doc_words[word] = max(weight, doc_words.get(word, 0))
+        for word, weight in doc_words.items():
+            if word not in self._word_trigrams:
+                self._word_trigrams[word] = trigrams(word)
+                for trigram in self._word_trigrams[word]:
+                    self._words_by_trigram[trigram].add(word)
+            self._docs_by_word[word][doc_id] = weight
+        self._doc_words[doc_id] = doc_words
+
+    def remove(self, doc_id):
+        # Words stay in the vocabulary; they just stop leading to this document
+        for word in self._doc_words.pop(doc_id, ()):
+            self._docs_by_word[word].pop(doc_id, None)
+
+    def similar_words(self, word, threshold=SIMILARITY_THRESHOLD):
+        """Yield (vocabulary word, Jaccard similarity) pairs at or above the threshold"""
+        query = trigrams(word)
+        shared = Counter()
+        for trigram in query:
+            shared.update(self._words_by_trigram.get(trigram, ()))
+        for candidate, count in shared.items():
+            similarity = count / (len(query) + len(self._word_trigrams[candidate]) - count)
+            if similarity >= threshold:
+                yield candidate, similarity
+
+    def search(self, text, threshold=SIMILARITY_THRESHOLD, limit=MAX_RESULTS):
+        """Best matching documents for a free-text query as [(doc id, score)], best first"""
+        scores = defaultdict(float)
+        for query_word in set(words(text)):
+            best = {}
+            for word, similarity in self.similar_words(query_word, threshold):
+                for doc_id, weight in self._docs_by_word[word].items():
+                    score = similarity * weight
+                    if score > best.get(doc_id, 0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
@@ -0,0 +1,105 @@
+"""In-process background queue for CSV drill imports
+
+Uploads are saved to disk, recorded as an ImportJob row and handed to the
+local executor chosen by the IMPORT_EXECUTOR setting (app/utils/background.py:
+a thread or process pool, or inline for testing).
+
+Job progress is written to the import_jobs table, so any worker process can
+answer status requests. It is recorded in the same commits as the imported
+drills, so it always matches what is in the database; jobs commit every
+chunk (JOB_COMMIT_EVERY rows) so the progress bar moves. No external broker
+is needed.
+"""
+import json
+import os
+import uuid
+from datetime import datetime
+
+from flask import current_app
+
+from app import db
+from app.models import ImportJob
+from app.utils.background import submit
+from app.utils.drill_import import import_drills_file
+
+# Rows per commit (and so per progress update) of a background import; one chunk
+JOB_COMMIT_EVERY = 1000
+
+
+class _CountingReader:
+    """Wrap a binary file and count the bytes read, for progress reporting"""
+
+    def __init__(self, f):
+        self._f = f
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def enqueue_import(file_storage):
+    """Save an uploaded CSV/JSONL file, create its ImportJob and schedule it; returns the job"""
+    folder = current_app.config.get('IMPORT_UPLOAD_FOLDER') or os.path.join(current_app.instance_path, 'imports')
+    os.makedirs(folder, exist_ok=True)
+    extension = os.path.splitext(file_storage.filename)[1].lower()
+    path = os.path.join(folder, f'{uuid.uuid4().hex}{extension}')
+    file_storage.save(path)
+
+    job = ImportJob(filename=file_storage.filename, file_path=path, status='queued',
+                    total_bytes=os.path.getsize(path))
+    db.session.add(job)
+    db.session.commit()
+
+    future = submit(run_import_job, job.id)
+    if current_app.config.get('IMPORT_EXECUTOR') == 'process':
+        # The worker's inserts are not seen by this process's suggestion index
+        index = current_app.extensions.get('suggestion_index')
+        if index is not None:
+            future.add_done_callback(lambda _: index.invalidate())
+    return job
+
+
+def run_import_job(job_id):
+    """Run one queued import job to completion (call inside an app context)"""
+    job = db.session.get(ImportJob, job_id)
+    if job is None or job.status != 'queued':
+        return
+
+    job.status = 'running'
+    job.started_at = datetime.utcnow()
+    db.session.commit()
+
+    def progress(result):
+        # Committed by the importer together with the drills counted here;
+        # a rerun after a crash simply skips the drills that were already imported.
+        job.processed_bytes = reader.bytes_read
+        job.rows_processed = result.total_rows
+        job.imported = result.imported
+        job.skipped = result.skipped
+        job.error_count = result.error_count
+
+    try:
+        with open(job.file_path, 'rb') as f:
+            reader = _CountingReader(f)
+            result = import_drills_file(reader, job.filename, progress=progress,
+                                        chunk_size=JOB_COMMIT_EVERY, commit_every=JOB_COMMIT_EVERY)
+    except Exception as e:
+        db.session.rollback()
+        job.status = 'failed'
+        job.message = str(e)
+    else:
+        job.status = 'done'
+        job.processed_bytes = job.total_bytes
+        job.rows_processed = result.total_rows
+        job.imported = result.imported
+        job.skipped = result.skipped
+        job.error_count = result.error_count
+        job.errors_json = json.dumps(result.errors)
+    finally:
+        if job.file_path and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        job.file_path = None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
@@ -0,0 +1,98 @@
+"""Keyset (cursor) pagination helpers
+
+Instead of OFFSET, each page continues from the sort key of the last row of
+the previous page, e.g. ``WHERE (name, id) > (:name, :id)``. With an index on
+the sort columns every page is an index range scan, so page latency stays the
+same no matter how deep into the table the client is.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+DEFAULT_PER_PAGE = 24
+MAX_PER_PAGE = 100
+
+
+class KeysetPage:
+    """One page of results plus the cursor for the next page (None on the last page)"""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    """A sort key value: a scalar, or {'dt': iso string}; anything else is malformed"""
+    if isinstance(value, dict):
+        if value.keys() != {'dt'} or not isinstance(value['dt'], str):
+            raise ValueError('malformed cursor value')
+        return datetime.fromisoformat(value['dt'])
+    if value is not None and not isinstance(value, (str, int, float)):
+        raise ValueError('malformed cursor value')
+    return value
+
+
+def encode_cursor(values):
+    """Encode a row's sort key as an opaque URL-safe cursor string"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Decode a cursor back into its sort key; returns None for a missing or malformed cursor"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != size:
+            return None
+        return [_decode_value(v) for v in values]
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+
+
+def parse_per_page(value, default=DEFAULT_PER_PAGE):
+    """Parse a per_page/limit request argument, clamped to 1..MAX_PER_PAGE"""
+    try:
+        per_page = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def paginate_keyset(query, order_columns, key, cursor=None, per_page=DEFAULT_PER_PAGE, descending=False):
+    """
+    Fetch one page of ``query`` ordered by ``order_columns``
+
+    order_columns: column expressions forming a unique sort key, e.g. (Drill.name, Drill.id)
+    key: function returning the sort key values for a result row
+    cursor: the ``next_cursor`` of the previous page, or None for the first page
+    descending: sort newest/largest first
+    """
+    values = decode_cursor(cursor, len(order_columns))
+    if values is not None:
+        row_key = tuple_(*order_columns)
+        query = query.filter(row_key < tuple_(*values) if descending else row_key > tuple_(*values))
+
+    ordering = [column.desc() if descending else column.asc() for column in order_columns]
+    rows = query.order_by(*ordering).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(key(rows[-1]))
+    return KeysetPage(rows, next_cursor)
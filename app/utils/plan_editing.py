@@ -0,0 +1,144 @@
+"""Diff-based editing of the drills in a practice plan
+
+Saving a plan compares the submitted drill list with the plan's existing
+PlanDrill rows and only writes what changed: new rows are inserted, missing
+rows deleted, and rows that moved or changed duration are updated in place.
+Untouched rows keep their primary key and per-drill notes.
+"""
+from app import db
+from app.models import Drill, PlanDrill
+
+
+class PlanDrillChanges:
+    """Counts of the row changes made by one save"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.deleted = 0
+
+    def to_dict(self):
+        return {'inserted': self.inserted, 'updated': self.updated, 'deleted': self.deleted}
+
+
+def _to_int(value, field):
+    if isinstance(value, bool):  # int(True) would pass as 1
+        raise ValueError(f'{field} must be a whole number, got {value!r}')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be a whole number, got {value!r}')
+
+
+def parse_duration(value, field='duration_minutes'):
+    """Parse a duration in minutes; raises ValueError unless it is a positive whole number"""
+    minutes = _to_int(value, field)
+    if minutes <= 0:
+        raise ValueError(f'{field} must be positive')
+    return minutes
+
+
+def parse_notes(value, field='notes'):
+    """Parse optional notes; raises ValueError unless they are a string or null (empty becomes None)"""
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f'{field} must be a string or null')
+    return value or None
+
+
+def parse_drill_entry(entry):
+    """
+    Validate one drill entry of a plan edit
+
+    Entries are dicts with drill_id and duration_minutes, plus the optional
+    id of an existing PlanDrill row and optional notes (left unchanged when
+    the key is absent). Raises ValueError for invalid entries.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError('each drill must be an object')
+    parsed = {
+        'id': _to_int(entry['id'], 'id') if entry.get('id') not in (None, '') else None,
+        'drill_id': _to_int(entry.get('drill_id'), 'drill_id'),
+        'duration_minutes': parse_duration(entry.get('duration_minutes')),
+    }
+    if 'notes' in entry:
+        parsed['notes'] = parse_notes(entry['notes'])
+    return parsed
+
+
+def entries_from_form(form):
+    """Build drill entries from the plan edit form's parallel drill_ids[] / drill_durations[] lists"""
+    drill_ids = form.getlist('drill_ids[]')
+    durations = form.getlist('drill_durations[]')
+    plan_drill_ids = form.getlist('plan_drill_ids[]')
+    return [
+        parse_drill_entry({
+            'id': plan_drill_ids[i] if i < len(plan_drill_ids) else None,
+            'drill_id': drill_id,
+            'duration_minutes': duration,
+        })
+        for i, (drill_id, duration) in enumerate(zip(drill_ids, durations))
+    ]
+
+
+def apply_plan_drill_entries(plan, entries):
+    """
+    Make plan.plan_drills match ``entries`` (in order) with the fewest row changes
+
+    Each entry is matched to an existing row by its PlanDrill id, or failing
+    that to the first unmatched row for the same drill. Unmatched entries
+    become inserts and unmatched rows are deleted. Changes are left in the
+    session for the caller to commit. Returns a PlanDrillChanges.
+    """
+    changes = PlanDrillChanges()
+    existing = list(plan.plan_drills)
+    by_id = {pd.id: pd for pd in existing}
+    unmatched = list(existing)
+
+    new_drill_ids = set()
+    matched = []
+    for entry in entries:
+        plan_drill = None
+        if entry.get('id') is not None:
+            plan_drill = by_id.get(entry['id'])
+            if plan_drill is None:
+                raise ValueError(f"plan drill {entry['id']} does not belong to this plan")
+            if plan_drill not in unmatched:
+                raise ValueError(f"plan drill {entry['id']} is listed more than once")
+        else:
+            plan_drill = next((pd for pd in unmatched if pd.drill_id == entry['drill_id']), None)
+        if plan_drill is None:
+            new_drill_ids.add(entry['drill_id'])
+        else:
+            unmatched.remove(plan_drill)
+        matched.append((entry, plan_drill))
+
+    # One query validates every drill that is about to be added
+    if new_drill_ids:
+        found = set(db.session.scalars(db.select(Drill.id).where(Drill.id.in_(new_drill_ids))))
+        missing = sorted(new_drill_ids - found)
+        if missing:
+            raise ValueError(f'unknown drill id(s): {", ".join(map(str, missing))}')
+
+    ordered = []
+    for order, (entry, plan_drill) in enumerate(matched):
+        if plan_drill is None:
+            plan_drill = PlanDrill(drill_id=entry['drill_id'], order=order,
+                                   duration_minutes=entry['duration_minutes'], notes=entry.get('notes'))
+            changes.inserted += 1
+        else:
+            values = {'drill_id': entry['drill_id'], 'order': order, 'duration_minutes': entry['duration_minutes']}
+            if 'notes' in entry:
+                values['notes'] = entry['notes']
+            changed = False
+            for attr, value in values.items():
+                if getattr(plan_drill, attr) != value:
+                    setattr(plan_drill, attr, value)
+                    changed = True
+            changes.updated += changed
+        ordered.append(plan_drill)
+
+    changes.deleted = len(unmatched)
+    if changes.inserted or changes.deleted or ordered != existing:
+        # Rows left out of the collection are deleted by the delete-orphan cascade
+        plan.plan_drills = ordered
+    return changes
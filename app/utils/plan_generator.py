@@ -0,0 +1,188 @@
+"""Automatic practice plan generation
+
+Builds a complete session for a team: drills run warm-up -> technical ->
+tactical -> game, their recommended durations add up to the target length,
+and as many of the team's focus areas as possible are covered.
+
+Candidates come from the suggestion scoring engine (skill level, age group
+and player-count limits are hard filters here). The best few per phase go
+into a dynamic program over (minutes used, focus areas covered) states,
+applied one candidate at a time with a per-phase drill limit. A beam cap on
+the number of states bounds the work regardless of library size.
+"""
+from collections import namedtuple
+
+from app.models.tags import normalize_focus_area, split_tags
+from app.utils.suggestion_index import get_suggestion_index
+
+Phase = namedtuple('Phase', 'key label categories max_drills')
+
+# Session progression; drills are assigned to the first phase that matches
+PHASES = (
+    Phase('warm_up', 'Warm-up', ('Physical', 'Fun'), 1),
+    Phase('technical', 'Technical', ('Technical',), 3),
+    Phase('tactical', 'Tactical', ('Tactical',), 3),
+    Phase('game', 'Game', ('Game',), 2),
+)
+
+CANDIDATES_PER_PHASE = 8
+BEAM_WIDTH = 1500
+DEFAULT_DRILL_MINUTES = 10  # for drills without a recommended duration
+MAX_SESSION_MINUTES = 180
+
+# Objective weights: a full progression first, then focus area coverage,
+# then how strongly each drill matches the team's focus areas
+PHASE_WEIGHT = 1000
+COVERAGE_WEIGHT = 100
+OVERLAP_WEIGHT = 5
+
+PlannedDrill = namedtuple('PlannedDrill', 'phase drill duration_minutes')
+
+
+class GeneratedPlan:
+    """An ordered list of planned drills plus how well it meets the request"""
+
+    def __init__(self, team, target_minutes, items, focus_areas, covered):
+        self.team = team
+        self.target_minutes = target_minutes
+        self.items = items
+        self.focus_areas = focus_areas
+        self.covered_focus_areas = [tag for tag in focus_areas if tag in covered]
+
+    @property
+    def total_minutes(self):
+        return sum(item.duration_minutes for item in self.items)
+
+    @property
+    def missing_focus_areas(self):
+        return [tag for tag in self.focus_areas if tag not in self.covered_focus_areas]
+
+    def to_dict(self):
+        return {
+            'team_id': self.team.id,
+            'target_minutes': self.target_minutes,
+            'total_minutes': self.total_minutes,
+            'covered_focus_areas': self.covered_focus_areas,
+            'missing_focus_areas': self.missing_focus_areas,
+            'drills': [{
+                'order': order,
+                'phase': item.phase.key,
+                'drill_id': item.drill.id,
+                'name': item.drill.name,
+                'category': item.drill.category,
+                'duration_minutes': item.duration_minutes,
+            } for order, item in enumerate(self.items)],
+        }
+
+
+def drill_phase(drill):
+    """The session phase a drill belongs in, or None"""
+    if 'warm' in (drill.sub_category or '').lower() or 'warm' in drill.name.lower():
+        return PHASES[0]
+    for phase in PHASES:
+        if drill.category in phase.categories:
+            return phase
+    return None
+
+
+def _fits_players(drill, num_players):
+    if not num_players:
+        return True
+    return (drill.min_players or 0) <= num_players <= (drill.max_players or num_players)
+
+
+def _phase_candidates(team, target_minutes, exclude=frozenset()):
+    """Up to CANDIDATES_PER_PHASE suitable drills per phase, best ranked first"""
+    engine = get_suggestion_index().scoring_engine()
+    drill_ids, _ = engine.score_team(team, include_all_levels=True)
+    candidates = {phase.key: [] for phase in PHASES}
+    open_phases = len(PHASES)
+    for drill in engine.drills_for(drill_ids):
+        if drill.id in exclude:
+            continue
+        phase = drill_phase(drill)
+        if phase is None or len(candidates[phase.key]) >= CANDIDATES_PER_PHASE:
+            continue
+        if not _fits_players(drill, team.num_players):
+            continue
+        if (drill.duration_minutes or DEFAULT_DRILL_MINUTES) > target_minutes:
+            continue
+        candidates[phase.key].append(drill)
+        if len(candidates[phase.key]) == CANDIDATES_PER_PHASE:
+            open_phases -= 1
+            if not open_phases:
+                break
+    return candidates
+
+
+def _prune(states):
+    if len(states) <= BEAM_WIDTH:
+        return states
+    best = sorted(states.items(), key=lambda item: item[1][0], reverse=True)[:BEAM_WIDTH]
+    return dict(best)
+
+
+def _solve(candidates, target_minutes, focus_bits):
+    """
+    Best drill selection per (minutes, covered focus mask)
+
+    Returns {(minutes, mask): (score, ((phase, drill), ...))}.
+    """
+    states = {(0, 0): (0, ())}
+    for phase in PHASES:
+        layer = {(minutes, mask, 0): value for (minutes, mask), value in states.items()}
+        for drill in candidates[phase.key]:
+            duration = drill.duration_minutes or DEFAULT_DRILL_MINUTES
+            bits = 0
+            for tag in split_tags(drill.focus_areas, normalize_focus_area):
+                bits |= focus_bits.get(tag, 0)
+            overlap = bin(bits).count('1')
+            updated = dict(layer)
+            for (minutes, mask, count), (score, choices) in layer.items():
+                if count >= phase.max_drills or minutes + duration > target_minutes:
+                    continue
+                gain = COVERAGE_WEIGHT * bin(bits & ~mask).count('1') + OVERLAP_WEIGHT * overlap
+                if count == 0:
+                    gain += PHASE_WEIGHT
+                key = (minutes + duration, mask | bits, count + 1)
+                if key not in updated or score + gain > updated[key][0]:
+                    updated[key] = (score + gain, choices + ((phase, drill),))
+            layer = _prune(updated)
+
+        states = {}
+        for (minutes, mask, count), value in layer.items():
+            if (minutes, mask) not in states or value[0] > states[(minutes, mask)][0]:
+                states[(minutes, mask)] = value
+        states = _prune(states)
+    return states
+
+
+def generate_practice_plan(team, target_minutes=None, exclude=frozenset()):
+    """
+    Generate a plan for a team that fills ``target_minutes``
+    (default: the team's recommended session duration)
+
+    ``team`` only needs the attributes the scoring engine reads (id,
+    skill_level, age_group, num_players, focus_areas), so callers can plan
+    for an adjusted profile. Drill ids in ``exclude`` are never used.
+
+    Uses each drill's recommended duration. When no combination adds up
+    exactly, the longest plan under the target is used and its last drill is
+    extended to fill the session. Returns a GeneratedPlan (with no items if
+    no drill suits the team).
+    """
+    target_minutes = target_minutes or team.recommended_session_duration
+    focus_areas = split_tags(team.focus_areas, normalize_focus_area)
+    focus_bits = {tag: 1 << i for i, tag in enumerate(focus_areas)}
+
+    states = _solve(_phase_candidates(team, target_minutes, exclude), target_minutes, focus_bits)
+    # Prefer plans that fill the session exactly, then the highest score
+    (minutes, mask), (score, choices) = max(states.items(), key=lambda item: (item[0][0], item[1][0]))
+
+    items = [PlannedDrill(phase, drill, drill.duration_minutes or DEFAULT_DRILL_MINUTES)
+             for phase, drill in choices]
+    if items and minutes < target_minutes:
+        last = items[-1]
+        items[-1] = last._replace(duration_minutes=last.duration_minutes + target_minutes - minutes)
+    covered = {tag for tag, bit in focus_bits.items() if mask & bit}
+    return GeneratedPlan(team, target_minutes, items, focus_areas, covered)
@@ -0,0 +1,214 @@
+"""Multi-week season planning
+
+A season is one generated practice plan per week for a team. Each week is
+planned by the practice plan generator (app/utils/plan_generator.py) for an
+adjusted team profile:
+
+- focus areas: the team's focus areas rotate through the weeks,
+  FOCUS_AREAS_PER_WEEK at a time, so each gets the same share of the season
+- skill level: steps from the season's start level to its end level, the
+  later weeks at the higher level
+- variety: a drill is used at most ``max_repeats`` times in any
+  ``repeat_window`` consecutive weeks
+
+The repeat cap is checked in both directions, so a single week can be
+regenerated (e.g. after editing the neighbouring weeks) from the drills of
+the other weeks alone, without recomputing the season. Plans and their
+drills are written with one bulk INSERT each.
+"""
+from collections import defaultdict, namedtuple
+
+from app import db
+from app.models import PracticePlan, PlanDrill, Season
+from app.models.tag_masks import SKILL_LEVELS
+from app.utils.drill_history import mark_usage_changed
+from app.utils.plan_generator import generate_practice_plan
+
+DEFAULT_WEEKS = 12
+MAX_WEEKS = 52
+FOCUS_AREAS_PER_WEEK = 2
+DEFAULT_REPEAT_WINDOW = 3
+DEFAULT_MAX_REPEATS = 1
+
+# The attributes of a team the plan generator reads
+WeekProfile = namedtuple('WeekProfile', 'id age_group skill_level num_players focus_areas')
+
+
+def default_skill_range(skill_level):
+    """(start, end) skill levels for a season: the team's level up to the next one"""
+    if skill_level not in SKILL_LEVELS:
+        return skill_level, skill_level
+    index = SKILL_LEVELS.index(skill_level)
+    return skill_level, SKILL_LEVELS[min(index + 1, len(SKILL_LEVELS) - 1)]
+
+
+def week_skill_level(season, week):
+    """Skill level of a week; the season is split evenly between the levels it spans"""
+    if season.start_skill_level not in SKILL_LEVELS or season.end_skill_level not in SKILL_LEVELS:
+        return season.start_skill_level
+    first = SKILL_LEVELS.index(season.start_skill_level)
+    steps = SKILL_LEVELS.index(season.end_skill_level) - first + 1
+    return SKILL_LEVELS[first + (week - 1) * steps // season.weeks]
+
+
+def week_focus_areas(focus_areas, week, per_week=FOCUS_AREAS_PER_WEEK):
+    """The focus areas of a week, rotating through the team's list"""
+    if len(focus_areas) <= per_week:
+        return list(focus_areas)
+    start = (week - 1) * per_week
+    return [focus_areas[(start + i) % len(focus_areas)] for i in range(per_week)]
+
+
+def week_profile(season, week):
+    team = season.team
+    return WeekProfile(
+        id=team.id,
+        age_group=team.age_group,
+        skill_level=week_skill_level(season, week),
+        num_players=team.num_players,
+        focus_areas=', '.join(week_focus_areas(team.focus_areas_list, week)),
+    )
+
+
+def excluded_drills(usage, week, repeat_window, max_repeats):
+    """
+    Drill ids that cannot be used in ``week``
+
+    usage maps week -> drill ids of the other weeks. A drill is excluded when
+    some window of ``repeat_window`` weeks containing ``week`` already uses
+    it ``max_repeats`` times.
+    """
+    used_in = defaultdict(list)  # drill id -> nearby weeks using it, in order
+    for other in sorted(usage):
+        if other != week and abs(other - week) < repeat_window:
+            for drill_id in usage[other]:
+                used_in[drill_id].append(other)
+
+    excluded = set()
+    for drill_id, weeks in used_in.items():
+        # Some max_repeats consecutive uses fit in one window together with week
+        for first, last in zip(weeks, weeks[max_repeats - 1:]):
+            if max(last, week) - min(first, week) < repeat_window:
+                excluded.add(drill_id)
+                break
+    return excluded
+
+
+def _generate_week(season, week, usage):
+    profile = week_profile(season, week)
+    exclude = excluded_drills(usage, week, season.repeat_window, season.max_repeats)
+    generated = generate_practice_plan(profile, season.duration_minutes, exclude)
+    if not generated.items and exclude:
+        # The library is too small to honour the repeat cap this week
+        generated = generate_practice_plan(profile, season.duration_minutes)
+    return generated
+
+
+def _plan_values(season, week):
+    profile = week_profile(season, week)
+    notes = f'{profile.skill_level} week'
+    if profile.focus_areas:
+        notes += f', focus: {profile.focus_areas}'
+    return {
+        'name': f'{season.name} - Week {week}',
+        'team_id': season.team_id,
+        'duration_minutes': season.duration_minutes,
+        'notes': notes,
+        'season_id': season.id,
+        'season_week': week,
+        'scheduled_date': season.week_date(week),
+    }
+
+
+def _plan_drill_rows(plan_id, generated):
+    return [{'plan_id': plan_id, 'drill_id': item.drill.id, 'order': order,
+             'duration_minutes': item.duration_minutes, 'notes': item.phase.label}
+            for order, item in enumerate(generated.items)]
+
+
+def create_season(team, start_date, weeks=DEFAULT_WEEKS, duration_minutes=None, name=None,
+                  start_skill_level=None, end_skill_level=None,
+                  repeat_window=DEFAULT_REPEAT_WINDOW, max_repeats=DEFAULT_MAX_REPEATS):
+    """
+    Generate a season of weekly plans for a team (caller commits)
+
+    Weeks are planned in order, each avoiding the drills the repeat cap
+    rules out given the weeks before it. Returns the Season.
+    """
+    default_start, default_end = default_skill_range(team.skill_level)
+    season = Season(
+        name=name or f'{team.name} season {start_date:%b %Y}',
+        team_id=team.id,
+        start_date=start_date,
+        weeks=weeks,
+        duration_minutes=duration_minutes or team.recommended_session_duration,
+        start_skill_level=start_skill_level or default_start,
+        end_skill_level=end_skill_level or default_end,
+        repeat_window=repeat_window,
+        max_repeats=max_repeats,
+    )
+    season.team = team
+    db.session.add(season)
+    db.session.flush()
+
+    usage = {}
+    generated = {}
+    for week in range(1, weeks + 1):
+        generated[week] = _generate_week(season, week, usage)
+        usage[week] = {item.drill.id for item in generated[week].items}
+
+    plan_ids = db.session.scalars(
+        db.insert(PracticePlan).returning(PracticePlan.id, sort_by_parameter_order=True),
+        [_plan_values(season, week) for week in generated]
+    ).all()
+    drill_rows = [row for plan_id, week in zip(plan_ids, generated)
+                  for row in _plan_drill_rows(plan_id, generated[week])]
+    if drill_rows:
+        db.session.execute(db.insert(PlanDrill), drill_rows)
+    mark_usage_changed([team.id])
+    return season
+
+
+def season_usage(season, skip_week=None):
+    """{week: drill ids} of the season's saved plans, in one query"""
+    rows = db.session.execute(
+        db.select(PracticePlan.season_week, PlanDrill.drill_id)
+        .join(PlanDrill, PlanDrill.plan_id == PracticePlan.id)
+        .where(PracticePlan.season_id == season.id)
+    )
+    usage = {}
+    for week, drill_id in rows:
+        if week != skip_week:
+            usage.setdefault(week, set()).add(drill_id)
+    return usage
+
+
+def regenerate_week(season, week):
+    """
+    Replace one week's plan, keeping the rest of the season (caller commits)
+
+    The week is planned against the drills currently saved in the other
+    weeks, including manual edits. Completed weeks are left alone
+    (ValueError). Returns the week's PracticePlan.
+    """
+    if not 1 <= week <= season.weeks:
+        raise ValueError(f'Week must be between 1 and {season.weeks}')
+    plan = PracticePlan.query.filter_by(season_id=season.id, season_week=week).first()
+    if plan is not None and plan.is_completed:
+        raise ValueError(f'Week {week} has already been completed')
+
+    generated = _generate_week(season, week, season_usage(season, skip_week=week))
+    values = _plan_values(season, week)
+    if plan is None:
+        plan_id = db.session.scalar(db.insert(PracticePlan).returning(PracticePlan.id), values)
+    else:
+        plan_id = plan.id
+        db.session.execute(db.delete(PlanDrill).where(PlanDrill.plan_id == plan_id))
+        db.session.execute(db.update(PracticePlan).where(PracticePlan.id == plan_id).values(**values))
+    rows = _plan_drill_rows(plan_id, generated)
+    if rows:
+        db.session.execute(db.insert(PlanDrill), rows)
+    mark_usage_changed([season.team_id])
+    if plan is not None:
+        db.session.expire(plan)
+    return db.session.get(PracticePlan, plan_id)
@@ -0,0 +1,200 @@
+"""Process-local inverted index for drill suggestions
+
+Suggestions filter drills by skill level and age group and rank them by the
+number of focus areas they share with the team. Instead of querying and
+re-splitting tag strings on every request, each process keeps a lightweight
+snapshot of every drill and ranks them in memory.
+
+The index is built on first use and kept current by session events:
+- ORM flushes that touch a Drill record the drill id; the next lookup after
+  the commit reloads just those drills.
+- Bulk INSERT/UPDATE/DELETE statements on the drills table (CSV import,
+  Query.delete) mark the whole index stale, so it is rebuilt on next use.
+- Rolled back changes are discarded.
+
+Page and API suggestions are ranked by the NumPy scoring engine
+(app/utils/drill_scoring.py, through rank_for_team), built from the
+snapshots and dropped whenever the index changes. The trigram index for typo-tolerant search
+(app/utils/fuzzy_search.py) is also built from them, and updated drill by drill.
+
+Writes made by other processes are not observed; the index is also rebuilt
+once it is older than SUGGESTION_INDEX_MAX_AGE seconds.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+from app import db
+from app.models import Drill
+from app.utils.fuzzy_search import TrigramIndex, drill_fields
+
+# Drill columns kept in memory; enough to render suggestion cards and the API
+SUMMARY_COLUMNS = ('id', 'name', 'category', 'sub_category', 'description', 'skill_level', 'duration_minutes',
+                   'min_players', 'max_players', 'diagram_url', 'recommended_age_groups', 'focus_areas')
+
+DrillSummary = namedtuple('DrillSummary', SUMMARY_COLUMNS)
+
+_CHANGED_KEY = 'suggestion_index_changed'
+_STALE_KEY = 'suggestion_index_stale'
+
+
+class DrillSuggestionIndex:
+    """Snapshots of every drill, with the scoring engine and trigram index built from them"""
+
+    def __init__(self, max_age=None):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._changed_ids = set()
+        self._clear()
+
+    def _clear(self):
+        self.drills = {}
+        self._engine = None
+        self._trigrams = None
+
+    # -- maintenance ---------------------------------------------------------
+
+    def invalidate(self):
+        """Drop the index; it is rebuilt on next use"""
+        with self._lock:
+            self._built_at = None
+            self._changed_ids.clear()
+
+    def mark_changed(self, drill_ids):
+        """Record drills to reload on next use"""
+        with self._lock:
+            self._changed_ids.update(drill_ids)
+
+    def _is_current(self):
+        if self._built_at is None:
+            return False
+        return not self.max_age or time.monotonic() - self._built_at < self.max_age
+
+    def _add(self, summary):
+        self._engine = None
+        self.drills[summary.id] = summary
+        if self._trigrams is not None:
+            self._trigrams.add(summary.id, drill_fields(summary))
+
+    def _remove(self, drill_id):
+        if drill_id not in self.drills:
+            return
+        self._engine = None
+        del self.drills[drill_id]
+        if self._trigrams is not None:
+            self._trigrams.remove(drill_id)
+
+    def _select(self, *criteria):
+        columns = [getattr(Drill, name) for name in SUMMARY_COLUMNS]
+        return db.session.execute(db.select(*columns).where(*criteria)).all()
+
+    def build(self):
+        """(Re)load every drill from the database"""
+        with self._lock:
+            self._clear()
+            self._changed_ids.clear()
+            for row in self._select():
+                self._add(DrillSummary(*row))
+            self._built_at = time.monotonic()
+
+    def _refresh_changed(self):
+        drill_ids = list(self._changed_ids)
+        self._changed_ids.clear()
+        for drill_id in drill_ids:
+            self._remove(drill_id)
+        # Deleted drills simply are not found
+        for row in self._select(Drill.id.in_(drill_ids)):
+            self._add(DrillSummary(*row))
+
+    def ensure_current(self):
+        """Build or patch the index if needed (the only time it touches the database)"""
+        with self._lock:
+            if not self._is_current():
+                self.build()
+            elif self._changed_ids:
+                self._refresh_changed()
+
+    # -- lookups -------------------------------------------------------------
+
+    def scoring_engine(self):
+        """NumPy scoring engine over the indexed drills, rebuilt after drills change"""
+        self.ensure_current()
+        with self._lock:
+            if self._engine is None:
+                # NumPy is only loaded once something is ranked
+                from app.utils.drill_scoring import DrillScoringEngine
+                self._engine = DrillScoringEngine(self.drills.values())
+            return self._engine
+
+    def trigram_index(self):
+        """Trigram index over drill names and tags; built on first use, then updated per drill"""
+        self.ensure_current()
+        with self._lock:
+            if self._trigrams is None:
+                self._trigrams = TrigramIndex()
+                for summary in self.drills.values():
+                    self._trigrams.add(summary.id, drill_fields(summary))
+            return self._trigrams
+
+    def rank_for_team(self, team, k=None, adjustment=None):
+        """
+        Eligible drills for a team ranked by the scoring engine (focus overlap, player fit, id)
+
+        adjustment: optional sparse (drill ids, score deltas), see DrillScoringEngine.score_team.
+        """
+        engine = self.scoring_engine()
+        drill_ids, _ = engine.score_team(team, k, adjustment=adjustment)
+        return engine.drills_for(drill_ids)
+
+
+def init_suggestion_index(app):
+    """Attach an (unbuilt) suggestion index to the app"""
+    app.extensions['suggestion_index'] = DrillSuggestionIndex(app.config.get('SUGGESTION_INDEX_MAX_AGE'))
+
+
+def get_suggestion_index():
+    """The current app's suggestion index"""
+    return current_app.extensions['suggestion_index']
+
+
+# -- session events ----------------------------------------------------------
+
+@event.listens_for(db.session, 'after_flush')
+def _record_drill_changes(session, flush_context):
+    changed = {obj.id for obj in session.new | session.dirty | session.deleted if isinstance(obj, Drill)}
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _record_bulk_drill_statements(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is not None and table.name == Drill.__tablename__:
+        orm_execute_state.session.info[_STALE_KEY] = True
+
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_drill_changes(session):
+    changed = session.info.pop(_CHANGED_KEY, None)
+    stale = session.info.pop(_STALE_KEY, False)
+    if not (changed or stale) or not has_app_context():
+        return
+    index = current_app.extensions.get('suggestion_index')
+    if index is None:
+        return
+    if stale:
+        index.invalidate()
+    else:
+        index.mark_changed(changed)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_drill_changes(session):
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_STALE_KEY, None)
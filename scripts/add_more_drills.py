@@ -6,6 +6,8 @@ Covers various categories and age groups
 
 from app import create_app, db
 from app.models import Drill
+from app.utils.diagram_specs import LIBRARY_SPECS, dump_spec
+from app.utils.drill_similarity import rebuild_similarities
 
 def add_more_drills():
     app = create_app()
@@ -53,7 +55,8 @@ def add_more_drills():
                 'recommended_age_groups': 'U13, U14, U15, U16',
                 'equipment_needed': 'Balls, Goals, Cones',
                 'coaching_points': 'Plant foot beside ball, strike through center, follow through, keep head down, lock ankle.',
-                'focus_areas': 'Shooting, Finishing'
+                'focus_areas': 'Shooting, Finishing',
+                'diagram_spec': dump_spec(LIBRARY_SPECS['Shooting from Distance'])
             },
             {
                 'name': 'First Touch Control',
@@ -219,7 +222,8 @@ def add_more_drills():
                 'recommended_age_groups': 'U9, U10, U11, U12, U13, U14',
                 'equipment_needed': 'Balls, Goals, Cones, Pinnies',
                 'coaching_points': 'Game application, teamwork, competitive spirit, decision making under pressure.',
-                'focus_areas': 'Game Application, Competition, Teamwork'
+                'focus_areas': 'Game Application, Competition, Teamwork',
+                'diagram_spec': dump_spec(LIBRARY_SPECS['World Cup Tournament'])
             },
             {
                 'name': 'King of the Ring',
@@ -291,6 +295,8 @@ def add_more_drills():
             print(f"Added: {drill_data['name']} - {drill_data['category']}")
 
         db.session.commit()
+        rebuild_similarities()
+        db.session.commit()
 
         print(f"\n✅ Successfully added {added_count} new drills!")
         print(f"⏭️  Skipped {skipped_count} drills (already exist)")
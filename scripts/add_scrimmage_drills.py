@@ -1,6 +1,7 @@
 """Add proper scrimmage drills to the database"""
 from app import create_app, db
 from app.models import Drill
+from app.utils.drill_similarity import rebuild_similarities
 
 def add_scrimmage_drills():
     app = create_app()
@@ -68,6 +69,8 @@ def add_scrimmage_drills():
             db.session.add(drill)
             print(f"Added: {drill.name}")
         
+        db.session.commit()
+        rebuild_similarities()
         db.session.commit()
         print(f"\n✓ Successfully added {len(scrimmage_drills)} scrimmage drills!")
 
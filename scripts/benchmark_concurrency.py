@@ -0,0 +1,135 @@
+"""
+Benchmark mixed catalog reads and plan writes from several worker processes
+
+Simulates a multi-worker deployment (like gunicorn) sharing one SQLite file.
+Each profile runs against a fresh scratch database:
+- baseline: the old defaults (rollback journal, no pragmas, default pool)
+- production: the production profile (WAL, busy_timeout, cache/mmap, pool)
+
+Usage (from the project root):
+    python -m scripts.benchmark_concurrency [workers] [seconds]
+"""
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from app import create_app, db
+from app.models import Team
+from scripts.benchmark_search import populate
+
+SEED_DRILLS = 5000
+WRITE_RATIO = 0.2
+DRILLS_PER_PLAN = 5
+CATEGORIES = ['Technical', 'Tactical', 'Physical', 'Game', 'Fun']
+
+PROFILES = {
+    'baseline': {'SQLITE_PRAGMAS': {}, 'SQLALCHEMY_ENGINE_OPTIONS': {}},
+    'production': {},
+}
+
+
+def make_app(path, overrides):
+    return create_app(dict(overrides, SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}', AUTO_MIGRATE=True),
+                      profile='production')
+
+
+def seed(path, overrides):
+    app = make_app(path, overrides)
+    with app.app_context():
+        populate(SEED_DRILLS)
+        team = Team(name='Benchmark FC', age_group='U12', skill_level='Intermediate', num_players=12)
+        db.session.add(team)
+        db.session.commit()
+        team_id = team.id
+        db.engine.dispose()
+    return team_id
+
+
+def worker(path, overrides, team_id, seconds, worker_id, results):
+    app = make_app(path, overrides)
+    client = app.test_client()
+    rng = random.Random(worker_id)
+    reads, writes, errors = [], [], 0
+
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        is_write = rng.random() < WRITE_RATIO
+        start = time.perf_counter()
+        try:
+            if is_write:
+                drill_ids = [str(rng.randint(1, SEED_DRILLS)) for _ in range(DRILLS_PER_PLAN)]
+                response = client.post(f'/team/{team_id}/plan/new', data={
+                    'name': f'Plan {worker_id}-{len(writes)}',
+                    'duration_minutes': '90',
+                    'notes': '',
+                    'drill_ids[]': drill_ids,
+                    'drill_durations[]': ['15'] * DRILLS_PER_PLAN,
+                })
+            else:
+                response = client.get(f'/api/drills?category={rng.choice(CATEGORIES)}&per_page=24')
+            ok = response.status_code < 400
+        except Exception:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if not ok:
+            errors += 1
+        elif is_write:
+            writes.append(elapsed)
+        else:
+            reads.append(elapsed)
+
+    results.put((reads, writes, errors))
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def run(name, workers, seconds):
+    overrides = PROFILES[name]
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        team_id = seed(path, overrides)
+
+        ctx = multiprocessing.get_context('spawn')
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(target=worker, args=(path, overrides, team_id, seconds, i, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        reads = [t for r, _, _ in collected for t in r]
+        writes = [t for _, w, _ in collected for t in w]
+        errors = sum(e for _, _, e in collected)
+        total = len(reads) + len(writes)
+        print(f'{name:<12}{total / seconds:>9.0f}{len(reads):>9}{len(writes):>9}{errors:>8}'
+              f'{statistics.median(reads) if reads else float("nan"):>11.1f}{percentile(reads, 0.99):>11.1f}'
+              f'{statistics.median(writes) if writes else float("nan"):>11.1f}{percentile(writes, 0.99):>11.1f}')
+    finally:
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print(f'{workers} workers, {seconds:g}s per profile, {int(WRITE_RATIO * 100)}% writes, {SEED_DRILLS:,} drills')
+    print(f'{"profile":<12}{"ops/s":>9}{"reads":>9}{"writes":>9}{"errors":>8}'
+          f'{"read p50":>11}{"read p99":>11}{"write p50":>11}{"write p99":>11}')
+    for name in PROFILES:
+        run(name, workers, seconds)
@@ -0,0 +1,101 @@
+"""
+Benchmark reusing pre-built field backgrounds when rendering diagrams
+
+Times per-diagram rendering of the library specs and a set of generated
+specs two ways:
+- before: a new figure per diagram, the pitch redrawn with create_field and
+  one add_player / add_cone / add_ball / add_marker call per element
+- after: render_diagram_png, which draws on a cached field figure and
+  batches each kind of marker into one artist
+and the same for the SVG renderer (field markup built per diagram vs reused).
+
+Usage (from the project root):
+    python -m scripts.benchmark_diagram_backgrounds [generated specs]
+"""
+import io
+import random
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from app.utils import diagram_svg
+from app.utils.diagram_generator import (DEFAULT_FIGSIZES, _point, add_arrow, add_ball, add_cone, add_goal,
+                                         add_line, add_marker, add_player, add_zone, create_field,
+                                         create_plain_field, render_diagram_png)
+from app.utils.diagram_specs import LIBRARY_SPECS
+from scripts.benchmark_diagrams import generated_spec
+
+
+def render_png_per_element(spec):
+    """PNG the way every diagram used to be drawn: new figure, new field, one call per element"""
+    field = spec.get('field', 'small')
+    fig, ax = plt.subplots(figsize=tuple(spec.get('figsize') or DEFAULT_FIGSIZES[field]), facecolor='#2C3E50')
+    if field == 'plain':
+        create_plain_field(ax, *spec.get('size', (30, 30)))
+    else:
+        create_field(ax, field)
+    for zone in spec.get('zones', []):
+        add_zone(ax, **zone)
+    for line in spec.get('lines', []):
+        add_line(ax, *line['from'], *line['to'], **{k: v for k, v in line.items() if k not in ('from', 'to')})
+    for goal in spec.get('goals', []):
+        add_goal(ax, **goal)
+    for cone in spec.get('cones', []):
+        add_cone(ax, **_point(cone))
+    for player in spec.get('players', []):
+        add_player(ax, **_point(player))
+    for ball in spec.get('balls', []):
+        add_ball(ax, **_point(ball))
+    for arrow in spec.get('arrows', []):
+        add_arrow(ax, *arrow['from'], *arrow['to'], **{k: v for k, v in arrow.items() if k not in ('from', 'to')})
+    for marker in spec.get('markers', []):
+        add_marker(ax, **_point(marker))
+    if spec.get('title'):
+        ax.set_title(spec['title'], fontsize=16, fontweight='bold', color='white', pad=20)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight', facecolor='#2C3E50')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_svg_uncached(spec):
+    diagram_svg._field_items.cache_clear()
+    return diagram_svg.render_svg(spec)
+
+
+def per_diagram_ms(specs, render, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for spec in specs:
+            render(spec)
+    return (time.perf_counter() - start) / (len(specs) * repeat) * 1000
+
+
+def compare(label, specs, before, after, repeat=1):
+    before_ms = per_diagram_ms(specs, before, repeat)
+    after_ms = per_diagram_ms(specs, after, repeat)
+    print(f'{label:<15} before {before_ms:8.3f} ms   after {after_ms:8.3f} ms   '
+          f'({before_ms / after_ms:.2f}x) per diagram')
+
+
+def main(generated=40):
+    # Warm up matplotlib (font cache, backend) and the field caches outside the timings
+    for spec in LIBRARY_SPECS.values():
+        render_png_per_element(spec)
+        render_diagram_png(spec)
+
+    rng = random.Random(23)
+    library = list(LIBRARY_SPECS.values())
+    specs = [generated_spec(rng) for _ in range(generated)]
+
+    compare('Library PNG', library, render_png_per_element, render_diagram_png)
+    compare('Generated PNG', specs, render_png_per_element, render_diagram_png)
+    compare('Library SVG', library, render_svg_uncached, diagram_svg.render_svg, repeat=50)
+    compare('Generated SVG', specs, render_svg_uncached, diagram_svg.render_svg, repeat=10)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
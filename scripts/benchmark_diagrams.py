@@ -0,0 +1,96 @@
+"""
+Benchmark rendering the diagram library from declarative specs
+
+Renders every built-in spec (LIBRARY_SPECS) and a set of generated specs
+like those of imported drills with the native SVG renderer and with
+matplotlib (PNG), reporting per-diagram render time and output size, plus
+the cost of validating a spec and computing its cache key.
+
+Usage (from the project root):
+    python -m scripts.benchmark_diagrams [generated specs]
+"""
+import random
+import sys
+import time
+
+from app.utils.diagram_generator import render_diagram_png
+from app.utils.diagram_specs import FIELD_TYPES, LIBRARY_SPECS, dump_spec, parse_spec
+from app.utils.diagram_svg import SVG_VERSION, render_svg
+from app.utils.diagram_cache import _hash_inputs
+
+COLORS = ('#FFD23F', '#4682B4', '#FF7F50', '#DC143C')
+FIELD_SIZES = {'full': (100, 60), 'half': (50, 60), 'small': (30, 30), 'plain': (40, 30)}
+
+
+def generated_spec(rng):
+    """A random spec of typical size: 6-14 players, a few cones, balls and arrows"""
+    field = rng.choice(FIELD_TYPES)
+    width, height = FIELD_SIZES[field]
+
+    def point():
+        return [round(rng.uniform(2, width - 2), 1), round(rng.uniform(2, height - 2), 1)]
+
+    spec = {
+        'field': field,
+        'title': f'Generated drill {rng.randrange(10000)}',
+        'cones': [point() for _ in range(rng.randint(2, 8))],
+        'players': [dict(zip(('x', 'y'), point()), color=rng.choice(COLORS), label=str(i + 1))
+                    for i in range(rng.randint(6, 14))],
+        'balls': [point() for _ in range(rng.randint(1, 3))],
+        'arrows': [{'from': point(), 'to': point(), 'color': rng.choice(COLORS),
+                    'style': rng.choice(('solid', 'dashed'))} for _ in range(rng.randint(2, 6))],
+        'goals': [{'x': 1, 'y': height / 2, 'width': 6}],
+    }
+    if field == 'plain':
+        spec['size'] = [width, height]
+    return spec
+
+
+def render_svg_bytes(spec):
+    return render_svg(spec).encode('utf-8')
+
+
+def render_all(specs, render):
+    times, sizes = [], []
+    for spec in specs:
+        start = time.perf_counter()
+        data = render(spec)
+        times.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(data))
+    return times, sizes
+
+
+def report(label, times, sizes):
+    print(f'{label}: {len(times)} diagrams in {sum(times) / 1000:.2f} s, '
+          f'{sum(times) / len(times):.2f} ms and {sum(sizes) / len(sizes) / 1024:.1f} KB per diagram '
+          f'(slowest {max(times):.2f} ms)')
+
+
+def main(generated=40):
+    # Warm up matplotlib (font cache, backend) outside the timings
+    render_diagram_png(LIBRARY_SPECS['Passing Square'])
+
+    print('Library diagrams (SVG / matplotlib PNG):')
+    svg_times, svg_sizes = render_all(LIBRARY_SPECS.values(), render_svg_bytes)
+    png_times, png_sizes = render_all(LIBRARY_SPECS.values(), render_diagram_png)
+    for row in zip(LIBRARY_SPECS, svg_times, svg_sizes, png_times, png_sizes):
+        print('  {:<24} {:6.2f} ms {:5.1f} KB / {:6.0f} ms {:5.0f} KB'.format(
+            row[0], row[1], row[2] / 1024, row[3], row[4] / 1024))
+    report('Library SVG', svg_times, svg_sizes)
+    report('Library PNG', png_times, png_sizes)
+
+    rng = random.Random(20)
+    specs = [generated_spec(rng) for _ in range(generated)]
+    texts = [dump_spec(spec) for spec in specs]
+    start = time.perf_counter()
+    for text in texts:
+        _hash_inputs.__wrapped__(f'svg:{SVG_VERSION}:{parse_spec(text)}')
+    per_spec_us = (time.perf_counter() - start) / len(texts) * 1e6
+    print(f'Validate + cache key: {per_spec_us:.0f} us per spec')
+
+    report('Generated SVG', *render_all(specs, render_svg_bytes))
+    report('Generated PNG', *render_all(specs, render_diagram_png))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
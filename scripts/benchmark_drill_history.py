@@ -0,0 +1,101 @@
+"""
+Benchmark recency-aware suggestions backed by the team drill usage rollup
+
+Builds a scratch database with generated drills, teams and a long plan
+history, then times reading one team's usage from the rollup against
+aggregating it from plan_drills on every request, the whole suggestion
+(usage + ranking), and the incremental rollup refresh when a plan is saved.
+
+Usage (from the project root):
+    python -m scripts.benchmark_drill_history [drills] [plans per team]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app import create_app, db
+from app.models import Drill, PlanDrill, PracticePlan, Team
+from app.routes import get_suggested_drills
+from app.utils.drill_history import _usage_select, rebuild_usage, recency_adjustments
+from scripts.benchmark_scoring import TEAMS, add_teams
+from scripts.benchmark_suggestions import percentiles, populate
+
+DRILLS_PER_PLAN = 8
+REPERTOIRE = 60  # distinct drills each team's history draws from
+REPEAT = 100
+
+
+def add_history(plans_per_team):
+    rng = random.Random(17)
+    drill_ids = db.session.scalars(db.select(Drill.id)).all()
+    now = datetime.utcnow()
+    for team_id in db.session.scalars(db.select(Team.id)):
+        repertoire = rng.sample(drill_ids, REPERTOIRE)
+        plans = [{'name': f'History {i}', 'team_id': team_id, 'duration_minutes': 90,
+                  'created_at': now - timedelta(days=3 * i)} for i in range(plans_per_team)]
+        plan_ids = db.session.scalars(
+            db.insert(PracticePlan).returning(PracticePlan.id, sort_by_parameter_order=True), plans).all()
+        db.session.execute(db.insert(PlanDrill), [
+            {'plan_id': plan_id, 'drill_id': drill_id, 'order': order, 'duration_minutes': 10}
+            for plan_id in plan_ids
+            for order, drill_id in enumerate(rng.sample(repertoire, DRILLS_PER_PLAN))])
+    rebuild_usage()
+    db.session.commit()
+
+
+def time_ms(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(size, plans_per_team):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        with app.test_request_context():
+            populate(size)
+            add_teams(TEAMS)
+            add_history(plans_per_team)
+            teams = Team.query.all()
+            get_suggested_drills(teams[0])  # build the index and engine
+
+            def scan(team):
+                return db.session.execute(_usage_select().where(PracticePlan.team_id == team.id)).all()
+
+            def save_plan(team):
+                plan = PracticePlan(name='New plan', team_id=team.id, duration_minutes=60)
+                plan.plan_drills = [PlanDrill(drill_id=d.id, order=i, duration_minutes=10)
+                                    for i, d in enumerate(get_suggested_drills(team)[:DRILLS_PER_PLAN])]
+                db.session.add(plan)
+                db.session.commit()
+
+            timings = {
+                'usage from plan_drills scan': [time_ms(lambda: scan(teams[i % len(teams)])) for i in range(REPEAT)],
+                'usage from rollup': [time_ms(lambda: recency_adjustments([teams[i % len(teams)].id]))
+                                      for i in range(REPEAT)],
+                'suggestions (rollup + rank)': [time_ms(lambda: get_suggested_drills(teams[i % len(teams)]))
+                                                for i in range(REPEAT)],
+                'save plan + rollup refresh': [time_ms(lambda: save_plan(teams[i % len(teams)]))
+                                               for i in range(REPEAT // 4)],
+            }
+            print(f'\n{size:,} drills, {len(teams)} teams x {plans_per_team} plans '
+                  f'({len(teams) * plans_per_team * DRILLS_PER_PLAN:,} plan drills)')
+            print(f'  {"":<30}{"p50":>10}{"p99":>10}')
+            for name, values in timings.items():
+                p50, p99 = percentiles(values)
+                print(f'  {name:<30}{p50:>8.2f}ms{p99:>8.2f}ms')
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    plans_per_team = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    run(size, plans_per_team)
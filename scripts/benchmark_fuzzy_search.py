@@ -0,0 +1,61 @@
+"""
+Benchmark typo-tolerant drill search with the in-memory trigram index
+
+Builds scratch databases with generated drills, then times misspelled
+catalog searches (full-text lookup that finds nothing, trigram fallback and
+the page query) through the /api/drills endpoint.
+
+Usage (from the project root):
+    python -m scripts.benchmark_fuzzy_search [size ...]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app import create_app, db
+from app.utils.suggestion_index import get_suggestion_index
+from scripts.benchmark_search import populate
+
+QUERIES = ['rondoo', 'drible', 'posession', 'presing', 'goalkeper', 'conter atack']
+REPEAT = 20
+
+
+def run(size):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        client = app.test_client()
+        with app.app_context():
+            populate(size)
+            index = get_suggestion_index()
+            start = time.perf_counter()
+            index.trigram_index()
+            build_ms = (time.perf_counter() - start) * 1000
+
+            print(f'\n{size:,} drills (trigram index built in {build_ms:.0f}ms)')
+            print(f'  {"query":<16}{"p50":>10}{"p95":>10}  top result')
+            for search_query in QUERIES:
+                timings = []
+                for _ in range(REPEAT):
+                    start = time.perf_counter()
+                    response = client.get('/api/drills', query_string={'search': search_query, 'per_page': 24})
+                    timings.append((time.perf_counter() - start) * 1000)
+                data = response.get_json()
+                assert data['fuzzy'], f'{search_query!r} was expected to need the fuzzy fallback'
+                timings.sort()
+                top = data['items'][0]['name'] if data['items'] else '-'
+                print(f'  {search_query:<16}{statistics.median(timings):>8.1f}ms'
+                      f'{timings[int(len(timings) * 0.95) - 1]:>8.1f}ms  {top}')
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,135 @@
+"""
+Benchmark the streaming CSV drill importer on a generated 100k-row file
+
+The file contains ~2% in-file duplicate names and ~1% invalid rows. The old
+per-row importer (one SELECT per row, everything read into memory) is run on
+a smaller slice for comparison. The similar-drill refresh an import queues
+runs on the background thread and is timed separately.
+
+Usage (from the project root):
+    python -m scripts.benchmark_import [rows] [legacy_rows]
+"""
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app import create_app, db
+from app.models import Drill
+from app.utils.background import submit
+from app.utils.drill_import import CSV_COLUMNS, import_drills_csv
+
+CATEGORIES = ['Technical', 'Tactical', 'Physical', 'Game', 'Fun']
+AGE_GROUPS = ['U9', 'U10', 'U11', 'U12', 'U13', 'U14', 'U15', 'U16']
+FOCUS = ['Passing', 'Dribbling', 'Shooting', 'Defending', 'Possession', 'Transitions', 'Fitness']
+
+
+def write_csv(path, rows, seed=7):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for i in range(rows):
+            name = f'Generated Drill {rng.randrange(i + 1) if rng.random() < 0.02 else i}'
+            writer.writerow({
+                'name': name,
+                'category': rng.choice(CATEGORIES),
+                'sub_category': 'Passing',
+                'description': 'Players work in pairs, passing and moving into space. ' * 3,
+                'equipment_needed': 'Balls, cones',
+                'min_players': rng.randint(2, 8),
+                'max_players': 'lots' if rng.random() < 0.01 else rng.randint(10, 22),
+                'recommended_age_groups': ','.join(rng.sample(AGE_GROUPS, 3)),
+                'skill_level': 'Intermediate',
+                'duration_minutes': rng.choice([10, 15, 20]),
+                'focus_areas': ', '.join(rng.sample(FOCUS, 2)),
+                'coaching_points': 'Weight of pass, body shape, communicate.',
+            })
+
+
+def legacy_import(stream):
+    """The previous implementation: whole file in memory, one duplicate query per row"""
+    reader = csv.DictReader(io.StringIO(stream.read().decode('UTF8'), newline=None))
+    imported = 0
+    for row in reader:
+        try:
+            if Drill.query.filter_by(name=row['name'].strip()).first():
+                continue
+            db.session.add(Drill(
+                name=row['name'].strip(),
+                category=row['category'].strip(),
+                description=row['description'].strip(),
+                min_players=int(row['min_players']),
+                max_players=int(row['max_players']),
+                recommended_age_groups=row['recommended_age_groups'].strip(),
+                focus_areas=row['focus_areas'].strip(),
+            ))
+            imported += 1
+        except Exception:
+            continue
+    db.session.commit()
+    return imported
+
+
+def _queue_drained():
+    """Queued after an import; with one background worker it finishes after the import's jobs"""
+
+
+def timed_import(csv_path, importer, trace_memory=False):
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}', 'AUTO_MIGRATE': True,
+                          'IMPORT_EXECUTOR': 'thread', 'IMPORT_WORKERS': 1})
+        with app.app_context():
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            with open(csv_path, 'rb') as stream:
+                outcome = importer(stream)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory:
+                tracemalloc.stop()
+            submit(_queue_drained).result()
+            background = time.perf_counter() - start - elapsed
+            db.session.remove()
+            db.engine.dispose()
+        return outcome, elapsed, peak, background
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+
+def main(rows, legacy_rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        big = os.path.join(tmp, 'drills.csv')
+        small = os.path.join(tmp, 'drills_small.csv')
+        write_csv(big, rows)
+        write_csv(small, legacy_rows)
+        print(f'Generated {rows:,}-row CSV ({os.path.getsize(big) / 1e6:.1f} MB)')
+
+        result, elapsed, _, background = timed_import(big, import_drills_csv)
+        print(f'\nstreaming importer, {rows:,} rows: {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)')
+        print(f'  total={result.total_rows:,} imported={result.imported:,} '
+              f'skipped={result.skipped:,} errors={result.error_count:,}')
+        print(f'  similar-drill refresh (background job): {background:.2f}s')
+
+        _, _, peak, _ = timed_import(big, import_drills_csv, trace_memory=True)
+        print(f'  peak Python memory: {peak / 1e6:.1f} MB')
+
+        _, new_small, _, _ = timed_import(small, import_drills_csv)
+        _, old_small, _, _ = timed_import(small, legacy_import)
+        print(f'\n{legacy_rows:,} rows: streaming {new_small:.2f}s vs. legacy per-row {old_small:.2f}s '
+              f'({old_small / new_small:.0f}x faster)')
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    legacy_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    main(rows, legacy_rows)
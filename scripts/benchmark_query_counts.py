@@ -0,0 +1,96 @@
+"""
+Check that plan/template pages run a constant number of SQL queries
+
+Renders the plan detail, print, edit and create-from-template pages for
+plans of growing size against a scratch database and counts the queries
+each request issues. Exits non-zero if any count grows with plan size.
+Each route is requested once before counting, so one-off work such as
+building the in-memory suggestion index is not counted against the first
+plan size.
+
+Usage (from the project root):
+    python -m scripts.benchmark_query_counts
+"""
+import os
+import sys
+import tempfile
+
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models import Team, Drill, PracticePlan, PlanDrill, SessionTemplate, TemplateDrill
+
+PLAN_SIZES = [1, 5, 25, 100]
+
+
+def build_plan(team, size):
+    drills = [
+        Drill(name=f'Drill {size}-{i}', category='Technical', description='Generated drill',
+              equipment_needed=f'Cones x{i}', duration_minutes=10)
+        for i in range(size)
+    ]
+    plan = PracticePlan(name=f'Plan with {size} drills', team=team, duration_minutes=size * 10)
+    template = SessionTemplate(name=f'Template with {size} drills', description='Generated template',
+                               category='Possession', total_duration=size * 10)
+    for order, drill in enumerate(drills):
+        plan.plan_drills.append(PlanDrill(drill=drill, order=order, duration_minutes=10))
+        template.template_drills.append(TemplateDrill(drill=drill, order=order, duration_minutes=10))
+    db.session.add_all([plan, template])
+    db.session.commit()
+    return plan.id, template.id
+
+
+def count_queries(client, url):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert response.status_code == 200, f'{url} returned {response.status_code}'
+    return len(statements)
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        with app.app_context():
+            team = Team(name='Benchmark FC', age_group='U12', skill_level='Intermediate', num_players=12)
+            db.session.add(team)
+            db.session.commit()
+            team_id = team.id
+            plans = {size: build_plan(team, size) for size in PLAN_SIZES}
+            db.session.remove()
+
+        routes = {
+            'practice_plan_detail': lambda plan_id, template_id: f'/plan/{plan_id}',
+            'print_practice_plan': lambda plan_id, template_id: f'/plan/{plan_id}/print',
+            'edit_practice_plan': lambda plan_id, template_id: f'/plan/{plan_id}/edit',
+            'create_from_template': lambda plan_id, template_id: f'/team/{team_id}/plan/from-template/{template_id}',
+        }
+
+        client = app.test_client()
+        failed = False
+        print(f'{"route":<24}' + ''.join(f'{size:>8}' for size in PLAN_SIZES))
+        with app.app_context():
+            for name, url_for_plan in routes.items():
+                client.get(url_for_plan(*plans[PLAN_SIZES[0]]))  # warm-up, not counted
+                counts = [count_queries(client, url_for_plan(*plans[size])) for size in PLAN_SIZES]
+                constant = len(set(counts)) == 1
+                failed = failed or not constant
+                print(f'{name:<24}' + ''.join(f'{count:>8}' for count in counts) +
+                      ('' if constant else '   <-- grows with plan size'))
+            db.engine.dispose()
+        return 1 if failed else 0
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
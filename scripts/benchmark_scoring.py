@@ -0,0 +1,121 @@
+"""
+Benchmark drill ranking: NumPy scoring engine vs. the set-based index loop
+
+Builds scratch databases with generated drills and teams, checks that the
+engine (without the player fit tie-break) ranks drills exactly like the
+previous set-based lookup (PostingsIndex below), then times top-k ranking
+for one team at a time and for every team in a single batch.
+
+Usage (from the project root):
+    python -m scripts.benchmark_scoring [size ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+from app import create_app, db
+from app.models import Team
+from app.models.tags import normalize_age_group, normalize_focus_area, split_tags
+from app.utils.suggestion_index import get_suggestion_index
+from scripts.benchmark_search import WORDS
+from scripts.benchmark_suggestions import AGE_GROUPS, SKILL_LEVELS, percentiles, populate
+
+TEAMS = 200
+TOP_K = 20
+REPEAT = 50
+
+
+class PostingsIndex:
+    """The previous suggestion lookup: postings sets of drill ids intersected per team"""
+
+    def __init__(self, drills):
+        self.drills = {drill.id: drill for drill in drills}
+        self.by_skill = defaultdict(set)
+        self.by_age_group = defaultdict(set)
+        self.by_focus_area = defaultdict(set)
+        for drill in drills:
+            self.by_skill[drill.skill_level].add(drill.id)
+            for tag in split_tags(drill.recommended_age_groups, normalize_age_group):
+                self.by_age_group[tag].add(drill.id)
+            for tag in split_tags(drill.focus_areas, normalize_focus_area):
+                self.by_focus_area[tag].add(drill.id)
+
+    def suggest_for_team(self, team):
+        """Drills matching the team's skill level and age group, best focus area overlap first, then by id"""
+        candidates = set(self.drills)
+        if team.skill_level:
+            candidates &= self.by_skill.get(team.skill_level, set())
+        if team.age_group:
+            candidates &= self.by_age_group.get(normalize_age_group(team.age_group), set())
+        focus_tags = split_tags(team.focus_areas, normalize_focus_area)
+        if not focus_tags:
+            return [self.drills[drill_id] for drill_id in sorted(candidates)]
+        scores = Counter()
+        for tag in focus_tags:
+            scores.update(self.by_focus_area.get(tag, set()) & candidates)
+        ranked = sorted(candidates, key=lambda drill_id: (-scores[drill_id], drill_id))
+        return [self.drills[drill_id] for drill_id in ranked]
+
+
+def add_teams(count):
+    rng = random.Random(11)
+    for i in range(count):
+        db.session.add(Team(name=f'Batch team {i}', age_group=rng.choice(AGE_GROUPS),
+                            skill_level=rng.choice(SKILL_LEVELS), num_players=rng.randint(6, 22),
+                            focus_areas=', '.join(rng.sample(WORDS, rng.randint(1, 4)))))
+    db.session.commit()
+
+
+def time_ms(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(size):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        with app.app_context():
+            populate(size)
+            add_teams(TEAMS)
+            teams = Team.query.all()
+            index = get_suggestion_index()
+            index.build()
+            build_ms = time_ms(index.scoring_engine)
+            engine = index.scoring_engine()
+            postings = PostingsIndex(list(index.drills.values()))
+
+            for team in teams:
+                expected = [d.id for d in postings.suggest_for_team(team)]
+                actual, _ = engine.score_team(team, fit_players=False)
+                if expected != actual.tolist():
+                    sys.exit(f'Ranking mismatch for {team.name}')
+
+            loop = [time_ms(lambda: postings.suggest_for_team(teams[i % len(teams)])[:TOP_K]) for i in range(REPEAT)]
+            single = [time_ms(lambda: engine.score_team(teams[i % len(teams)], TOP_K)) for i in range(REPEAT)]
+            loop_all = time_ms(lambda: [postings.suggest_for_team(team)[:TOP_K] for team in teams])
+            batch_all = time_ms(lambda: engine.score_teams(teams, TOP_K))
+
+            print(f'\n{size:,} drills, {len(teams)} teams (engine built in {build_ms:.0f}ms, rankings identical)')
+            print(f'  {"top-20 for one team":<28}{"p50":>10}{"p99":>10}')
+            for name, timings in (('set loop', loop), ('numpy', single)):
+                p50, p99 = percentiles(timings)
+                print(f'  {name:<28}{p50:>8.2f}ms{p99:>8.2f}ms')
+            print(f'  {"top-20 for every team":<28}{"total":>10}')
+            print(f'  {"set loop (per team)":<28}{loop_all:>8.0f}ms')
+            print(f'  {"numpy (batched)":<28}{batch_all:>8.0f}ms')
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,129 @@
+"""
+Benchmark drill catalog search: FTS5 index vs. the old ILIKE scan
+
+Builds scratch databases with 10k and 100k generated drills and reports
+per-query latency for both approaches.
+
+Usage (from the project root):
+    python -m scripts.benchmark_search [size ...]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from app import create_app, db
+from app.models import Drill
+from app.utils.drill_search import search_subquery, search_snippets
+
+WORDS = [
+    'passing', 'dribbling', 'shooting', 'defending', 'possession', 'pressing',
+    'transition', 'finishing', 'crossing', 'heading', 'rondo', 'overlap',
+    'width', 'depth', 'support', 'communication', 'first', 'touch', 'weak',
+    'foot', 'scanning', 'agility', 'speed', 'counter', 'attack', 'goalkeeper',
+    'switch', 'play', 'combination', 'wall', 'pass', 'turn', 'shield', 'tackle',
+]
+SYLLABLES = ['ba', 'ko', 'ri', 'ten', 'mo', 'sa', 'lu', 'vek', 'di', 'ran', 'po', 'zel']
+CATEGORIES = ['Technical', 'Tactical', 'Physical', 'Game', 'Fun']
+QUERIES = ['rondo', 'first touch', 'pass', 'counter attack', 'goalkeeper distribution', 'shield']
+RESULT_LIMIT = 20
+REPEAT = 30
+
+
+def build_vocabulary(rng, size=5000):
+    """Soccer words followed by filler words, weighted with a Zipf-like tail"""
+    vocabulary = list(WORDS)
+    while len(vocabulary) < size:
+        vocabulary.append(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    weights = [1.0 / (rank + 10) for rank in range(len(vocabulary))]
+    rng.shuffle(vocabulary)
+    return vocabulary, weights
+
+
+def sentence(rng, vocabulary, weights, n):
+    return ' '.join(rng.choices(vocabulary, weights, k=n)).capitalize() + '.'
+
+
+def generate_rows(count, seed=42):
+    rng = random.Random(seed)
+    vocabulary, weights = build_vocabulary(rng)
+    words = lambda n: sentence(rng, vocabulary, weights, n)
+    for i in range(count):
+        yield {
+            'name': f'{words(3)[:-1]} #{i}',
+            'category': rng.choice(CATEGORIES),
+            'description': words(25),
+            'focus_areas': ', '.join(rng.sample(WORDS, 3)),
+            'coaching_points': words(15),
+            'setup_instructions': words(15),
+            'skill_level': 'All',
+        }
+
+
+def populate(count, chunk_size=5000):
+    rows = []
+    for row in generate_rows(count):
+        rows.append(row)
+        if len(rows) >= chunk_size:
+            db.session.execute(db.insert(Drill), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(Drill), rows)
+    db.session.commit()
+
+
+def fts_search(search_query):
+    search = search_subquery(search_query)
+    drills = (Drill.query.join(search, search.c.drill_id == Drill.id)
+              .order_by(search.c.rank)
+              .limit(RESULT_LIMIT)
+              .all())
+    return drills, search_snippets(search_query, [drill.id for drill in drills])
+
+
+def ilike_search(search_query):
+    return (Drill.query.filter(db.or_(
+                Drill.name.ilike(f'%{search_query}%'),
+                Drill.description.ilike(f'%{search_query}%')))
+            .order_by(Drill.name)
+            .limit(RESULT_LIMIT)
+            .all())
+
+
+def time_ms(func, arg):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.expunge_all()
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def run(size):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        with app.app_context():
+            start = time.perf_counter()
+            populate(size)
+            print(f'\n{size:,} drills (populated in {time.perf_counter() - start:.1f}s)')
+            print(f'  {"query":<26}{"fts p50":>10}{"fts p95":>10}{"ilike p50":>12}{"ilike p95":>12}')
+            for search_query in QUERIES:
+                fts_p50, fts_p95 = time_ms(fts_search, search_query)
+                like_p50, like_p95 = time_ms(ilike_search, search_query)
+                print(f'  {search_query:<26}{fts_p50:>8.2f}ms{fts_p95:>8.2f}ms{like_p50:>10.2f}ms{like_p95:>10.2f}ms')
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run(size)
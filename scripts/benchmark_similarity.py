@@ -0,0 +1,67 @@
+"""
+Benchmark the precomputed similar-drills table
+
+Builds scratch databases with generated drills, times the full TF-IDF
+neighbour build, an incremental update after a small import, and the
+drill-page lookup (an indexed range scan of SIMILAR_DRILLS rows).
+
+Usage (from the project root):
+    python -m scripts.benchmark_similarity [size ...]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app import create_app, db
+from app.models import Drill
+from app.utils.drill_similarity import get_similar_drills, rebuild_similarities, update_similarities
+from scripts.benchmark_search import populate
+
+UPDATED_DRILLS = 100
+LOOKUPS = 200
+
+
+def run(size):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        with app.app_context():
+            populate(size)
+            start = time.perf_counter()
+            rebuild_similarities()
+            db.session.commit()
+            build_s = time.perf_counter() - start
+
+            last_ids = db.session.scalars(db.select(Drill.id).order_by(Drill.id.desc()).limit(UPDATED_DRILLS)).all()
+            start = time.perf_counter()
+            update_similarities(last_ids)
+            db.session.commit()
+            update_ms = (time.perf_counter() - start) * 1000
+
+            drills = db.session.scalars(db.select(Drill).order_by(db.func.random()).limit(LOOKUPS)).all()
+            timings = []
+            for drill in drills:
+                start = time.perf_counter()
+                similar = get_similar_drills(drill)
+                timings.append((time.perf_counter() - start) * 1000)
+                assert similar, f'no similar drills for drill {drill.id}'
+            timings.sort()
+
+            print(f'\n{size:,} drills')
+            print(f'  full build                {build_s:>8.1f}s')
+            print(f'  update {UPDATED_DRILLS} drills         {update_ms:>8.0f}ms')
+            print(f'  drill page lookup p50     {statistics.median(timings):>8.2f}ms'
+                  f'  (p99 {timings[int(len(timings) * 0.99) - 1]:.2f}ms)')
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,83 @@
+"""
+Benchmark application startup: imports, create_app and the first requests
+
+Each run is a fresh Python process against a migrated scratch database,
+timing `from app import create_app`, create_app() and the first requests
+(landing page, drill catalog, a drill page). It is compared with the old
+boot, which ran create_all and the migration check in every process, and
+lists the heavy libraries (numpy, matplotlib, Pillow) the process has
+loaded by the end.
+
+Usage (from the project root):
+    python -m scripts.benchmark_startup [runs] [drills]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from app import create_app, db
+from scripts.benchmark_search import populate
+
+HEAVY_MODULES = ('numpy', 'matplotlib', 'PIL')
+
+# Runs in a fresh interpreter; argv: database path, mode ('check' or 'upgrade')
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{sys.argv[1]}'})
+if sys.argv[2] == 'upgrade':
+    from app.migrations import upgrade_database
+    with app.app_context():
+        upgrade_database()
+created = time.perf_counter()
+client = app.test_client()
+timings = {'import': imported - start, 'create_app': created - imported}
+for name, url in (('GET /', '/'), ('GET /drills', '/drills'), ('GET /drill/1', '/drill/1')):
+    request_start = time.perf_counter()
+    assert client.get(url).status_code == 200, url
+    timings[name] = time.perf_counter() - request_start
+timings['total'] = time.perf_counter() - start
+print(json.dumps({'timings': timings, 'modules': [m for m in %r if m in sys.modules]}))
+''' % (HEAVY_MODULES,)
+
+
+def run_child(path, mode):
+    output = subprocess.run([sys.executable, '-c', CHILD, path, mode], check=True, capture_output=True,
+                            text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def report(label, results):
+    print(f'\n{label}')
+    for phase in results[0]['timings']:
+        values = sorted(result['timings'][phase] * 1000 for result in results)
+        print(f'  {phase:<14} p50 {statistics.median(values):7.1f} ms   max {values[-1]:7.1f} ms')
+    print(f"  loaded: {', '.join(results[-1]['modules']) or 'none of ' + ', '.join(HEAVY_MODULES)}")
+
+
+def main(runs=10, drills=1000):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        with app.app_context():
+            populate(drills)
+            db.session.remove()
+            db.engine.dispose()
+
+        print(f'{runs} fresh processes per mode, {drills:,} drills')
+        report('Startup schema check (current)', [run_child(path, 'check') for _ in range(runs)])
+        report('create_all + migrations on boot (old)', [run_child(path, 'upgrade') for _ in range(runs)])
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
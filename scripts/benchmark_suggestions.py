@@ -0,0 +1,128 @@
+"""
+Benchmark drill suggestions: in-memory index vs. the SQL tag-join query
+
+Builds scratch databases with generated drills and teams, checks that both
+implementations return the same drills in the same order (the index's
+scoring engine without its player fit tie-break), and reports p50/p99
+latency per suggestion lookup (rank_for_team, as pages call it).
+
+Usage (from the project root):
+    python -m scripts.benchmark_suggestions [size ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app import create_app, db
+from app.models import Drill, DrillAgeGroup, DrillFocusArea, Team, TeamFocusArea
+from app.models.tags import insert_drill_tags, normalize_age_group
+from app.utils.suggestion_index import get_suggestion_index
+from scripts.benchmark_search import WORDS, generate_rows
+
+AGE_GROUPS = ['U6', 'U8', 'U9', 'U10', 'U12', 'U14', 'U16', 'U19']
+SKILL_LEVELS = ['Beginner', 'Intermediate', 'Advanced', 'All']
+TEAMS = 20
+REPEAT = 200
+
+
+def sql_suggested_drills(team):
+    """The previous get_suggested_drills: skill filter, age tag join, focus overlap ranking"""
+    query = Drill.query
+    if team.skill_level:
+        query = query.filter(Drill.skill_level == team.skill_level)
+    if team.age_group:
+        query = query.join(DrillAgeGroup).filter(DrillAgeGroup.age_group == normalize_age_group(team.age_group))
+    if team.focus_areas:
+        team_focus = db.select(TeamFocusArea.focus_area).where(TeamFocusArea.team_id == team.id)
+        score = db.func.count(DrillFocusArea.focus_area)
+        query = (query
+                 .outerjoin(DrillFocusArea, db.and_(
+                     DrillFocusArea.drill_id == Drill.id,
+                     DrillFocusArea.focus_area.in_(team_focus)))
+                 .group_by(Drill.id)
+                 .order_by(score.desc(), Drill.id))
+    else:
+        query = query.order_by(Drill.id)
+    return query.all()
+
+
+def populate(count, chunk_size=5000):
+    rng = random.Random(7)
+    rows = []
+
+    def flush():
+        ids = db.session.scalars(db.insert(Drill).returning(Drill.id, sort_by_parameter_order=True), rows).all()
+        insert_drill_tags((i, r['recommended_age_groups'], r['focus_areas']) for i, r in zip(ids, rows))
+        rows.clear()
+
+    for row in generate_rows(count):
+        row['skill_level'] = rng.choice(SKILL_LEVELS)
+        row['recommended_age_groups'] = ', '.join(rng.sample(AGE_GROUPS, 3))
+        rows.append(row)
+        if len(rows) >= chunk_size:
+            flush()
+    if rows:
+        flush()
+
+    for i in range(TEAMS):
+        db.session.add(Team(name=f'Team {i}', age_group=rng.choice(AGE_GROUPS), skill_level=rng.choice(SKILL_LEVELS),
+                            num_players=12, focus_areas=', '.join(rng.sample(WORDS, 2)) if i % 4 else None))
+    db.session.commit()
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[max(0, int(len(timings) * 0.99) - 1)]
+
+
+def time_lookups(func, teams):
+    timings = []
+    for i in range(REPEAT):
+        team = teams[i % len(teams)]
+        start = time.perf_counter()
+        func(team)
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.expunge_all()
+    return percentiles(timings)
+
+
+def run(size):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'AUTO_MIGRATE': True})
+        with app.app_context():
+            populate(size)
+            index = get_suggestion_index()
+            teams = Team.query.all()
+            db.session.expunge_all()
+
+            start = time.perf_counter()
+            index.build()
+            build_ms = (time.perf_counter() - start) * 1000
+
+            engine = index.scoring_engine()
+            for team in teams:
+                expected = [d.id for d in sql_suggested_drills(team)]
+                actual = engine.score_team(team, fit_players=False)[0].tolist()
+                if expected != actual:
+                    sys.exit(f'Mismatch for {team.name}: index returned {len(actual)} drills, SQL {len(expected)}')
+
+            sql_p50, sql_p99 = time_lookups(sql_suggested_drills, teams)
+            index_p50, index_p99 = time_lookups(index.rank_for_team, teams)
+            print(f'\n{size:,} drills (index built in {build_ms:.0f}ms, results identical for {len(teams)} teams)')
+            print(f'  {"":<8}{"p50":>10}{"p99":>10}')
+            print(f'  {"sql":<8}{sql_p50:>8.2f}ms{sql_p99:>8.2f}ms')
+            print(f'  {"index":<8}{index_p50:>8.2f}ms{index_p99:>8.2f}ms')
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for size in sizes:
+        run(size)
@@ -1,29 +1,44 @@
-"""Generate diagrams for all drills in the database"""
-from app import create_app, db
-from app.models import Drill
-from app.utils.diagram_generator import save_drill_diagram
+"""Render diagrams for all drills into the diagram cache
 
-def generate_all_diagrams():
-    """Generate diagrams for all drills"""
-    app = create_app()
+Rendering is spread over a process pool (app/utils/diagram_batch.py) and
+each drill's diagram_url is updated in a single commit at the end.
 
-    with app.app_context():
-        drills = Drill.query.all()
+Usage (from the project root):
+    python -m scripts.generate_diagrams [--only-missing] [--changed-since 2026-01-31]
+                                        [--format svg|png] [--workers N]
+"""
+import argparse
+from datetime import datetime
 
-        print(f"Generating diagrams for {len(drills)} drills...")
+from app import create_app
+from app.utils.diagram_batch import generate_diagrams
+from app.utils.diagram_cache import DIAGRAM_FORMATS
 
-        for drill in drills:
-            print(f"  - Generating diagram for: {drill.name}")
-            diagram_url = save_drill_diagram(drill.name, drill.id)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Render drill diagrams into the diagram cache')
+    parser.add_argument('--only-missing', action='store_true',
+                        help='skip diagrams that are already rendered')
+    parser.add_argument('--changed-since', type=datetime.fromisoformat, metavar='DATE',
+                        help='only drills updated since this ISO date/time')
+    parser.add_argument('--format', choices=sorted(DIAGRAM_FORMATS),
+                        help='output format (default: the DIAGRAM_FORMAT setting)')
+    parser.add_argument('--workers', type=int, help='render processes (default: one per core)')
+    return parser.parse_args(argv)
 
-            if diagram_url:
-                drill.diagram_url = diagram_url
-                print(f"    ✓ Saved to {diagram_url}")
-            else:
-                print(f"    ⚠ No diagram generator for this drill yet")
+def generate_all_diagrams(argv=None):
+    """Generate diagrams for all drills"""
+    args = parse_args(argv)
+    app = create_app()
+
+    with app.app_context():
+        start = datetime.now()
+        result = generate_diagrams(fmt=args.format, only_missing=args.only_missing,
+                                   changed_since=args.changed_since, workers=args.workers)
+        seconds = (datetime.now() - start).total_seconds()
 
-        db.session.commit()
-        print("\n✓ All diagrams generated successfully!")
+        print(f"Checked {result.drills} drills ({result.without_spec} without a diagram)")
+        print(f"✓ {result.rendered} diagrams rendered, {result.cached} already cached, "
+              f"{result.urls_updated} diagram URLs updated in {seconds:.1f} s")
 
 if __name__ == '__main__':
     generate_all_diagrams()
@@ -1,6 +1,8 @@
 """Script to populate the database with sample soccer drills"""
 from app import create_app, db
 from app.models import Drill
+from app.utils.diagram_specs import LIBRARY_SPECS, dump_spec
+from app.utils.drill_similarity import rebuild_similarities
 
 def populate_drills():
     """Add sample drills to the database"""
@@ -26,7 +28,8 @@ def populate_drills():
                 focus_areas="Passing accuracy, first touch, communication",
                 setup_instructions="Set up a 10x10 yard square with cones at each corner. Players stand at each cone with one ball.",
                 coaching_points="- Use the inside of the foot\n- Look up before passing\n- Move to receive after passing\n- Communicate with teammates",
-                variations="- Add a defender in the middle\n- Use only weak foot\n- Limit touches to one or two\n- Increase square size"
+                variations="- Add a defender in the middle\n- Use only weak foot\n- Limit touches to one or two\n- Increase square size",
+                diagram_spec=dump_spec(LIBRARY_SPECS['Passing Square'])
             ),
 
             Drill(
@@ -43,7 +46,8 @@ def populate_drills():
                 focus_areas="Close control, dribbling speed, ball manipulation",
                 setup_instructions="Create 4-5 dribbling lanes 20 yards long using cones. Players line up in pairs at the start.",
                 coaching_points="- Keep ball close to feet\n- Use both feet\n- Look up occasionally\n- Change of pace",
-                variations="- Add obstacles to dribble around\n- Only use weak foot\n- Dribble backwards on return"
+                variations="- Add obstacles to dribble around\n- Only use weak foot\n- Dribble backwards on return",
+                diagram_spec=dump_spec(LIBRARY_SPECS['1v1 Dribbling Race'])
             ),
 
             Drill(
@@ -60,7 +64,8 @@ def populate_drills():
                 focus_areas="Shooting technique, power, accuracy",
                 setup_instructions="Set up shooting stations 20-25 yards from goal. Players take turns shooting after receiving a pass.",
                 coaching_points="- Plant foot beside ball\n- Strike through the ball\n- Follow through\n- Keep head down on contact",
-                variations="- Add a defender to pressure\n- Shoot first time\n- Different angles of approach"
+                variations="- Add a defender to pressure\n- Shoot first time\n- Different angles of approach",
+                diagram_spec=dump_spec(LIBRARY_SPECS['Shooting from Distance'])
             ),
 
             # Tactical Drills
@@ -78,7 +83,8 @@ def populate_drills():
                 focus_areas="Possession, support play, transition, decision making",
                 setup_instructions="Create a 30x30 yard grid. Two teams of 4 plus 2 neutral players who always play with team in possession.",
                 coaching_points="- Create passing triangles\n- Spread out to create space\n- Play quickly\n- Support the ball",
-                variations="- Limit touches\n- Add small goals for counter-attacking\n- Make grid smaller or larger"
+                variations="- Limit touches\n- Add small goals for counter-attacking\n- Make grid smaller or larger",
+                diagram_spec=dump_spec(LIBRARY_SPECS['4v4+2 Possession'])
             ),
 
             Drill(
@@ -95,7 +101,8 @@ def populate_drills():
                 focus_areas="Defensive organization, pressure and cover, communication",
                 setup_instructions="Set up a channel to goal. 3 attackers try to score against 2 defenders.",
                 coaching_points="- First defender pressures ball\n- Second defender covers\n- Force play to sideline\n- Communicate constantly",
-                variations="- Add another defender (3v3)\n- Require defenders to win ball and counter\n- Different starting positions"
+                variations="- Add another defender (3v3)\n- Require defenders to win ball and counter\n- Different starting positions",
+                diagram_spec=dump_spec(LIBRARY_SPECS['3v2 Defending Shape'])
             ),
 
             # Physical Drills
@@ -113,7 +120,8 @@ def populate_drills():
                 focus_areas="Foot speed, coordination, agility, balance",
                 setup_instructions="Lay out agility ladder. Players perform different footwork patterns: two feet in, one foot in, lateral steps, etc.",
                 coaching_points="- Stay on toes\n- Quick feet\n- Arms pumping\n- Head up",
-                variations="- Add ball after completing ladder\n- Backwards through ladder\n- Different patterns"
+                variations="- Add ball after completing ladder\n- Backwards through ladder\n- Different patterns",
+                diagram_spec=dump_spec(LIBRARY_SPECS['Agility Ladder Drills'])
             ),
 
             Drill(
@@ -148,7 +156,8 @@ def populate_drills():
                 focus_areas="Game situations, competitiveness, all soccer skills",
                 setup_instructions="Set up 2-4 small fields. Teams of 3-4 players. Winners stay, losers rotate off.",
                 coaching_points="- Encourage creative play\n- All touches count\n- Keep score\n- Celebrate goals!",
-                variations="- Different team sizes (2v2, 3v3, 4v4)\n- Must score from weak foot\n- Add conditions (2-touch maximum)"
+                variations="- Different team sizes (2v2, 3v3, 4v4)\n- Must score from weak foot\n- Add conditions (2-touch maximum)",
+                diagram_spec=dump_spec(LIBRARY_SPECS['World Cup Tournament'])
             ),
 
             Drill(
@@ -165,7 +174,8 @@ def populate_drills():
                 focus_areas="Dribbling under pressure, shielding, awareness",
                 setup_instructions="Mark 30x30 yard grid. All players start on one side with a ball except 2-3 sharks in the middle.",
                 coaching_points="- Keep ball close\n- Use body to shield\n- Change direction quickly\n- Look for space",
-                variations="- Last minnow standing wins\n- Sharks must also dribble a ball\n- Make grid smaller as game progresses"
+                variations="- Last minnow standing wins\n- Sharks must also dribble a ball\n- Make grid smaller as game progresses",
+                diagram_spec=dump_spec(LIBRARY_SPECS['Sharks and Minnows'])
             ),
         ]
 
@@ -174,6 +184,8 @@ def populate_drills():
             db.session.add(drill)
 
         db.session.commit()
+        rebuild_similarities()
+        db.session.commit()
 
         print(f"✓ Successfully added {len(drills)} drills to the database!")
 